@@ -0,0 +1,138 @@
+"""add article content compression
+
+Revision ID: 3b9f1c2d7e84
+Revises: 642f12268e40
+Create Date: 2026-10-19 13:42:10.381925
+
+"""
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f1c2d7e84'
+down_revision: Union[str, Sequence[str], None] = '642f12268e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 既存記事のバックフィルで 1 回に処理する記事数
+BACKFILL_BATCH_SIZE = 500
+
+
+def _backfill_compress(connection: sa.Connection, threshold: int, level: int) -> None:
+    """閾値を超える既存の本文を id 順のバッチで圧縮する（辞書なし）"""
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, content FROM articles"
+                " WHERE id > :last_id AND content IS NOT NULL"
+                " AND octet_length(content) > :threshold"
+                " ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "threshold": threshold, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text(
+                "UPDATE articles SET content = NULL, content_compressed = :data WHERE id = :id"
+            ),
+            [
+                {"id": row.id, "data": zlib.compress(row.content.encode("utf-8"), level)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def _backfill_decompress(connection: sa.Connection) -> None:
+    """圧縮済みの本文を id 順のバッチで非圧縮に戻す"""
+    dictionaries = dict(
+        connection.execute(sa.text("SELECT id, data FROM compression_dictionaries")).all()
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, content_compressed, compression_dict_id FROM articles"
+                " WHERE id > :last_id AND content_compressed IS NOT NULL"
+                " ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            zdict = dictionaries.get(row.compression_dict_id)
+            decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+            content = decompressor.decompress(row.content_compressed) + decompressor.flush()
+            params.append({"id": row.id, "content": content.decode("utf-8")})
+        connection.execute(
+            sa.text(
+                "UPDATE articles SET content = :content, content_compressed = NULL,"
+                " compression_dict_id = NULL WHERE id = :id"
+            ),
+            params,
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('compression_dictionaries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('is_valid', sa.Boolean(), server_default='true', nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_by', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('articles', sa.Column('content_compressed', sa.LargeBinary(), nullable=True))
+    op.add_column('articles', sa.Column('compression_dict_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('articles_compression_dict_id_fkey', 'articles', 'compression_dictionaries', ['compression_dict_id'], ['id'])
+    op.alter_column('articles', 'content',
+               existing_type=sa.TEXT(),
+               nullable=True)
+    op.create_check_constraint(
+        'ck_articles_content_present',
+        'articles',
+        'content IS NOT NULL OR content_compressed IS NOT NULL',
+    )
+    # ### end Alembic commands ###
+
+    # 圧縮が有効な環境のみ、既存の大きな本文をバッチ単位で圧縮する
+    # （辞書を使った再圧縮は make compress-articles で行う）
+    from app.core.config import settings
+
+    if settings.ARTICLE_COMPRESSION_ENABLED:
+        _backfill_compress(
+            op.get_bind(),
+            settings.ARTICLE_COMPRESSION_THRESHOLD,
+            settings.ARTICLE_COMPRESSION_LEVEL,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _backfill_decompress(op.get_bind())
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_constraint('ck_articles_content_present', 'articles', type_='check')
+    op.alter_column('articles', 'content',
+               existing_type=sa.TEXT(),
+               nullable=False)
+    op.drop_constraint('articles_compression_dict_id_fkey', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'compression_dict_id')
+    op.drop_column('articles', 'content_compressed')
+    op.drop_table('compression_dictionaries')
+    # ### end Alembic commands ###
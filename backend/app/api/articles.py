@@ -1,14 +1,41 @@
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import NotFoundError, ValidationError
+from app.db.content_compression import decode_content
 from app.db.models.article import Article
 from app.db.models.user import User
 from app.db.session import get_db
-from app.schemas.article import ArticleCreate, ArticleDetailResponse, ArticleListItem, ArticleUpdate
+from app.schemas.article import (
+    ArticleContentDelta,
+    ArticleContentDeltaResponse,
+    ArticleCreate,
+    ArticleDetailResponse,
+    ArticleHtmlResponse,
+    ArticleListItem,
+    ArticlePatch,
+    ArticleTagsResponse,
+    ArticleTagsUpdate,
+    ArticleUpdate,
+)
+from app.services import article_writes
+from app.services.article_tags import replace_article_tags, upsert_tags
+from app.services.markdown_render import render_html
+from app.services.outbox import (
+    ARTICLE_CREATED,
+    ARTICLE_DELETED,
+    ARTICLE_TAGS_CHANGED,
+    ARTICLE_UPDATED,
+    record_event,
+)
+from app.services.tag_index import find_article_ids
+from app.services.tag_stats import apply_article_removal, apply_tag_deltas
+from app.services.versioning import record_version
 
 router = APIRouter()
 
@@ -21,10 +48,19 @@ router = APIRouter()
     description="""
     ログインユーザーが作成した記事の一覧を取得します。
 
+    **クエリパラメータ**:
+    - tags: カンマ区切りのタグ名（指定時はタグで絞り込み）
+    - mode: `and`（すべてのタグを持つ記事、デフォルト）または `or`（いずれかのタグを持つ記事）
+
+    **動作**:
+    - タグでの絞り込みは Redis 上のタグ → 記事のビットマップインデックスで行います
+
     **認証**: Cookie の session_id が必須です。
     """,
 )
 def get_articles(
+    tags: str | None = Query(default=None, description="カンマ区切りのタグ名"),
+    mode: Literal["and", "or"] = Query(default="and", description="タグの組み合わせ方"),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> list[Article]:
@@ -35,6 +71,13 @@ def get_articles(
         Article.is_valid,
     )
 
+    tag_names = [name.strip() for name in (tags or "").split(",") if name.strip()]
+    if tag_names:
+        article_ids = find_article_ids(db, user.id, tag_names, mode)
+        if not article_ids:
+            return []
+        query = query.filter(Article.id.in_(article_ids))
+
     articles = query.all()
     return articles
 
@@ -129,6 +172,13 @@ def create_article(
     )
 
     db.add(article)
+    db.flush()
+
+    # 初版をバージョン履歴に追加（記事と同一トランザクション）
+    record_version(db, article.id, user.id, article.title, article.content)
+    # プレビュー表示に備えた事前レンダリングはアウトボックス経由で行う
+    record_event(db, user.id, ARTICLE_CREATED, {"article_ids": [article.id]})
+
     db.commit()
     db.refresh(article)
 
@@ -183,6 +233,7 @@ def create_article(
 )
 def get_article_by_id(
     public_id: UUID,
+    response: Response,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Article:
@@ -204,6 +255,8 @@ def get_article_by_id(
     if not article:
         raise NotFoundError(f"Article with public_id {public_id} not found")
 
+    # 更新時の If-Match に使う
+    response.headers["ETag"] = article_writes.article_etag(article.updated_at)
     return article
 
 
@@ -225,12 +278,17 @@ def get_article_by_id(
     **任意項目**:
     - folder_id: フォルダID
 
+    **ヘッダー**:
+    - If-Match（任意）: 記事取得時の ETag（または updated_at）。指定した場合、
+      その後に他の更新があれば更新せずに 412 を返します
+
     **認証**: Cookie の session_id が必須です。
 
     **エラー**:
     - 400: バリデーションエラー
     - 401: 認証失敗
     - 404: 指定された public_id の記事が見つからない場合
+    - 412: If-Match が現在の ETag と一致しない場合
     """,
     responses={
         200: {
@@ -263,7 +321,7 @@ def get_article_by_id(
                                     "msg": "Field required",
                                     "input": {"content": "test"},
                                 }
-                            ]
+                            ],
                         }
                     }
                 }
@@ -302,40 +360,314 @@ def get_article_by_id(
 def update_article(
     public_id: UUID,
     payload: ArticleUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> Article:
+) -> article_writes.UpdatedArticle:
     """
     記事更新
-    public_id で検索して記事を更新
+    public_id・所有者・is_valid を条件にした UPDATE ... RETURNING 1 文で更新
     削除済み記事は更新不可（is_valid=True）
     """
-    article = (
-        db.query(Article)
-        .filter(
+    article = article_writes.update_article(
+        db,
+        public_id,
+        user.id,
+        {"title": payload.title, "content": payload.content, "folder_id": payload.folder_id},
+        expected_updated_at=article_writes.parse_if_match(if_match),
+    )
+    record_event(db, user.id, ARTICLE_UPDATED, {"article_ids": [article.id]})
+    db.commit()
+
+    response.headers["ETag"] = article_writes.article_etag(article.updated_at)
+    return article
+
+
+@router.patch(
+    "/{public_id}",
+    response_model=ArticleDetailResponse,
+    status_code=status.HTTP_200_OK,
+    summary="記事の部分更新",
+    description="""
+    指定された public_id の記事のうち、リクエストに含めた項目のみを更新します。
+
+    **任意項目**（1 つ以上指定）:
+    - title: 記事タイトル（1〜255文字）
+    - content: 記事本文（1文字以上）
+    - folder_id: フォルダID（null でフォルダから外す）
+
+    **ヘッダー**:
+    - If-Match（任意）: 記事取得時の ETag（または updated_at）。指定した場合、
+      その後に他の更新があれば更新せずに 412 を返します（条件は UPDATE の WHERE 句で判定）
+
+    **レスポンス**: 更新後の記事（ETag ヘッダー付き）
+
+    **エラー**:
+    - 400: バリデーションエラー（更新する項目がない場合を含む）
+    - 401: 認証失敗
+    - 404: 指定された public_id の記事が見つからない場合
+    - 412: If-Match が現在の ETag と一致しない場合
+    """,
+    responses={
+        412: {
+            "description": "他の更新と競合（details.etag は現在の ETag）",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "PRECONDITION_FAILED",
+                            "message": "記事は他の操作で更新されています。最新の内容を取得してから再度お試しください。",
+                            "details": {"etag": '"1769594400000000"'},
+                        }
+                    }
+                }
+            },
+        },
+    },
+)
+def patch_article(
+    public_id: UUID,
+    payload: ArticlePatch,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> article_writes.UpdatedArticle:
+    """
+    記事の部分更新
+    指定された項目のみを UPDATE ... RETURNING 1 文で更新（If-Match の条件も WHERE 句に含める）
+    """
+    values = payload.model_dump(exclude_unset=True)
+    if not values:
+        raise ValidationError("更新する項目を指定してください")
+
+    article = article_writes.update_article(
+        db,
+        public_id,
+        user.id,
+        values,
+        expected_updated_at=article_writes.parse_if_match(if_match),
+    )
+    record_event(db, user.id, ARTICLE_UPDATED, {"article_ids": [article.id]})
+    db.commit()
+
+    response.headers["ETag"] = article_writes.article_etag(article.updated_at)
+    return article
+
+
+@router.patch(
+    "/{public_id}/content",
+    response_model=ArticleContentDeltaResponse,
+    status_code=status.HTTP_200_OK,
+    summary="記事本文の差分更新",
+    description="""
+    指定された public_id の記事本文を、本文全体ではなく差分（行単位の操作列）で更新します。
+    大きな記事の小さな編集で、送信量とリクエストの解析時間を抑えるためのものです。
+
+    **必須項目**:
+    - base_hash: 差分の元になった本文の SHA-256（16進。GET /{public_id}/html の content_hash と同じ）
+    - ops: 操作列。`[i, j]` は元の本文（行末の改行を含めて行に分割）の i〜j-1 行目のコピー、
+      文字列は挿入するテキスト。コピー範囲は重ならない昇順で指定します
+    - result_hash: 差分を適用した後の本文の SHA-256
+
+    **レスポンス**: 更新後の本文の SHA-256 と更新日時（本文は返しません。ETag ヘッダー付き）
+
+    **エラー**（details.fallback が "PUT" の場合は PUT /{public_id} で本文全体を送信してください）:
+    - 400: 操作列が不正な場合
+    - 401: 認証失敗
+    - 404: 指定された public_id の記事が見つからない場合
+    - 409: 差分を適用した結果が result_hash と一致しない場合
+    - 412: 現在の本文が base_hash と一致しない場合（details.content_hash は現在の本文の SHA-256）
+    """,
+    responses={
+        200: {
+            "description": "更新成功",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "public_id": "550e8400-e29b-41d4-a716-446655440000",
+                        "content_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                        "updated_at": "2026-01-28T10:00:00Z",
+                    }
+                }
+            },
+        },
+        412: {
+            "description": "本文が差分の元になった内容と一致しない（全文の PUT で更新する）",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "PRECONDITION_FAILED",
+                            "message": "記事の本文が差分の元になった内容と一致しません。本文全体を送信して更新してください。",
+                            "details": {
+                                "content_hash": "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae",
+                                "etag": '"1769594400000000"',
+                                "fallback": "PUT",
+                            },
+                        }
+                    }
+                }
+            },
+        },
+    },
+)
+def patch_article_content(
+    public_id: UUID,
+    payload: ArticleContentDelta,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ArticleContentDeltaResponse:
+    """
+    記事本文の差分更新
+    現在の本文に差分を適用し、元の本文・適用結果のハッシュを照合してから保存する
+    """
+    article = article_writes.apply_content_delta(
+        db, public_id, user.id, payload.base_hash, payload.ops, payload.result_hash
+    )
+    record_event(db, user.id, ARTICLE_UPDATED, {"article_ids": [article.id]})
+    db.commit()
+
+    response.headers["ETag"] = article_writes.article_etag(article.updated_at)
+    return ArticleContentDeltaResponse(
+        public_id=article.public_id,
+        content_hash=payload.result_hash,
+        updated_at=article.updated_at,
+    )
+
+
+@router.get(
+    "/{public_id}/html",
+    response_model=ArticleHtmlResponse,
+    status_code=status.HTTP_200_OK,
+    summary="記事 HTML 取得",
+    description="""
+    指定された public_id の記事本文（Markdown）を HTML にレンダリングして返します。
+
+    **パスパラメータ**:
+    - public_id: 記事のUUID（外部公開ID）
+
+    **動作**:
+    - 生の HTML タグはエスケープされ、危険な URL スキームはリンク化されません
+    - レンダリング結果は本文のハッシュをキーにキャッシュされます（同一本文は再レンダリングしません）
+
+    **エラー**:
+    - 404: 指定された public_id の記事が見つからない場合
+    """,
+    responses={
+        200: {
+            "description": "HTML 取得成功",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "public_id": "550e8400-e29b-41d4-a716-446655440000",
+                        "content_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                        "html": "<h1>FastAPIの基礎</h1>\n<p>FastAPIは高速なWebフレームワークです...</p>\n",
+                    }
+                }
+            },
+        },
+        404: {
+            "description": "記事が見つかりません",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "NOT_FOUND",
+                            "message": "Article with public_id xxx not found",
+                            "details": None,
+                        }
+                    }
+                }
+            },
+        },
+    },
+)
+def get_article_html(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ArticleHtmlResponse:
+    """
+    記事 HTML 取得
+    本文のみを取得し、キャッシュ経由でレンダリングする
+    """
+    row = db.execute(
+        select(Article.content_text, Article.content_compressed, Article.compression_dict_id).where(
             Article.public_id == public_id,
+            Article.user_id == user.id,
             Article.is_valid,
         )
-        .first()
-    )
+    ).first()
 
-    if not article:
+    if row is None:
         raise NotFoundError(f"Article with public_id {public_id} not found")
 
-    # 所有者チェック
-    if article.user_id != user.id:
-        raise NotFoundError(f"Article with public_id {public_id} not found")
+    content = decode_content(db.connection(), *row)
 
-    article.title = payload.title
-    article.content = payload.content
-    article.folder_id = payload.folder_id
-    article.updated_by = user.id
+    key, html = render_html(content)
+    return ArticleHtmlResponse(public_id=public_id, content_hash=key, html=html)
 
-    db.add(article)
+
+@router.put(
+    "/{public_id}/tags",
+    response_model=ArticleTagsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="記事のタグ一括設定",
+    description="""
+    記事のタグを指定した一覧で置き換えます。
+
+    **動作**:
+    - 未作成のタグは自動で作成されます
+    - 一覧にないタグは記事から外されます（リンクは論理削除）
+    - タグの数に関わらず、DB への往復回数は一定です
+
+    **エラー**:
+    - 404: 指定された public_id の記事が見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def set_article_tags(
+    public_id: UUID,
+    payload: ArticleTagsUpdate,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ArticleTagsResponse:
+    """記事のタグ一括設定"""
+    article_id = db.scalar(
+        select(Article.id).where(
+            Article.public_id == public_id,
+            Article.user_id == user.id,
+            Article.is_valid,
+        )
+    )
+    if article_id is None:
+        raise NotFoundError(f"Article with public_id {public_id} not found")
+
+    names = sorted(set(payload.tags))
+    tag_ids = upsert_tags(db, user.id, names)
+    added, removed = replace_article_tags(db, user.id, article_id, tag_ids.values())
+
+    deltas = {tag_id: 1 for tag_id in added}
+    deltas.update({tag_id: -1 for tag_id in removed})
+    apply_tag_deltas(db, user.id, deltas)
+    if added or removed:
+        # タグインデックスへの反映はアウトボックス経由で行う
+        record_event(
+            db,
+            user.id,
+            ARTICLE_TAGS_CHANGED,
+            {
+                "added": [[article_id, tag_id] for tag_id in added],
+                "removed": [[article_id, tag_id] for tag_id in removed],
+            },
+        )
     db.commit()
-    db.refresh(article)
 
-    return article
+    return ArticleTagsResponse(public_id=public_id, tags=names)
 
 
 @router.delete(
@@ -401,27 +733,10 @@ def delete_article(
 ) -> None:
     """
     記事削除（論理削除）
-    is_valid フラグを False に設定
+    is_valid フラグを False に設定（public_id・所有者・is_valid を条件にした UPDATE 1 文）
     削除済み記事は削除不可（is_valid=True のみ削除可）
     """
-    article = (
-        db.query(Article)
-        .filter(
-            Article.public_id == public_id,
-            Article.is_valid,
-        )
-        .first()
-    )
-
-    if not article:
-        raise NotFoundError(f"Article with public_id {public_id} not found")
-
-    # 所有者チェック
-    if article.user_id != user.id:
-        raise NotFoundError(f"Article with public_id {public_id} not found")
-
-    article.is_valid = False
-    article.updated_by = user.id
-
-    db.add(article)
+    article_id = article_writes.soft_delete_article(db, public_id, user.id)
+    apply_article_removal(db, user.id, [article_id])
+    record_event(db, user.id, ARTICLE_DELETED, {"article_ids": [article_id]})
     db.commit()
@@ -2,8 +2,13 @@
 認証関連のAPIエンドポイント
 """
 
-from fastapi import APIRouter, Depends, Request, status
+import asyncio
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -15,15 +20,51 @@ from app.core.exceptions import (
     ValidationError,
 )
 from app.core.logging import logger
+from app.core.rate_limit import check_rate_limit, client_ip
 from app.core.redis_manager import redis_manager
-from app.core.security import hash_password, validate_password_strength, verify_password
+from app.core.security import (
+    hash_password,
+    needs_rehash,
+    validate_password_strength,
+    verify_password,
+)
+from app.core.sessions import (
+    create_session,
+    delete_session,
+    list_sessions,
+    revoke_all_sessions,
+    session_handle,
+    set_session_cookie,
+)
 from app.db.models.user import User
-from app.db.session import get_db
-from app.schemas.auth import LoginRequest, SignupRequest, UserResponse
+from app.db.session import SessionLocal, get_db
+from app.schemas.auth import ActiveSessionResponse, LoginRequest, SignupRequest, UserResponse
 
 router = APIRouter()
 
 
+def _rehash_password(user_id: int, current_hash: str, password: str) -> None:
+    """
+    現在のコストでパスワードを再ハッシュ化する（ログイン成功後にバックグラウンドで実行）
+
+    同時にパスワードが変更されていた場合は上書きしない（旧ハッシュと一致する行のみ更新）。
+    """
+    new_hash = hash_password(password)
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == current_hash)
+            .values(password_hash=new_hash)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Password rehash failed")
+    finally:
+        db.close()
+
+
 @router.post(
     "/signup",
     status_code=status.HTTP_201_CREATED,
@@ -41,9 +82,8 @@ router = APIRouter()
     1. メールアドレス形式チェック（Pydantic EmailStr）
     2. パスワード強度チェック（8文字以上、大文字・小文字・数字含む）
     3. パスワード確認チェック（password と password_confirm の一致）
-    4. メール重複チェック（DB クエリ）
-    5. ユーザー作成・保存（bcrypt でハッシュ化）
-    6. セッション ID 生成（Redis、24時間有効）
+    4. ユーザー作成・保存（bcrypt でハッシュ化。重複チェックは一意制約で行い、1 文の INSERT で完結）
+    5. セッション ID 生成（Redis、24時間有効）
 
     **セッション管理**:
     - セッション ID は Redis に保存され、24時間で自動削除されます
@@ -89,9 +129,13 @@ router = APIRouter()
 )
 async def signup(
     request: SignupRequest,
+    http_request: Request,
     db: Session = Depends(get_db),
 ):
     """ユーザー登録エンドポイント（セッション Cookie を返却）"""
+    # 0. レート制限（パスワードのハッシュ化より前に判定）
+    await asyncio.to_thread(check_rate_limit, "signup", ip=client_ip(http_request))
+
     session_id = None
     try:
         # 1. パスワード強度チェック
@@ -99,68 +143,69 @@ async def signup(
         if not is_valid:
             raise ValidationError(message=error_message)
 
-        # 2. メール重複チェック
-        existing_user = db.query(User).filter(User.email == request.email).first()
-        if existing_user:
-            raise UserAlreadyExistsError()
-
-        # 3. ユーザー作成（仮の created_by, updated_by を設定）
-        new_user = User(
-            email=request.email,
-            password_hash=hash_password(request.password),
-            display_name=request.display_name,
-            created_by=0,  # 仮の値（後で自分のIDに更新）
-            updated_by=0,
+        # 2. ユーザー作成（1 文の INSERT ... ON CONFLICT (email) DO NOTHING RETURNING）
+        #    ID を users の連番から先に採番し、created_by / updated_by にも同じ値を入れる。
+        #    メールアドレスが既に登録されていれば（同時登録を含む）行が返らない
+        public_id = uuid.uuid4()
+        new_id = select(
+            func.nextval(func.pg_get_serial_sequence(User.__tablename__, "id")).label("id")
+        ).subquery()
+        insert_stmt = (
+            pg_insert(User)
+            .from_select(
+                [
+                    "id",
+                    "public_id",
+                    "email",
+                    "password_hash",
+                    "display_name",
+                    "created_by",
+                    "updated_by",
+                ],
+                select(
+                    new_id.c.id,
+                    literal(public_id, User.public_id.type),
+                    literal(request.email),
+                    literal(hash_password(request.password)),
+                    literal(request.display_name),
+                    new_id.c.id,
+                    new_id.c.id,
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id)
         )
+        if db.execute(insert_stmt).scalar_one_or_none() is None:
+            raise UserAlreadyExistsError()
 
-        # 4. DB に追加してIDを生成
-        db.add(new_user)
-        db.flush()
-
-        # 5. ID が生成されたので created_by と updated_by を更新
-        new_user.created_by = new_user.id
-        new_user.updated_by = new_user.id
-
-        # 6. コミット
-        db.commit()
-
-        # 7. Redis セッション作成（DB コミット後）
+        # 3. Redis セッション作成（コミット前に行い、失敗したらユーザー作成ごとロールバックする。
+        #    コミットに失敗した場合は下の例外処理でセッションを削除する）
         try:
-            session_id = redis_manager.create_session(
-                user_id=str(new_user.public_id),
-                ttl_hours=24,
-            )
+            session_id = await asyncio.to_thread(create_session, str(public_id))
         except Exception as redis_error:
-            # Redis 失敗時は DB トランザクションをロールバック
             logger.error(f"Session creation failed: {type(redis_error).__name__}")
-            db.rollback()
             raise AppException(
                 message="セッション生成に失敗しました。時間をおいて再度お試しください。",
                 error_code="SESSION_CREATE_FAILED",
                 status_code=500,
             ) from redis_error
 
-        # 8. ユーザー情報レスポンス
+        # 4. コミット
+        db.commit()
+
+        # 5. ユーザー情報レスポンス
         user_response = UserResponse(
-            public_id=str(new_user.public_id),  # UUID を文字列に変換
-            email=new_user.email,
-            display_name=new_user.display_name,
+            public_id=str(public_id),  # UUID を文字列に変換
+            email=request.email,
+            display_name=request.display_name,
         )
         response = JSONResponse(
             content=user_response.model_dump(),
             status_code=status.HTTP_201_CREATED,
         )
 
-        # 9. Session Cookie を設定（HttpOnly, Secure, SameSite=Lax）
-        response.set_cookie(
-            key="session_id",
-            value=session_id,
-            httponly=True,  # JavaScript からアクセス不可
-            secure=settings.SECURE_COOKIE,  # HTTPS のみ（本番環境）
-            samesite="lax",  # CSRF 対策
-            max_age=86400,  # 24時間
-            path="/",
-        )
+        # 6. Session Cookie を設定（HttpOnly, Secure, SameSite=Lax）
+        set_session_cookie(response, session_id)
 
         return response
 
@@ -171,7 +216,7 @@ async def signup(
         db.rollback()
         if session_id:
             try:
-                redis_manager.delete_session(session_id)
+                await asyncio.to_thread(delete_session, session_id)
             except Exception:
                 pass
         raise
@@ -179,7 +224,7 @@ async def signup(
         db.rollback()
         if session_id:
             try:
-                redis_manager.delete_session(session_id)
+                await asyncio.to_thread(delete_session, session_id)
             except Exception:
                 pass
         logger.error(f"Signup failed: {type(e).__name__}", exc_info=True)
@@ -203,8 +248,9 @@ async def signup(
     - password: パスワード
 
     **処理フロー**:
+    0. レート制限（IP・メールアドレスごと。超えた場合は 429 と Retry-After）
     1. DB からメールアドレスで検索
-    2. パスワード検証（bcrypt）
+    2. パスワード検証（bcrypt。コストが現在の設定と異なればレスポンス後に再ハッシュ化）
     3. セッション ID 生成（Redis）
     4. Session Cookie を設定
 
@@ -229,6 +275,9 @@ async def signup(
             "description": "認証失敗（メール未検出またはパスワード不一致）",
             "content": {"application/json": {"example": {"detail": "Invalid email or password"}}},
         },
+        429: {
+            "description": "試行回数の上限超過（Retry-After ヘッダーに再試行までの秒数）",
+        },
         500: {
             "description": "サーバーエラー",
             "content": {"application/json": {"example": {"detail": "ログインに失敗しました"}}},
@@ -237,9 +286,16 @@ async def signup(
 )
 async def login(
     request: LoginRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """ログインエンドポイント（セッション Cookie を返却）"""
+    # 0. レート制限（ユーザー検索・bcrypt の検証より前に、IP とメールアドレスごとに判定）
+    await asyncio.to_thread(
+        check_rate_limit, "login", ip=client_ip(http_request), email=request.email
+    )
+
     session_id = None
     try:
         # 1. DB からメールアドレスで検索
@@ -249,12 +305,15 @@ async def login(
         if not user or not verify_password(request.password, user.password_hash):
             raise UnauthorizedError(message="Invalid email or password")
 
+        # 2-1. 現在の設定と異なるコストのハッシュはレスポンス後に再ハッシュ化
+        if needs_rehash(user.password_hash):
+            background_tasks.add_task(
+                _rehash_password, user.id, user.password_hash, request.password
+            )
+
         # 3. Redis セッション作成
         try:
-            session_id = redis_manager.create_session(
-                user_id=str(user.public_id),
-                ttl_hours=24,
-            )
+            session_id = await asyncio.to_thread(create_session, str(user.public_id))
         except Exception as redis_error:
             logger.error(f"Session creation failed: {type(redis_error).__name__}")
             raise AppException(
@@ -272,29 +331,21 @@ async def login(
         response = JSONResponse(content=user_response.model_dump())
 
         # 5. Session Cookie を設定
-        response.set_cookie(
-            key="session_id",
-            value=session_id,
-            httponly=True,
-            secure=settings.SECURE_COOKIE,
-            samesite="lax",
-            max_age=86400,
-            path="/",
-        )
+        set_session_cookie(response, session_id)
 
         return response
 
     except AppException:
         if session_id:
             try:
-                redis_manager.delete_session(session_id)
+                await asyncio.to_thread(delete_session, session_id)
             except Exception:
                 pass
         raise
     except Exception as e:
         if session_id:
             try:
-                redis_manager.delete_session(session_id)
+                await asyncio.to_thread(delete_session, session_id)
             except Exception:
                 pass
         logger.error(f"Login failed: {type(e).__name__}", exc_info=True)
@@ -345,7 +396,7 @@ async def logout(
 
         # 2. Redis からセッションを削除
         try:
-            redis_manager.delete_session(session_id)
+            await asyncio.to_thread(delete_session, session_id)
         except Exception as redis_error:
             logger.error(f"Session deletion failed: {type(redis_error).__name__}")
             # Redis エラーでもログアウト可能（Cookie は削除される）
@@ -430,3 +481,58 @@ async def get_me(
         email=user.email,
         display_name=user.display_name,
     )
+
+
+@router.get(
+    "/sessions",
+    response_model=list[ActiveSessionResponse],
+    status_code=status.HTTP_200_OK,
+    summary="ログイン中のセッション一覧",
+    description="""
+    現在のユーザーの有効なセッション（ログイン中の端末）を有効期限の昇順で返します。
+
+    - ユーザーごとのセッション索引から取得します（キー全体の走査は行いません）
+    - session_id は表示用の識別子で、Cookie の値とは異なります
+    - SESSION_MODE=signed ではセッションごとの記録を持たないため空の一覧を返します
+    """,
+)
+async def get_sessions(
+    request: Request,
+    user: User = Depends(get_current_user),
+):
+    """ログイン中のセッション一覧エンドポイント"""
+    current = session_handle(request.cookies.get("session_id", ""))
+    sessions = await asyncio.to_thread(list_sessions, str(user.public_id))
+    return [
+        ActiveSessionResponse(session_id=handle, expires_at=expires_at, current=handle == current)
+        for handle, expires_at in sessions
+    ]
+
+
+@router.delete(
+    "/sessions",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="全セッションのログアウト",
+    description="""
+    現在のユーザーのすべてのセッション（このリクエストのセッションを含む）を失効させ、Cookie をクリアします。
+
+    - SESSION_MODE=redis: ユーザーごとの索引から 1 回の呼び出しでまとめて削除
+    - SESSION_MODE=signed: ユーザーの世代番号を進め、発行済みのトークンをすべて無効化
+    """,
+)
+async def delete_sessions(
+    user: User = Depends(get_current_user),
+):
+    """全セッションのログアウトエンドポイント"""
+    await asyncio.to_thread(revoke_all_sessions, str(user.public_id))
+
+    response = JSONResponse(content=None, status_code=204)
+    response.delete_cookie(
+        key="session_id",
+        httponly=True,
+        secure=settings.SECURE_COOKIE,
+        samesite="lax",
+        path="/",
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,74 @@
+"""
+ダッシュボードAPI（最近更新された記事・タグの利用件数）
+"""
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user
+from app.db.models.article import Article
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.tag import Tag
+from app.db.models.user import User
+from app.db.session import get_db
+from app.schemas.dashboard import DashboardResponse, RecentArticle, TagUsage
+from app.services.tag_stats import load_tag_usage
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=DashboardResponse,
+    status_code=status.HTTP_200_OK,
+    summary="ダッシュボード取得",
+    description="""
+    ダッシュボード表示用に、最近更新された記事とタグの利用件数を取得します。
+
+    **クエリパラメータ**:
+    - recent: 最近更新された記事の取得件数（デフォルト 10）
+
+    **動作**:
+    - タグの利用件数は集計済みのテーブル（tag_stats）から読み出します（記事数に依存しません）
+    - 最近更新された記事は (user_id, updated_at) のインデックスで先頭から取得します
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_dashboard(
+    recent: int = Query(default=10, ge=1, le=50, description="最近更新された記事の取得件数"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> DashboardResponse:
+    """ダッシュボード取得"""
+    tag_names = (
+        select(func.array_agg(aggregate_order_by(Tag.name, Tag.name)))
+        .join(ArticleTagLink, ArticleTagLink.tag_id == Tag.id)
+        .where(
+            ArticleTagLink.article_id == Article.id,
+            ArticleTagLink.is_valid,
+            Tag.is_valid,
+        )
+        .scalar_subquery()
+    )
+    recent_rows = db.execute(
+        select(Article.public_id, Article.title, Article.updated_at, tag_names.label("tags"))
+        .where(Article.user_id == user.id, Article.is_valid)
+        .order_by(Article.updated_at.desc())
+        .limit(recent)
+    ).all()
+
+    return DashboardResponse(
+        recent_articles=[
+            RecentArticle(
+                public_id=row.public_id,
+                title=row.title,
+                tags=list(row.tags or []),
+                updated_at=row.updated_at,
+            )
+            for row in recent_rows
+        ],
+        tag_usage=[TagUsage.model_validate(row) for row in load_tag_usage(db, user.id)],
+    )
@@ -0,0 +1,164 @@
+"""
+下書き（自動保存・手動保存）API
+"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user
+from app.core.exceptions import NotFoundError
+from app.db.models.article import Article
+from app.db.models.article_draft import ArticleDraft
+from app.db.models.user import User
+from app.db.session import get_db
+from app.schemas.draft import DraftResponse, DraftSavedResponse, DraftSaveRequest
+from app.services.drafts import (
+    discard_cached_draft,
+    discard_persisted_draft,
+    flush_draft,
+    get_cached_draft,
+    has_cached_draft,
+    save_draft,
+)
+
+router = APIRouter()
+
+
+@router.put(
+    "/{public_id}",
+    response_model=DraftSavedResponse,
+    status_code=status.HTTP_200_OK,
+    summary="下書き自動保存",
+    description="""
+    記事の下書きを保存します（エディタの自動保存用）。
+
+    **動作**:
+    - 下書きは Redis に保存され、同じ記事への連続した保存は最新の 1 件に集約されます
+    - DB への書き込みはバックグラウンドで一定間隔ごとにまとめて行われます
+    - 記事本体（articles）は更新されません
+
+    **エラー**:
+    - 404: 対象記事が見つからない場合（Redis に下書きがない最初の保存時に確認）
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def autosave_draft(
+    public_id: UUID,
+    payload: DraftSaveRequest,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> DraftSavedResponse:
+    """
+    下書き自動保存（Redis のみ）
+    Redis に下書きがまだない場合のみ、記事の所有者を DB で確認する（以降の保存では確認しない）
+    """
+    if not has_cached_draft(user.id, public_id):
+        owned = db.scalar(
+            select(Article.id).where(
+                Article.public_id == public_id,
+                Article.user_id == user.id,
+                Article.is_valid,
+            )
+        )
+        if owned is None:
+            raise NotFoundError(f"Article with public_id {public_id} not found")
+
+    saved_at = save_draft(user.id, public_id, payload.title, payload.content)
+    return DraftSavedResponse(article_public_id=public_id, saved_at=saved_at)
+
+
+@router.post(
+    "/{public_id}/save",
+    response_model=DraftSavedResponse,
+    status_code=status.HTTP_200_OK,
+    summary="下書き手動保存",
+    description="""
+    Redis 上の最新の下書きを即座に DB に書き込みます。
+
+    **エラー**:
+    - 404: 下書き、または対象記事が見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def save_draft_now(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> DraftSavedResponse:
+    """下書き手動保存（DB へ即時フラッシュ）"""
+    draft = get_cached_draft(user.id, public_id)
+    if draft is None or not flush_draft(db, user.id, public_id):
+        raise NotFoundError(f"Draft for article {public_id} not found")
+
+    return DraftSavedResponse(article_public_id=public_id, saved_at=draft["saved_at"])
+
+
+@router.get(
+    "/{public_id}",
+    response_model=DraftResponse,
+    status_code=status.HTTP_200_OK,
+    summary="下書き取得",
+    description="""
+    記事の最新の下書きを取得します（Redis → DB の順に参照）。
+
+    **エラー**:
+    - 404: 下書きが存在しない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_draft(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> DraftResponse:
+    """下書き取得"""
+    cached = get_cached_draft(user.id, public_id)
+    if cached is not None:
+        return DraftResponse(article_public_id=public_id, **cached)
+
+    draft = db.execute(
+        select(ArticleDraft.title, ArticleDraft.content, ArticleDraft.saved_at)
+        .join(Article, Article.id == ArticleDraft.article_id)
+        .where(
+            Article.public_id == public_id,
+            Article.user_id == user.id,
+            Article.is_valid,
+            ArticleDraft.is_valid,
+        )
+    ).first()
+    if draft is None:
+        raise NotFoundError(f"Draft for article {public_id} not found")
+
+    return DraftResponse(
+        article_public_id=public_id,
+        title=draft.title,
+        content=draft.content,
+        saved_at=draft.saved_at,
+    )
+
+
+@router.delete(
+    "/{public_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="下書き破棄",
+    description="""
+    記事の下書きを破棄します（Redis から削除し、DB 上の下書きは論理削除）。
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def discard_draft(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response:
+    """下書き破棄"""
+    discard_cached_draft(user.id, public_id)
+    discard_persisted_draft(db, user.id, public_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,65 @@
+"""
+ナレッジベースのエクスポートAPI
+"""
+
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user
+from app.db.models.user import User
+from app.db.session import get_db
+from app.services.export import stream_markdown_zip, stream_ndjson
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="ナレッジベースのエクスポート",
+    description="""
+    ログインユーザーの全記事をストリーミング形式でエクスポートします。
+
+    **クエリパラメータ**:
+    - format: `ndjson`（1行1記事のJSON、デフォルト）または `zip`（フォルダ階層どおりの .md ファイル）
+
+    **動作**:
+    - 記事はサーバーサイドカーソルでチャンク単位に読み出し、逐次レスポンスに書き出します
+    - 記事件数に関わらずサーバーのメモリ使用量は一定です
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+    responses={
+        200: {
+            "description": "エクスポート成功（ストリーミング）",
+            "content": {
+                "application/x-ndjson": {},
+                "application/zip": {},
+            },
+        },
+    },
+)
+def export_articles(
+    format: Literal["ndjson", "zip"] = Query(default="ndjson", description="出力形式"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """記事エクスポート（ログインユーザーの記事のみ）"""
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    if format == "zip":
+        return StreamingResponse(
+            stream_markdown_zip(db, user.id),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="knowledgehub_{timestamp}.zip"'},
+        )
+
+    return StreamingResponse(
+        stream_ndjson(db, user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="knowledgehub_{timestamp}.ndjson"'},
+    )
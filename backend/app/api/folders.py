@@ -0,0 +1,172 @@
+"""
+フォルダAPI（ツリー取得・作成・移動・削除）
+"""
+
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user
+from app.db.models.folder import Folder
+from app.db.models.user import User
+from app.db.session import get_db
+from app.schemas.folder import (
+    FolderCreate,
+    FolderMove,
+    FolderResponse,
+    FolderTreeArticle,
+    FolderTreeNode,
+    FolderTreeResponse,
+)
+from app.services.folders import (
+    delete_folder,
+    get_owned_folder,
+    insert_folders,
+    load_tree_rows,
+    move_folder,
+)
+
+router = APIRouter()
+
+
+def _build_tree(rows: Sequence[Row[Any]]) -> FolderTreeResponse:
+    """
+    (kind, id, public_id, name, parent_id) の行からツリーを組み立てる
+
+    1 パス目でフォルダのノードを ID で引けるようにし、2 パス目で親に接続する（O(n)）。
+    行は名前順に並んでいるため、子の並び順もそのまま名前順になる。
+    削除済みフォルダに属する行はルート直下に置く。
+    """
+    tree = FolderTreeResponse(folders=[], articles=[])
+    nodes = {
+        row.id: FolderTreeNode(
+            id=row.id, public_id=row.public_id, name=row.name, folders=[], articles=[]
+        )
+        for row in rows
+        if row.kind == "folder"
+    }
+
+    for row in rows:
+        parent = nodes.get(row.parent_id) if row.parent_id is not None else None
+        if row.kind == "folder":
+            (parent.folders if parent else tree.folders).append(nodes[row.id])
+        else:
+            article = FolderTreeArticle(public_id=row.public_id, title=row.name)
+            (parent.articles if parent else tree.articles).append(article)
+
+    return tree
+
+
+@router.get(
+    "/tree",
+    response_model=FolderTreeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="フォルダツリー取得",
+    description="""
+    ログインユーザーのフォルダ階層と、各フォルダ直下の記事をツリー形式で取得します。
+
+    **動作**:
+    - フォルダと記事を 1 回のクエリで取得し、サーバー側でツリーに組み立てます
+    - フォルダ・記事はそれぞれ名前（タイトル）順に並びます
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_folder_tree(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> FolderTreeResponse:
+    """フォルダツリー取得"""
+    return _build_tree(load_tree_rows(db, user.id))
+
+
+@router.post(
+    "",
+    response_model=FolderResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="フォルダ作成",
+    description="""
+    フォルダを作成します。
+
+    **エラー**:
+    - 404: 親フォルダが見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def create_folder(
+    payload: FolderCreate,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Folder:
+    """フォルダ作成"""
+    parent_id = None
+    if payload.parent_public_id is not None:
+        parent_id = get_owned_folder(db, user.id, payload.parent_public_id).id
+
+    [folder_id] = insert_folders(db, user.id, [(payload.name, parent_id)])
+    db.commit()
+
+    return db.get_one(Folder, folder_id)
+
+
+@router.put(
+    "/{public_id}/parent",
+    response_model=FolderResponse,
+    status_code=status.HTTP_200_OK,
+    summary="フォルダ移動",
+    description="""
+    フォルダを配下のフォルダ・記事ごと別の親フォルダ（またはルート）に移動します。
+
+    **エラー**:
+    - 400: 自身または自身の子孫フォルダへ移動しようとした場合
+    - 404: フォルダまたは移動先が見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def move_folder_endpoint(
+    public_id: UUID,
+    payload: FolderMove,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Folder:
+    """フォルダ移動"""
+    folder = get_owned_folder(db, user.id, public_id)
+    new_parent = None
+    if payload.parent_public_id is not None:
+        new_parent = get_owned_folder(db, user.id, payload.parent_public_id)
+
+    move_folder(db, user.id, folder, new_parent)
+    db.commit()
+    db.refresh(folder)
+    return folder
+
+
+@router.delete(
+    "/{public_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="フォルダ削除（論理削除）",
+    description="""
+    フォルダを配下のフォルダ・記事ごと論理削除します。
+
+    **エラー**:
+    - 404: フォルダが見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def delete_folder_endpoint(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response:
+    """フォルダ削除（論理削除）"""
+    folder = get_owned_folder(db, user.id, public_id)
+    delete_folder(db, user.id, folder)
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,6 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import NotFoundError
+from app.core.redis_manager import redis_manager
 from app.db.session import get_db
 
 router = APIRouter()
@@ -27,3 +28,8 @@ def error_test_500():
 def db_check(db: Session = Depends(get_db)):
     result = db.execute(text("SELECT 1"))
     return {"result": result.scalar()}
+
+
+@router.get("/redis-check")
+def redis_check():
+    return {"result": redis_manager.redis_client.ping()}
@@ -0,0 +1,125 @@
+"""
+Markdown インポートAPI
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+
+from fastapi import APIRouter, Depends, File, UploadFile, status
+
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.exceptions import NotFoundError, ValidationError
+from app.db.models.user import User
+from app.jobs import enqueue
+from app.schemas.imports import ImportJobResponse
+from app.services.markdown_import import create_import_job, get_import_job
+
+router = APIRouter()
+
+
+def _save_uploads(files: list[UploadFile]) -> Path:
+    """
+    アップロードされたファイルを一時領域に保存する
+
+    ワーカーが別コンテナで読み込むため、IMPORT_UPLOAD_DIR（共有ボリューム）が設定されていればそこに置く。
+
+    - zip 1 件: zip ファイルとしてそのまま保存
+    - それ以外: ファイル名（ディレクトリアップロード時は相対パス）どおりに配置
+    """
+    upload_dir = settings.IMPORT_UPLOAD_DIR or None
+    if upload_dir:
+        Path(upload_dir).mkdir(parents=True, exist_ok=True)
+
+    if len(files) == 1 and (files[0].filename or "").lower().endswith(".zip"):
+        with tempfile.NamedTemporaryFile(
+            prefix="kh_import_", suffix=".zip", dir=upload_dir, delete=False
+        ) as out:
+            shutil.copyfileobj(files[0].file, out)
+        return Path(out.name)
+
+    workdir = Path(tempfile.mkdtemp(prefix="kh_import_", dir=upload_dir))
+    for upload in files:
+        # パストラバーサル対策（".." や絶対パスは取り除く）
+        parts = [
+            p for p in PurePosixPath(upload.filename or "").parts if p not in ("", ".", "..", "/")
+        ]
+        if not parts:
+            continue
+        target = workdir.joinpath(*parts)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("wb") as dest:
+            shutil.copyfileobj(upload.file, dest)
+    return workdir
+
+
+def _to_response(job_id: str, data: dict) -> ImportJobResponse:
+    return ImportJobResponse(
+        job_id=job_id,
+        status=data["status"],
+        total=int(data.get("total", 0)),
+        processed=int(data.get("processed", 0)),
+        imported=int(data.get("imported", 0)),
+        duplicates=int(data.get("duplicates", 0)),
+        failed=int(data.get("failed", 0)),
+        errors=json.loads(data.get("errors", "[]")),
+        error=data.get("error"),
+    )
+
+
+@router.post(
+    "",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Markdown インポート開始",
+    description="""
+    Markdown ファイル群（zip 1 件、またはディレクトリ配下の .md ファイル群）を取り込みます。
+
+    **動作**:
+    - アップロードを受け付けた時点でジョブを作成し、202 を返します
+    - 取り込みはワーカー（ジョブキュー）で実行されます（front-matter・タグ・フォルダ階層を解析）
+    - 本文が同一の記事（既存記事を含む）は重複としてスキップします
+    - 進捗は `GET /api/imports/{job_id}` で確認してください
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def start_import(
+    files: list[UploadFile] = File(..., description="zip ファイル、または .md ファイル群"),
+    user: User = Depends(get_current_user),
+) -> ImportJobResponse:
+    """インポートジョブ作成"""
+    if not files:
+        raise ValidationError("ファイルが指定されていません")
+
+    source = _save_uploads(files)
+    job_id = create_import_job(user.id)
+    enqueue("markdown.import", {"job_id": job_id, "user_id": user.id, "source": str(source)})
+
+    return ImportJobResponse(job_id=job_id, status="pending")
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="インポートジョブのステータス取得",
+    description="""
+    インポートジョブの進捗を取得します。
+
+    **エラー**:
+    - 404: ジョブが存在しない、または他ユーザーのジョブの場合
+    """,
+)
+def get_import_status(
+    job_id: str,
+    user: User = Depends(get_current_user),
+) -> ImportJobResponse:
+    """インポートジョブのステータス取得"""
+    data = get_import_job(job_id)
+    if not data or data.get("user_id") != str(user.id):
+        raise NotFoundError(f"Import job {job_id} not found")
+
+    return _to_response(job_id, data)
@@ -0,0 +1,59 @@
+"""
+エディタ用インクリメンタルプレビューAPI
+"""
+
+from fastapi import APIRouter, Depends, status
+
+from app.core.dependencies import get_current_user
+from app.db.models.user import User
+from app.schemas.preview import PreviewRequest, PreviewResponse
+from app.services.preview import TextEdit, build_preview
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_model=PreviewResponse,
+    status_code=status.HTTP_200_OK,
+    summary="インクリメンタルプレビュー",
+    description="""
+    エディタのリアルタイムプレビュー用に Markdown をブロック単位でレンダリングします。
+
+    **使い方**:
+    1. 初回は `content`（本文全体）と `article_id`（編集中の記事。新規作成中は省略）を送信し、
+       全ブロックの HTML と `content_hash` を受け取る
+    2. 以降は `base_hash`（直前の `content_hash`）と `edits`（ベース版に対する置換操作）のみを送信する
+    3. レスポンスの `blocks`（表示順のブロックハッシュ）に従って HTML 断片を並べ替え、
+       `fragments` に含まれる新しいブロックだけを差し替える
+
+    **動作**:
+    - 変更されたブロックのみをレンダリングします（ブロック単位のキャッシュ）
+    - ベース版はユーザー・記事ごとに最新の 1 件のみ保持します（古い `base_hash` は 409 になります）
+    - `expected_hash` を指定すると、適用後の本文ハッシュを検証します
+
+    **エラー**:
+    - 400: 編集範囲が不正な場合
+    - 409: ベース版が期限切れ、またはハッシュ不一致の場合（本文全体を再送してください）
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def preview(
+    payload: PreviewRequest,
+    user: User = Depends(get_current_user),
+) -> PreviewResponse:
+    """インクリメンタルプレビュー"""
+    result = build_preview(
+        user_id=user.id,
+        content=payload.content,
+        base_hash=payload.base_hash,
+        edits=[TextEdit(start=e.start, end=e.end, text=e.text) for e in payload.edits],
+        expected_hash=payload.expected_hash,
+        doc_id=payload.article_id,
+    )
+    return PreviewResponse(
+        content_hash=result.content_hash,
+        blocks=result.blocks,
+        fragments=result.fragments,
+    )
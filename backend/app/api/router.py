@@ -2,7 +2,14 @@ from fastapi import APIRouter
 
 from app.api.articles import router as articles_router
 from app.api.auth import router as auth_router
+from app.api.dashboard import router as dashboard_router
+from app.api.drafts import router as drafts_router
+from app.api.export import router as export_router
+from app.api.folders import router as folders_router
 from app.api.health import router as health_router
+from app.api.imports import router as imports_router
+from app.api.preview import router as preview_router
+from app.api.versions import router as versions_router
 
 api_router = APIRouter()
 
@@ -26,3 +33,52 @@ api_router.include_router(
     prefix="/articles",
     tags=["articles"],
 )
+
+# エクスポート
+api_router.include_router(
+    export_router,
+    prefix="/export",
+    tags=["export"],
+)
+
+# インポート
+api_router.include_router(
+    imports_router,
+    prefix="/imports",
+    tags=["imports"],
+)
+
+# プレビュー
+api_router.include_router(
+    preview_router,
+    prefix="/preview",
+    tags=["preview"],
+)
+
+# 下書き
+api_router.include_router(
+    drafts_router,
+    prefix="/drafts",
+    tags=["drafts"],
+)
+
+# 記事バージョン履歴
+api_router.include_router(
+    versions_router,
+    prefix="/articles",
+    tags=["versions"],
+)
+
+# フォルダ
+api_router.include_router(
+    folders_router,
+    prefix="/folders",
+    tags=["folders"],
+)
+
+# ダッシュボード
+api_router.include_router(
+    dashboard_router,
+    prefix="/dashboard",
+    tags=["dashboard"],
+)
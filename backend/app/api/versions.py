@@ -0,0 +1,168 @@
+"""
+記事バージョン履歴API（一覧・詳細・差分・リストア）
+"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user
+from app.core.exceptions import NotFoundError
+from app.db.models.article import Article
+from app.db.models.user import User
+from app.db.session import get_db
+from app.schemas.article import ArticleDetailResponse
+from app.schemas.version import ArticleVersionDetail, ArticleVersionDiff, ArticleVersionItem
+from app.services import article_writes
+from app.services.outbox import ARTICLE_UPDATED, record_event
+from app.services.versioning import diff_versions, list_versions, load_version
+
+router = APIRouter()
+
+
+def _get_owned_article(db: Session, public_id: UUID, user: User) -> Article:
+    article = (
+        db.query(Article)
+        .filter(
+            Article.public_id == public_id,
+            Article.user_id == user.id,
+            Article.is_valid,
+        )
+        .first()
+    )
+    if not article:
+        raise NotFoundError(f"Article with public_id {public_id} not found")
+    return article
+
+
+def _load_or_404(db: Session, article: Article, version_number: int) -> tuple[str, str]:
+    version = load_version(db, article.id, version_number)
+    if version is None:
+        raise NotFoundError(f"Version {version_number} of article {article.public_id} not found")
+    return version
+
+
+@router.get(
+    "/{public_id}/versions",
+    response_model=list[ArticleVersionItem],
+    status_code=status.HTTP_200_OK,
+    summary="バージョン一覧取得",
+    description="""
+    記事の過去バージョンの一覧を新しい順に取得します（本文は含みません）。
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_versions(
+    public_id: UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> list[ArticleVersionItem]:
+    """バージョン一覧取得"""
+    article = _get_owned_article(db, public_id, user)
+    return [ArticleVersionItem.model_validate(row) for row in list_versions(db, article.id)]
+
+
+@router.get(
+    "/{public_id}/versions/{version_number}",
+    response_model=ArticleVersionDetail,
+    status_code=status.HTTP_200_OK,
+    summary="バージョン詳細取得",
+    description="""
+    指定バージョンのタイトル・本文を取得します。
+
+    **エラー**:
+    - 404: 記事またはバージョンが見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_version(
+    public_id: UUID,
+    version_number: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ArticleVersionDetail:
+    """バージョン詳細取得"""
+    article = _get_owned_article(db, public_id, user)
+    title, content = _load_or_404(db, article, version_number)
+    return ArticleVersionDetail(version_number=version_number, title=title, content=content)
+
+
+@router.get(
+    "/{public_id}/versions/{version_number}/diff",
+    response_model=ArticleVersionDiff,
+    status_code=status.HTTP_200_OK,
+    summary="バージョン差分取得",
+    description="""
+    2 つのバージョン間の本文の差分（unified diff）を取得します。
+
+    **クエリパラメータ**:
+    - against: 比較元のバージョン番号（省略時は直前のバージョン）
+
+    **エラー**:
+    - 404: 記事またはバージョンが見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def get_version_diff(
+    public_id: UUID,
+    version_number: int,
+    against: int | None = Query(default=None, ge=1, description="比較元のバージョン番号"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ArticleVersionDiff:
+    """バージョン差分取得"""
+    article = _get_owned_article(db, public_id, user)
+    from_version = against if against is not None else version_number - 1
+
+    new = _load_or_404(db, article, version_number)
+    old = _load_or_404(db, article, from_version) if from_version >= 1 else ("", "")
+
+    return ArticleVersionDiff(
+        from_version=from_version,
+        to_version=version_number,
+        diff=diff_versions(old, new, f"v{from_version}", f"v{version_number}"),
+    )
+
+
+@router.post(
+    "/{public_id}/versions/{version_number}/restore",
+    response_model=ArticleDetailResponse,
+    status_code=status.HTTP_200_OK,
+    summary="バージョンのリストア",
+    description="""
+    記事のタイトル・本文を指定バージョンの内容に戻します。
+    リストア結果は新しいバージョンとして履歴に追加されます（ETag ヘッダー付き）。
+
+    **エラー**:
+    - 404: 記事またはバージョンが見つからない場合
+
+    **認証**: Cookie の session_id が必須です。
+    """,
+)
+def restore_version(
+    public_id: UUID,
+    version_number: int,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> article_writes.UpdatedArticle:
+    """
+    バージョンのリストア
+    更新は記事の更新と同じ UPDATE（更新前の行を FOR UPDATE でロック）で行うため、
+    同時に更新があってもバージョン番号が重複しない
+    """
+    article = _get_owned_article(db, public_id, user)
+    title, content = _load_or_404(db, article, version_number)
+
+    restored = article_writes.update_article(
+        db, public_id, user.id, {"title": title, "content": content}
+    )
+    record_event(db, user.id, ARTICLE_UPDATED, {"article_ids": [restored.id]})
+    db.commit()
+
+    response.headers["ETag"] = article_writes.article_etag(restored.updated_at)
+    return restored
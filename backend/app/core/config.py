@@ -12,11 +12,13 @@ class AppSettings(BaseSettings):
     app_env: Literal["local", "dev", "prod"] = "local"
     debug: bool = False
     log_level: str = "DEBUG"
+    LOG_RICH: bool = True  # Rich でログを整形するか（無効なら rich を import しない）
 
     # --- Application ---
     app_name: str = "KnowledgeHub API"
     api_prefix: str = "/api"
     app_version: str = "0.1.0"
+    OPENAPI_CACHE_PATH: str = ".cache/openapi.json"  # OpenAPI スキーマのキャッシュ（空なら無効）
 
     # --- CORS ---
     cors_allow_origins: List[str] = []
@@ -26,10 +28,84 @@ class AppSettings(BaseSettings):
 
     # --- Session Management ---
     SESSION_TIMEOUT_HOURS: int = 24
+    SESSION_REFRESH_THRESHOLD_SECONDS: int = (
+        12 * 3600  # 残り時間がこれを下回ったら有効期限を延長する（0 なら延長しない）
+    )
+    SESSION_MODE: Literal["redis", "signed"] = (
+        "redis"  # signed: 署名付きトークン（検証に Redis 不要）
+    )
+    SESSION_STORE: Literal["redis", "memory"] = (
+        "redis"  # memory: プロセス内に保存（テスト・ベンチマーク・単一プロセス構成用）
+    )
+    SESSION_SECRET_KEY: str = ""  # signed モードのトークン署名鍵（必須）
+    SESSION_REVOCATION_REFRESH_SECONDS: int = (
+        30  # 失効リストのキャッシュを読み直す間隔（通知の取りこぼし対策）
+    )
     SECURE_COOKIE: bool = False  # Cookie の Secure フラグ（本番環境では True）
 
+    # --- Password Hashing ---
+    BCRYPT_ROUNDS: int = 12  # bcrypt のコスト（BCRYPT_TARGET_VERIFY_MS が 0 のとき）
+    BCRYPT_TARGET_VERIFY_MS: float = (
+        0  # 起動時に検証時間がこの値に収まる最大のコストを求める（0 なら BCRYPT_ROUNDS を使う）
+    )
+    BCRYPT_MIN_ROUNDS: int = 10  # 自動調整の下限
+    BCRYPT_MAX_ROUNDS: int = 15  # 自動調整の上限
+
+    # --- Rate Limiting ---
+    RATE_LIMIT_ENABLED: bool = True
+    # ルートごと・識別子の種類ごとの上限（"回数/秒"。環境変数では JSON で指定）
+    RATE_LIMITS: dict[str, dict[str, str]] = {
+        "login": {"ip": "30/60", "email": "5/60"},
+        "signup": {"ip": "10/600"},
+    }
+
     # --- Redis ---
     REDIS_URL: str = ""
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0  # コマンドのタイムアウト
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 2.0  # 接続確立のタイムアウト
+    REDIS_RETRY_ATTEMPTS: int = 3  # 接続エラー・タイムアウト時の再試行回数（指数バックオフ）
+    REDIS_RETRY_BACKOFF_SECONDS: float = 0.05  # 再試行間隔の基準値
+    REDIS_RETRY_BACKOFF_MAX_SECONDS: float = 1.0  # 再試行間隔の上限
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = (
+        30  # アイドル接続を再利用する前に PING で確認する間隔
+    )
+    REDIS_STARTUP_TIMEOUT_SECONDS: float = 30.0  # 起動時に Redis の応答を待つ最大時間
+
+    # --- Markdown Rendering ---
+    RENDER_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Redis 上のレンダリング結果の保持期間
+    RENDER_LRU_SIZE: int = 1024  # プロセス内 LRU に保持する件数
+
+    # --- Drafts ---
+    DRAFT_FLUSH_INTERVAL_SECONDS: int = 30  # 下書きを DB に書き出す間隔
+    DRAFT_FLUSH_BATCH_SIZE: int = 500  # 1 回の UPSERT で書き出す下書き数
+    DRAFT_FLUSH_LEASE_SECONDS: int = 300  # フラッシュ中の下書きを中断とみなして再処理するまでの時間
+
+    # --- Article Compression ---
+    ARTICLE_COMPRESSION_ENABLED: bool = False  # 大きな本文を圧縮して保存するか
+    ARTICLE_COMPRESSION_THRESHOLD: int = 8192  # 圧縮対象とする本文サイズ（UTF-8 バイト数）
+    ARTICLE_COMPRESSION_LEVEL: int = 6  # zlib の圧縮レベル
+
+    # --- Markdown Import ---
+    IMPORT_UPLOAD_DIR: str = ""  # アップロードの保存先（API・ワーカー共有。空なら一時ディレクトリ）
+    IMPORT_MAX_FILE_BYTES: int = 10 * 1024 * 1024  # 1 ファイルの展開後サイズの上限
+    IMPORT_MAX_TOTAL_BYTES: int = 500 * 1024 * 1024  # 1 回のインポートの展開後サイズの合計の上限
+
+    # --- Background Jobs ---
+    WORKER_CONCURRENCY: int = 4  # ワーカー 1 プロセスあたりの同時実行ジョブ数（asyncio タスク数）
+    WORKER_PROCESSES: int = 2  # CPU 負荷の高いジョブを実行するプロセスプールのサイズ
+    JOB_MAX_RETRIES: int = 5  # 失敗時の最大リトライ回数（超えたらデッドレターへ）
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0  # リトライ間隔の基準値（指数バックオフ）
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 600.0  # リトライ間隔の上限
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 900  # 処理中のまま放置されたジョブを再配信するまでの時間
+
+    # --- Outbox ---
+    OUTBOX_BATCH_SIZE: int = 500  # リレーが 1 回に配信するイベント数
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 0.5  # 未配信イベントがないときのポーリング間隔
+    OUTBOX_MAX_ATTEMPTS: int = 10  # 配信失敗がこの回数に達したイベントは取り出さない
+    OUTBOX_STREAM_MAX_LENGTH: int = 100_000  # Redis のイベントストリームの保持件数（概算）
+
+    # --- Article Versions ---
+    VERSION_SNAPSHOT_INTERVAL: int = 20  # 本文全体のスナップショットを保存する間隔（バージョン数）
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -48,6 +124,7 @@ class LocalSettings(AppSettings):
 class DevSettings(AppSettings):
     debug: bool = False
     log_level: str = "INFO"
+    LOG_RICH: bool = False
     cors_allow_origins: List[str] = ["https://dev.example.com"]
     SECURE_COOKIE: bool = True
 
@@ -55,6 +132,7 @@ class DevSettings(AppSettings):
 class ProdSettings(AppSettings):
     debug: bool = False
     log_level: str = "INFO"
+    LOG_RICH: bool = False
     cors_allow_origins: List[str] = ["https://example.com"]
     SECURE_COOKIE: bool = True
 
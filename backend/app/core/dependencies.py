@@ -8,7 +8,7 @@ from fastapi import Depends, Request
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import UnauthorizedError
-from app.core.redis_manager import redis_manager
+from app.core.sessions import touch_session
 from app.db.models.user import User
 from app.db.session import get_db
 
@@ -22,9 +22,8 @@ async def get_current_user(
 
     処理フロー:
     1. Cookie から session_id を抽出
-    2. Redis でセッション有効性確認
-    3. セッションから user_id を取得
-    4. DB からユーザー情報を取得
+    2. セッションの有効性を確認し、user_id を取得（残り時間が少なければ延長）
+    3. DB からユーザー情報を取得
 
     Args:
         request: FastAPI Request オブジェクト
@@ -44,20 +43,16 @@ async def get_current_user(
     if not session_id:
         raise UnauthorizedError()
 
-    # 2. Redis でセッション有効性確認
-    if not redis_manager.is_session_valid(session_id):
-        raise UnauthorizedError()
-
-    # 3. セッションから user_id を取得
-    session_data = redis_manager.get_session(session_id)
-    if not session_data:
-        raise UnauthorizedError()
-
-    user_id = session_data.get("user_id")
+    # 2. セッションの有効性確認・user_id の取得
+    #    （redis モードは Redis を参照、signed モードは署名をプロセス内で検証）
+    user_id, refreshed_session_id = await touch_session(session_id)
     if not user_id:
         raise UnauthorizedError()
+    if refreshed_session_id:
+        # Cookie はミドルウェアで設定する（エンドポイントが独自の Response を返す場合も含む）
+        request.state.refreshed_session_id = refreshed_session_id
 
-    # 4. DB からユーザー情報を取得
+    # 3. DB からユーザー情報を取得
     user = db.query(User).filter(User.public_id == UUID(user_id)).first()
     if not user:
         raise UnauthorizedError()
@@ -13,11 +13,13 @@ class AppException(Exception):
         error_code: str = "INTERNAL_ERROR",
         status_code: int = 500,
         details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         self.message = message  # ユーザー向けエラーメッセージ
         self.error_code = error_code  # システム固有のエラーコード（例: NOT_FOUND）
         self.status_code = status_code  # HTTPステータスコード
         self.details = details  # エラーの具体的な詳細（バリデーション失敗箇所など）
+        self.headers = headers  # レスポンスに付与するヘッダー（Retry-After など）
         super().__init__(self.message)
 
 
@@ -100,3 +102,34 @@ class ConflictError(AppException):
         details: Optional[Dict[str, Any]] = None,
     ):
         super().__init__(message=message, error_code="CONFLICT", status_code=409, details=details)
+
+
+class PreconditionFailedError(AppException):
+    """412: If-Match などの事前条件を満たさない場合（他の更新と競合した場合）"""
+
+    def __init__(
+        self,
+        message: str = "Precondition failed",
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            message=message, error_code="PRECONDITION_FAILED", status_code=412, details=details
+        )
+
+
+class TooManyRequestsError(AppException):
+    """429: レート制限を超えた場合（Retry-After ヘッダーで再試行までの秒数を返す）"""
+
+    def __init__(
+        self,
+        retry_after: int,
+        message: str = "Too many requests",
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            message=message,
+            error_code="TOO_MANY_REQUESTS",
+            status_code=429,
+            details=details,
+            headers={"Retry-After": str(retry_after)},
+        )
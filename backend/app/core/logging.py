@@ -1,5 +1,6 @@
 import logging
 import logging.config
+import re
 from typing import Literal
 
 from app.core.config import settings
@@ -9,11 +10,46 @@ LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] | None
 # グローバルロガーインスタンス（setup_logging() 呼び出し後に使用可能）
 logger = logging.getLogger("app")
 
+_MARKUP_PATTERN = re.compile(r"\[/?[a-z ]+\]")
+
+
+class StripMarkupFilter(logging.Filter):
+    """Rich を使わない場合に、メッセージ中の Rich マークアップ（[bold] 等）を取り除く"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "markup", False):
+            record.msg = _MARKUP_PATTERN.sub("", str(record.msg))
+        return True
+
+
+def _handler_config(log_level: str) -> dict:
+    """
+    ハンドラーの設定
+
+    LOG_RICH が有効な場合のみ RichHandler を使う（rich は dictConfig が参照した時点で import される
+    ため、無効な環境では import 自体を行わず起動を速くする）。
+    """
+    if settings.LOG_RICH:
+        return {
+            "class": "rich.logging.RichHandler",
+            "level": log_level,
+            "formatter": "simple",
+            "rich_tracebacks": True,  # スタックトレースをリッチに表示
+            # "tracebacks_show_locals": True,  # 変数の中身を表示
+            # "markup": True,
+        }
+    return {
+        "class": "logging.StreamHandler",
+        "level": log_level,
+        "formatter": "plain",
+        "filters": ["strip_markup"],
+    }
+
 
 def setup_logging(log_level: LogLevel = None) -> None:
     """
     アプリケーション全体のロギング設定を dictConfig で一括定義する。
-    RichHandler を使用し、Uvicorn のログも統合する。
+    RichHandler（LOG_RICH 無効時は標準の StreamHandler）を使用し、Uvicorn のログも統合する。
     """
     if log_level is None:
         log_level = "DEBUG" if settings.debug else "INFO"
@@ -26,16 +62,15 @@ def setup_logging(log_level: LogLevel = None) -> None:
                 "format": "%(message)s",  # RichHandlerが時刻やレベルを装飾するためメッセージのみ
                 "datefmt": "[%X]",
             },
+            "plain": {
+                "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+            },
+        },
+        "filters": {
+            "strip_markup": {"()": StripMarkupFilter},
         },
         "handlers": {
-            "rich": {
-                "class": "rich.logging.RichHandler",
-                "level": log_level,
-                "formatter": "simple",
-                "rich_tracebacks": True,  # スタックトレースをリッチに表示
-                # "tracebacks_show_locals": True,  # 変数の中身を表示
-                # "markup": True,
-            },
+            "rich": _handler_config(log_level),
         },
         "loggers": {
             "app": {
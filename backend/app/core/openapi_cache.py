@@ -0,0 +1,73 @@
+"""
+OpenAPI スキーマのディスクキャッシュ
+
+FastAPI は /openapi.json の初回アクセス時に全ルートのスキーマを生成する（数百 ms かかる）。
+生成結果をファイルに保存し、ソースに変更がなければ次回以降のプロセスではファイルから読み込む。
+
+キャッシュの有効性は app 配下の .py ファイルのパス・更新時刻・サイズと、スキーマに出力される
+アプリの設定（タイトル・バージョン・openapi_url などの FastAPI のコンストラクター引数と、
+API プレフィックスを含む各ルートのパス）から作るフィンガープリントで判定する
+（ファイルの stat のみで、内容は読まない）。環境変数で app_name や api_prefix を変えた場合も作り直す。
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from app.core.logging import logger
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+
+def source_fingerprint(app: FastAPI) -> str:
+    """ソースとアプリの設定のフィンガープリント"""
+    app_settings = {
+        "title": app.title,
+        "version": app.version,
+        "summary": app.summary,
+        "description": app.description,
+        "openapi_version": app.openapi_version,
+        "openapi_url": app.openapi_url,
+        "root_path": app.root_path,
+        "servers": app.servers,
+        "routes": [
+            [route.path, sorted(route.methods)]
+            for route in app.routes
+            if isinstance(route, APIRoute)
+        ],
+    }
+    digest = hashlib.sha256(json.dumps(app_settings, sort_keys=True, default=str).encode())
+    for path in sorted(APP_DIR.rglob("*.py")):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(APP_DIR)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def load_schema(path: Path, fingerprint: str) -> dict[str, Any] | None:
+    """キャッシュを読み込む（存在しない・古い・壊れている場合は None）"""
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("schema")
+
+
+def save_schema(path: Path, fingerprint: str, schema: dict[str, Any]) -> None:
+    """キャッシュを書き込む（一時ファイルに書いてから置き換える。失敗しても無視する）"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"fingerprint": fingerprint, "schema": schema}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"OpenAPI cache write failed: {type(e).__name__}: {e}")
@@ -0,0 +1,136 @@
+"""
+Redis を使ったレート制限（トークンバケット）
+
+ルートごとに、識別子の種類（ip, email など）ごとの上限を RATE_LIMITS に "回数/秒" で設定する。
+例: {"login": {"ip": "30/60", "email": "5/60"}}
+    → 同じ IP から 60 秒あたり 30 回、同じメールアドレスに 60 秒あたり 5 回まで
+
+バケットは rate_limit:{route}:{種類}:{識別子のハッシュ} の Hash（tokens, ts）で、
+上限まで一定の速度で補充される。1 リクエストの複数の識別子は Lua スクリプトでまとめて判定し、
+どれか 1 つでも不足していればどのバケットも消費せずに拒否する（判定・消費は 1 往復でアトミック）。
+
+ログインでは bcrypt の検証・ユーザー検索の前に判定するため、拒否されたリクエストの
+コストは Redis の 1 往復で済む。Redis に障害がある場合は制限せずに通す（ログに警告を出す）。
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass
+from functools import cache
+
+import redis
+from fastapi import Request
+from redis.commands.core import Script
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsError
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
+
+KEY_PREFIX = "rate_limit:"
+
+# KEYS: バケットのキー
+# ARGV: キーごとに (上限, 期間（ミリ秒）)
+# 戻り値: 0（許可）/ 再試行できるまでのミリ秒
+# 時刻は Redis の TIME を使う（アプリサーバー間の時計のずれに影響されない）
+_TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local available = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or limit
+    local last = tonumber(state[2]) or now
+    tokens = math.min(limit, tokens + math.max(0, now - last) * limit / period)
+    available[i] = tokens
+    if tokens < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - tokens) * period / limit))
+    end
+end
+if retry_after > 0 then
+    return retry_after
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'tokens', available[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, ARGV[2 * i])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    limit: int
+    period_seconds: int
+
+
+@cache
+def parse_rule(spec: str) -> RateLimitRule:
+    """ "回数/秒" 形式の設定を解析する"""
+    limit, _, period = spec.partition("/")
+    rule = RateLimitRule(int(limit), int(period))
+    if rule.limit <= 0 or rule.period_seconds <= 0:
+        raise ValueError(f"Invalid rate limit: {spec}")
+    return rule
+
+
+@cache
+def _token_bucket() -> Script:
+    """トークンバケットのスクリプト（登録は初回のみ。以降は EVALSHA で実行する）"""
+    return redis_manager.redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _bucket_key(route: str, kind: str, value: str) -> str:
+    # メールアドレスなどをキーにそのまま残さない
+    digest = hashlib.sha256(value.strip().lower().encode("utf-8")).hexdigest()[:32]
+    return f"{KEY_PREFIX}{route}:{kind}:{digest}"
+
+
+def check_rate_limit(route: str, **identifiers: str | None) -> None:
+    """
+    レート制限を判定し、許可されればバケットを 1 つ消費する
+
+    Redis へ同期的にアクセスするため、async のエンドポイントからは asyncio.to_thread で呼び出す。
+
+    Args:
+        route: RATE_LIMITS のキー
+        identifiers: 識別子の種類 → 値（例: ip="203.0.113.1", email="user@example.com"）。
+            RATE_LIMITS[route] に設定のない種類・値が空のものは判定しない
+
+    Raises:
+        TooManyRequestsError: いずれかの識別子が上限を超えた場合（429, Retry-After 付き）
+    """
+    rules = settings.RATE_LIMITS.get(route) if settings.RATE_LIMIT_ENABLED else None
+    if not rules:
+        return
+
+    keys: list[str] = []
+    args: list[int] = []
+    for kind, value in identifiers.items():
+        spec = rules.get(kind)
+        if not spec or not value:
+            continue
+        rule = parse_rule(spec)
+        keys.append(_bucket_key(route, kind, value))
+        args.extend((rule.limit, rule.period_seconds * 1000))
+    if not keys:
+        return
+
+    try:
+        retry_after_ms = int(_token_bucket()(keys=keys, args=args))
+    except redis.RedisError as e:
+        logger.warning(f"Rate limit check skipped ({route}): {type(e).__name__}")
+        return
+
+    if retry_after_ms:
+        raise TooManyRequestsError(
+            retry_after=max(1, math.ceil(retry_after_ms / 1000)),
+            message="試行回数が多すぎます。しばらくしてから再度お試しください。",
+        )
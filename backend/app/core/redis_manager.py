@@ -1,39 +1,178 @@
 """
 Redis セッション管理
+
+- session:{session_id}     → セッションデータ（JSON。TTL はセッションの有効期限）
+- user_sessions:{user_id}  → ユーザーのセッション ID の索引（ZSet、score は exp_timestamp）
+  作成時はセッションと同じ MULTI で、延長・削除時はセッションの操作の直後に更新し、期限切れの要素は
+  作成時・一覧取得時に削除する。全セッションの失効・一覧に SCAN を使わないための索引。
+  Lua スクリプトは KEYS で宣言したキーのみを操作する（キー名をスクリプト内で組み立てない）。
+
+同期版（RedisSessionManager）と asyncio 版（AsyncRedisSessionStore）があり、どちらも
+app.core.session_store のセッションストアのプロトコルを実装する。
+
+クライアントは初回参照時に作成し、接続はコマンドの初回実行時に確立する（import 時には接続しない）。
+起動時の疎通確認はアプリの lifespan（ワーカー・リレーは起動処理）から wait_until_ready で行う。
 """
 
 import json
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 import redis
+import redis.asyncio
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 
 from app.core.config import settings
 from app.core.logging import logger
 
+SESSION_KEY_PREFIX = "session:"
+USER_SESSIONS_KEY_PREFIX = "user_sessions:"
+
+# セッションを取得し、残り TTL がしきい値を下回っていれば有効期限を延長する（1 往復）
+# スクリプトは KEYS で宣言したキーのみを操作する（ユーザーの索引の更新は呼び出し側で行う）
+# KEYS[1]: session:{session_id}
+# ARGV[1]: 現在時刻（UNIX 時刻）, ARGV[2]: 延長後の TTL（秒）, ARGV[3]: 延長するしきい値（秒）
+# 戻り値: {セッションデータ（JSON）, 延長したら 1} / セッションがなければ nil
+_TOUCH_SESSION_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return nil
+end
+local remaining = redis.call('TTL', KEYS[1])
+if remaining < 0 or remaining >= tonumber(ARGV[3]) then
+    return {raw, 0}
+end
+local data = cjson.decode(raw)
+local now = tonumber(ARGV[1])
+if (tonumber(data['exp_timestamp']) or 0) <= now then
+    return {raw, 0}
+end
+data['exp_timestamp'] = now + tonumber(ARGV[2])
+raw = cjson.encode(data)
+redis.call('SET', KEYS[1], raw, 'EX', ARGV[2])
+return {raw, 1}
+"""
+
+
+def _session_user_id(raw: str) -> Optional[str]:
+    """保存されたセッションデータからユーザー ID を取り出す（壊れていれば None）"""
+    try:
+        return json.loads(raw).get("user_id")
+    except (ValueError, AttributeError):
+        return None
+
+
+def now_timestamp() -> int:
+    """exp_timestamp と比較する現在時刻"""
+    return int(datetime.utcnow().timestamp())
+
+
+def create_redis_client(redis_url: str, *, decode_responses: bool = True) -> redis.Redis:
+    """
+    設定に従って Redis クライアントを作成する（この時点では接続しない）
+
+    接続エラー・タイムアウト時は指数バックオフで REDIS_RETRY_ATTEMPTS 回まで再試行し、
+    再接続はコネクションプールが行う。アイドル接続は再利用前に PING で確認する。
+    """
+    return redis.from_url(
+        redis_url,
+        decode_responses=decode_responses,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        retry=Retry(
+            ExponentialBackoff(
+                cap=settings.REDIS_RETRY_BACKOFF_MAX_SECONDS,
+                base=settings.REDIS_RETRY_BACKOFF_SECONDS,
+            ),
+            settings.REDIS_RETRY_ATTEMPTS,
+        ),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    )
+
+
+def create_async_redis_client(redis_url: str) -> redis.asyncio.Redis:
+    """create_redis_client の asyncio 版（設定は同じ）"""
+    return redis.asyncio.from_url(
+        redis_url,
+        decode_responses=True,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        retry=AsyncRetry(
+            ExponentialBackoff(
+                cap=settings.REDIS_RETRY_BACKOFF_MAX_SECONDS,
+                base=settings.REDIS_RETRY_BACKOFF_SECONDS,
+            ),
+            settings.REDIS_RETRY_ATTEMPTS,
+        ),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    )
+
 
 class RedisSessionManager:
     """Redis を使用したセッション管理クラス"""
 
     def __init__(self, redis_url: str):
         """
-        Redis コネクション初期化
+        初期化（接続は行わない）
 
         Args:
             redis_url: Redis 接続 URL（例: redis://redis:6379/0）
+        """
+        self.redis_url = redis_url
+        self._client: redis.Redis | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def redis_client(self):
+        """Redis クライアント（初回参照時に作成する）"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = create_redis_client(self.redis_url)
+        return self._client
+
+    def wait_until_ready(self, timeout: float = settings.REDIS_STARTUP_TIMEOUT_SECONDS) -> float:
+        """
+        Redis が応答するまで PING を繰り返す（起動時のヘルスゲート）
+
+        Args:
+            timeout: 待機する最大秒数
+
+        Returns:
+            応答までにかかった秒数
 
         Raises:
-            redis.ConnectionError: Redis 接続失敗時
+            redis.ConnectionError: timeout 秒以内に応答しなかった場合
         """
-        try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            # 接続確認
-            self.redis_client.ping()
-            logger.info("✓ Redis 接続成功")
-        except redis.ConnectionError as e:
-            logger.error(f"✗ Redis 接続失敗: {e}")
-            raise
+        started = time.monotonic()
+        delay = settings.REDIS_RETRY_BACKOFF_SECONDS
+        while True:
+            try:
+                self.redis_client.ping()
+                elapsed = time.monotonic() - started
+                logger.info(f"✓ Redis 接続成功（{elapsed * 1000:.0f}ms）")
+                return elapsed
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                if time.monotonic() - started + delay > timeout:
+                    logger.error(f"✗ Redis 接続失敗: {e}")
+                    raise redis.ConnectionError(f"Redis is not ready: {e}") from e
+                logger.warning(f"Redis 接続待機中: {type(e).__name__}")
+                time.sleep(delay)
+                delay = min(delay * 2, settings.REDIS_RETRY_BACKOFF_MAX_SECONDS)
+
+    def close(self) -> None:
+        """コネクションプールを閉じる（次回の参照時に作り直す）"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
     def create_session(self, user_id: str, ttl_hours: int = 24) -> str:
         """
@@ -51,7 +190,9 @@ class RedisSessionManager:
             redis.TimeoutError: Redis 操作タイムアウト時
         """
         session_id = uuid.uuid4().hex
-        exp_timestamp = int((datetime.utcnow() + timedelta(hours=ttl_hours)).timestamp())
+        now = now_timestamp()
+        ttl_seconds = ttl_hours * 3600
+        exp_timestamp = now + ttl_seconds
 
         session_data = {
             "user_id": str(user_id),  # UUID を文字列に変換
@@ -59,13 +200,15 @@ class RedisSessionManager:
         }
 
         try:
-            # Redis に保存（TTL 付き）
-            ttl_seconds = ttl_hours * 3600
-            self.redis_client.setex(
-                f"session:{session_id}",
-                ttl_seconds,
-                json.dumps(session_data),
-            )
+            # Redis に保存（TTL 付き）し、同じトランザクションでユーザーの索引に追加
+            # （索引の期限切れ要素はここで削除する。索引の TTL は最も遅い有効期限に合わせる）
+            index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.setex(f"{SESSION_KEY_PREFIX}{session_id}", ttl_seconds, json.dumps(session_data))
+            pipe.zremrangebyscore(index_key, "-inf", now)
+            pipe.zadd(index_key, {session_id: exp_timestamp})
+            pipe.expire(index_key, ttl_seconds)
+            pipe.execute()
             logger.debug(f"セッション作成: session_id={session_id}, user_id={user_id}")
             return session_id
         except (redis.ConnectionError, redis.TimeoutError) as e:
@@ -89,7 +232,7 @@ class RedisSessionManager:
             redis.ConnectionError: Redis 接続失敗時
         """
         try:
-            session_data = self.redis_client.get(f"session:{session_id}")
+            session_data = self.redis_client.get(f"{SESSION_KEY_PREFIX}{session_id}")
             if session_data is None:
                 return None
             return json.loads(session_data)
@@ -99,7 +242,11 @@ class RedisSessionManager:
 
     def delete_session(self, session_id: str) -> bool:
         """
-        セッションを削除（ログアウト時に使用）
+        セッションを削除（ログアウト時に使用。ユーザーの索引からも取り除く）
+
+        セッションを WATCH して GET でユーザー ID を取り出し、セッションの DEL と索引の ZREM を
+        1 つの MULTI で実行する（途中で失敗しても索引に削除済みのセッションが残らない）。
+        その間にセッションが更新（延長）された場合は読み直す。
 
         Args:
             session_id: セッション ID
@@ -110,10 +257,26 @@ class RedisSessionManager:
         Raises:
             redis.ConnectionError: Redis 接続失敗時
         """
+        key = f"{SESSION_KEY_PREFIX}{session_id}"
         try:
-            result = self.redis_client.delete(f"session:{session_id}")
+            with self.redis_client.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        pipe.watch(key)
+                        raw = pipe.get(key)
+                        if raw is None:
+                            return False
+                        user_id = _session_user_id(raw)
+                        pipe.multi()
+                        pipe.delete(key)
+                        if user_id:
+                            pipe.zrem(f"{USER_SESSIONS_KEY_PREFIX}{user_id}", session_id)
+                        pipe.execute()
+                        break
+                    except redis.WatchError:
+                        continue
             logger.debug(f"セッション削除: session_id={session_id}")
-            return result > 0
+            return True
         except redis.ConnectionError as e:
             logger.error(f"セッション削除失敗: {e}")
             raise
@@ -136,14 +299,238 @@ class RedisSessionManager:
             if session_data is None:
                 return False
 
-            exp_timestamp = session_data.get("exp_timestamp")
-            current_timestamp = int(datetime.utcnow().timestamp())
-
-            return current_timestamp < (exp_timestamp or 0)
+            return now_timestamp() < (session_data.get("exp_timestamp") or 0)
         except redis.ConnectionError as e:
             logger.error(f"セッション有効性確認失敗: {e}")
             raise
 
+    def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]:
+        """
+        有効なセッションを取得し、残り時間が少なければ有効期限を延長する（スライディング有効期限）
+
+        取得と延長を Lua スクリプトで 1 往復にまとめる。延長は残り TTL が
+        refresh_threshold_seconds を下回ったときだけ行うため、通常のリクエストでは書き込みが発生しない。
+        延長時は TTL と exp_timestamp を同じ値に揃える（is_session_valid の判定と一致させる）。
+        延長した場合のみ、ユーザーの索引の有効期限をもう 1 往復で更新する。
+
+        Args:
+            session_id: セッション ID
+            ttl_seconds: 延長後の有効期限（秒）
+            refresh_threshold_seconds: 延長するしきい値（秒。0 なら延長しない）
+
+        Returns:
+            (セッションデータ, 延長したか)。期限切れ・未検出ならセッションデータは None
+
+        Raises:
+            redis.ConnectionError: Redis 接続失敗時
+        """
+        try:
+            touch = self.redis_client.register_script(_TOUCH_SESSION_SCRIPT)
+            result = touch(
+                keys=[f"{SESSION_KEY_PREFIX}{session_id}"],
+                args=[now_timestamp(), ttl_seconds, refresh_threshold_seconds],
+            )
+            if result is None:
+                return None, False
+
+            raw, refreshed = result
+            session_data = json.loads(raw)
+            if refreshed:
+                index_key = f"{USER_SESSIONS_KEY_PREFIX}{session_data['user_id']}"
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.zadd(index_key, {session_id: session_data["exp_timestamp"]})
+                pipe.expire(index_key, ttl_seconds)
+                pipe.execute()
+        except redis.ConnectionError as e:
+            logger.error(f"セッション取得失敗: {e}")
+            raise
+        if now_timestamp() >= (session_data.get("exp_timestamp") or 0):
+            return None, False
+        if refreshed:
+            logger.debug(f"セッション延長: session_id={session_id}")
+        return session_data, bool(refreshed)
+
+    def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]:
+        """
+        ユーザーの有効なセッションを取得（期限切れの要素は索引から削除する）
+
+        Args:
+            user_id: ユーザー ID（UUID）
+
+        Returns:
+            (セッション ID, exp_timestamp) のリスト（有効期限の昇順）
+
+        Raises:
+            redis.ConnectionError: Redis 接続失敗時
+        """
+        index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.zremrangebyscore(index_key, "-inf", now_timestamp())
+            pipe.zrange(index_key, 0, -1, withscores=True)
+            _, sessions = pipe.execute()
+        except redis.ConnectionError as e:
+            logger.error(f"セッション一覧取得失敗: {e}")
+            raise
+        return [(session_id, int(exp_timestamp)) for session_id, exp_timestamp in sessions]
+
+    def delete_user_sessions(self, user_id: str) -> int:
+        """
+        ユーザーのセッションをすべて削除（パスワード変更時など）
+
+        索引からセッション ID を取得し、各セッションと索引の要素を 1 パイプラインで削除する
+        （削除中に作成されたセッションは索引に残る）。
+
+        Args:
+            user_id: ユーザー ID（UUID）
+
+        Returns:
+            削除したセッション数
+
+        Raises:
+            redis.ConnectionError: Redis 接続失敗時
+        """
+        index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        try:
+            session_ids = self.redis_client.zrange(index_key, 0, -1)
+            if not session_ids:
+                return 0
+            pipe = self.redis_client.pipeline(transaction=False)
+            for session_id in session_ids:
+                pipe.delete(f"{SESSION_KEY_PREFIX}{session_id}")
+            pipe.zrem(index_key, *session_ids)
+            removed = sum(pipe.execute()[:-1])
+            logger.debug(f"セッション一括削除: user_id={user_id}, count={removed}")
+            return removed
+        except redis.ConnectionError as e:
+            logger.error(f"セッション一括削除失敗: {e}")
+            raise
+
+
+class AsyncRedisSessionStore:
+    """
+    RedisSessionManager の asyncio 版（イベントループをブロックせずにセッションを参照する）
+
+    キー・Lua スクリプトは同期版と共通。クライアントは初回参照時に作成する。
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self._client: redis.asyncio.Redis | None = None
+
+    @property
+    def redis_client(self):
+        """Redis クライアント（初回参照時に作成する）"""
+        if self._client is None:
+            self._client = create_async_redis_client(self.redis_url)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def create_session(self, user_id: str, ttl_hours: int = 24) -> str:
+        """セッションを作成して Redis に保存（RedisSessionManager.create_session と同じ）"""
+        session_id = uuid.uuid4().hex
+        now = now_timestamp()
+        ttl_seconds = ttl_hours * 3600
+        exp_timestamp = now + ttl_seconds
+        session_data = {"user_id": str(user_id), "exp_timestamp": exp_timestamp}
+
+        index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.setex(f"{SESSION_KEY_PREFIX}{session_id}", ttl_seconds, json.dumps(session_data))
+            pipe.zremrangebyscore(index_key, "-inf", now)
+            pipe.zadd(index_key, {session_id: exp_timestamp})
+            pipe.expire(index_key, ttl_seconds)
+            await pipe.execute()
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"セッション作成失敗（Redis エラー）: {type(e).__name__}: {e}")
+            raise redis.ConnectionError(f"Failed to create session: {e}") from e
+        logger.debug(f"セッション作成: session_id={session_id}, user_id={user_id}")
+        return session_id
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        session_data = await self.redis_client.get(f"{SESSION_KEY_PREFIX}{session_id}")
+        return json.loads(session_data) if session_data is not None else None
+
+    async def delete_session(self, session_id: str) -> bool:
+        """RedisSessionManager.delete_session と同じ（WATCH + MULTI で DEL と ZREM を行う）"""
+        key = f"{SESSION_KEY_PREFIX}{session_id}"
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        return False
+                    user_id = _session_user_id(raw)
+                    pipe.multi()
+                    pipe.delete(key)
+                    if user_id:
+                        pipe.zrem(f"{USER_SESSIONS_KEY_PREFIX}{user_id}", session_id)
+                    await pipe.execute()
+                    break
+                except redis.WatchError:
+                    continue
+        logger.debug(f"セッション削除: session_id={session_id}")
+        return True
+
+    async def is_session_valid(self, session_id: str) -> bool:
+        session_data = await self.get_session(session_id)
+        return session_data is not None and now_timestamp() < (
+            session_data.get("exp_timestamp") or 0
+        )
+
+    async def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]:
+        """RedisSessionManager.touch_session と同じ（取得と延長を 1 往復で行う）"""
+        touch = self.redis_client.register_script(_TOUCH_SESSION_SCRIPT)
+        result = await touch(
+            keys=[f"{SESSION_KEY_PREFIX}{session_id}"],
+            args=[now_timestamp(), ttl_seconds, refresh_threshold_seconds],
+        )
+        if result is None:
+            return None, False
+
+        raw, refreshed = result
+        session_data = json.loads(raw)
+        if refreshed:
+            index_key = f"{USER_SESSIONS_KEY_PREFIX}{session_data['user_id']}"
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.zadd(index_key, {session_id: session_data["exp_timestamp"]})
+            pipe.expire(index_key, ttl_seconds)
+            await pipe.execute()
+        if now_timestamp() >= (session_data.get("exp_timestamp") or 0):
+            return None, False
+        return session_data, bool(refreshed)
+
+    async def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]:
+        index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zremrangebyscore(index_key, "-inf", now_timestamp())
+        pipe.zrange(index_key, 0, -1, withscores=True)
+        _, sessions = await pipe.execute()
+        return [(session_id, int(exp_timestamp)) for session_id, exp_timestamp in sessions]
+
+    async def delete_user_sessions(self, user_id: str) -> int:
+        index_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        session_ids = await self.redis_client.zrange(index_key, 0, -1)
+        if not session_ids:
+            return 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.delete(f"{SESSION_KEY_PREFIX}{session_id}")
+        pipe.zrem(index_key, *session_ids)
+        removed = sum((await pipe.execute())[:-1])
+        logger.debug(f"セッション一括削除: user_id={user_id}, count={removed}")
+        return int(removed)
+
 
-# グローバル インスタンス
+# グローバル インスタンス（接続は初回のコマンド実行時）
 redis_manager = RedisSessionManager(settings.REDIS_URL)
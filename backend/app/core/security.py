@@ -3,16 +3,93 @@
 """
 
 import re
+import time
 
 import bcrypt
+import redis
 
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
 
-def hash_password(password: str) -> str:
+# 自動調整したコストを共有するキー（アプリのバージョンごと。全プロセスが同じコストを使う）
+BCRYPT_ROUNDS_KEY_PREFIX = "bcrypt:rounds:"
+BCRYPT_ROUNDS_TTL_SECONDS = 24 * 3600
+
+# 新しくハッシュ化するときのコスト（起動時の calibrate_bcrypt_rounds で変わる）
+_bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+
+def bcrypt_rounds() -> int:
+    return _bcrypt_rounds
+
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    global _bcrypt_rounds
+    _bcrypt_rounds = rounds
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = settings.BCRYPT_MIN_ROUNDS,
+    max_rounds: int = settings.BCRYPT_MAX_ROUNDS,
+) -> int:
+    """
+    検証時間が target_ms 以下に収まる最大のコストを求めて設定する
+
+    コストが 1 増えるごとに計算量は 2 倍になるため、min_rounds での所要時間を測り、
+    そこから各コストの所要時間を見積もる（計測は min_rounds で 2 回のみ）。
+
+    Returns:
+        設定したコスト
+    """
+    password = b"calibration-password"
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=min_rounds))
+    elapsed_ms = float("inf")
+    for _ in range(2):
+        started = time.perf_counter()
+        bcrypt.checkpw(password, hashed)
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - started) * 1000)
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+    set_bcrypt_rounds(rounds)
+    return rounds
+
+
+def calibrate_shared_bcrypt_rounds(target_ms: float) -> int:
+    """
+    デプロイごとに 1 回だけコストを自動調整し、Redis で全プロセスに共有する
+
+    最初に起動したプロセスの計測結果を SET NX で保存し、以降のプロセスはその値を使う
+    （プロセスごとの計測の揺らぎでコストが食い違わないようにする）。
+    Redis に接続できない場合はプロセス内で調整した値を使う。
+
+    Returns:
+        設定したコスト
+    """
+    key = f"{BCRYPT_ROUNDS_KEY_PREFIX}{settings.app_version}"
+    try:
+        pinned = redis_manager.redis_client.get(key)
+        if pinned is None:
+            rounds = calibrate_bcrypt_rounds(target_ms)
+            redis_manager.redis_client.set(key, rounds, nx=True, ex=BCRYPT_ROUNDS_TTL_SECONDS)
+            pinned = redis_manager.redis_client.get(key) or rounds
+    except redis.RedisError as e:
+        logger.warning(f"Shared bcrypt rounds unavailable: {type(e).__name__}")
+        return calibrate_bcrypt_rounds(target_ms)
+    set_bcrypt_rounds(int(pinned))
+    return int(pinned)
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
     """
     平文パスワードをハッシュ化する
 
     Args:
         password: 平文パスワード
+        rounds: bcrypt のコスト（省略時は現在の設定）
 
     Returns:
         ハッシュ化されたパスワード（str）
@@ -21,11 +98,29 @@ def hash_password(password: str) -> str:
     if len(password.encode("utf-8")) > 72:
         password = password[:72]
 
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=rounds or _bcrypt_rounds)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
+def hash_rounds(hashed_password: str) -> int | None:
+    """ハッシュに記録されたコストを返す（"$2b$12$..." の 12。形式が不正なら None）"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    現在の設定より低いコストでハッシュ化されているか
+
+    再ハッシュはコストを上げる方向のみ（設定が下がっても既存の強いハッシュは弱めない）。
+    """
+    rounds = hash_rounds(hashed_password)
+    return rounds is not None and rounds < _bcrypt_rounds
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     平文パスワードとハッシュ化されたパスワードを検証する
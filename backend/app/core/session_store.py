@@ -0,0 +1,213 @@
+"""
+セッションストア
+
+SESSION_MODE=redis のセッションの保存先を SessionStore / AsyncSessionStore プロトコルとして定義し、
+SESSION_STORE で実装を切り替える。
+- redis:  RedisSessionManager（同期）/ AsyncRedisSessionStore（asyncio）。複数プロセス・複数ノードで共有
+- memory: MemorySessionStore。プロセス内の dict に保存し、有効期限はヒープで管理して期限切れを削除する
+          （テスト・ベンチマーク、単一プロセスの構成用。再起動でセッションは失われる）
+"""
+
+import heapq
+import threading
+import uuid
+from functools import cache
+from typing import Optional, Protocol
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import (
+    AsyncRedisSessionStore,
+    RedisSessionManager,
+    now_timestamp,
+    redis_manager,
+)
+
+
+class SessionStore(Protocol):
+    """セッションの保存先（session_id → {"user_id", "exp_timestamp"}、ユーザーごとの索引つき）"""
+
+    def create_session(self, user_id: str, ttl_hours: int = 24) -> str: ...
+
+    def get_session(self, session_id: str) -> Optional[dict]: ...
+
+    def delete_session(self, session_id: str) -> bool: ...
+
+    def is_session_valid(self, session_id: str) -> bool: ...
+
+    def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]: ...
+
+    def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]: ...
+
+    def delete_user_sessions(self, user_id: str) -> int: ...
+
+
+class AsyncSessionStore(Protocol):
+    """SessionStore の asyncio 版"""
+
+    async def create_session(self, user_id: str, ttl_hours: int = 24) -> str: ...
+
+    async def get_session(self, session_id: str) -> Optional[dict]: ...
+
+    async def delete_session(self, session_id: str) -> bool: ...
+
+    async def is_session_valid(self, session_id: str) -> bool: ...
+
+    async def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]: ...
+
+    async def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]: ...
+
+    async def delete_user_sessions(self, user_id: str) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class MemorySessionStore:
+    """
+    プロセス内のセッションストア
+
+    有効期限は (exp_timestamp, session_id) のヒープで管理し、各操作の前に期限切れのものを
+    先頭から削除する。延長・削除で古くなったヒープの要素は取り出したときに読み捨てる。
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict] = {}
+        self._user_sessions: dict[str, dict[str, int]] = {}
+        self._expiry: list[tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: int) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry)
+            session_data = self._sessions.get(session_id)
+            # 延長済みのセッションは新しい要素がヒープに残っている
+            if session_data is not None and session_data["exp_timestamp"] <= now:
+                self._remove(session_id, session_data)
+
+    def _remove(self, session_id: str, session_data: dict) -> None:
+        del self._sessions[session_id]
+        sessions = self._user_sessions.get(session_data["user_id"])
+        if sessions is not None:
+            sessions.pop(session_id, None)
+            if not sessions:
+                del self._user_sessions[session_data["user_id"]]
+
+    def _set_expiry(self, session_id: str, session_data: dict, exp_timestamp: int) -> None:
+        session_data["exp_timestamp"] = exp_timestamp
+        self._user_sessions.setdefault(session_data["user_id"], {})[session_id] = exp_timestamp
+        heapq.heappush(self._expiry, (exp_timestamp, session_id))
+
+    def create_session(self, user_id: str, ttl_hours: int = 24) -> str:
+        session_id = uuid.uuid4().hex
+        now = now_timestamp()
+        session_data = {"user_id": str(user_id)}
+        with self._lock:
+            self._evict(now)
+            self._sessions[session_id] = session_data
+            self._set_expiry(session_id, session_data, now + ttl_hours * 3600)
+        logger.debug(f"セッション作成: session_id={session_id}, user_id={user_id}")
+        return session_id
+
+    def get_session(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            self._evict(now_timestamp())
+            session_data = self._sessions.get(session_id)
+            return dict(session_data) if session_data is not None else None
+
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock:
+            session_data = self._sessions.get(session_id)
+            if session_data is None:
+                return False
+            self._remove(session_id, session_data)
+        logger.debug(f"セッション削除: session_id={session_id}")
+        return True
+
+    def is_session_valid(self, session_id: str) -> bool:
+        # 期限切れのセッションは get_session の時点で削除される
+        return self.get_session(session_id) is not None
+
+    def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]:
+        now = now_timestamp()
+        with self._lock:
+            self._evict(now)
+            session_data = self._sessions.get(session_id)
+            if session_data is None:
+                return None, False
+            refreshed = session_data["exp_timestamp"] - now < refresh_threshold_seconds
+            if refreshed:
+                self._set_expiry(session_id, session_data, now + ttl_seconds)
+            return dict(session_data), refreshed
+
+    def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]:
+        with self._lock:
+            self._evict(now_timestamp())
+            sessions = self._user_sessions.get(str(user_id), {})
+            return sorted(sessions.items(), key=lambda item: item[1])
+
+    def delete_user_sessions(self, user_id: str) -> int:
+        with self._lock:
+            sessions = self._user_sessions.pop(str(user_id), {})
+            for session_id in sessions:
+                self._sessions.pop(session_id, None)
+        logger.debug(f"セッション一括削除: user_id={user_id}, count={len(sessions)}")
+        return len(sessions)
+
+
+class AsyncSessionStoreAdapter:
+    """I/O を伴わない同期のストア（MemorySessionStore）を AsyncSessionStore として使う"""
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    async def create_session(self, user_id: str, ttl_hours: int = 24) -> str:
+        return self.store.create_session(user_id, ttl_hours)
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        return self.store.get_session(session_id)
+
+    async def delete_session(self, session_id: str) -> bool:
+        return self.store.delete_session(session_id)
+
+    async def is_session_valid(self, session_id: str) -> bool:
+        return self.store.is_session_valid(session_id)
+
+    async def touch_session(
+        self, session_id: str, ttl_seconds: int, refresh_threshold_seconds: int
+    ) -> tuple[Optional[dict], bool]:
+        return self.store.touch_session(session_id, ttl_seconds, refresh_threshold_seconds)
+
+    async def list_user_sessions(self, user_id: str) -> list[tuple[str, int]]:
+        return self.store.list_user_sessions(user_id)
+
+    async def delete_user_sessions(self, user_id: str) -> int:
+        return self.store.delete_user_sessions(user_id)
+
+    async def close(self) -> None:
+        pass
+
+
+@cache
+def get_session_store() -> SessionStore:
+    """SESSION_STORE に応じたセッションストア（同期）"""
+    if settings.SESSION_STORE == "memory":
+        return MemorySessionStore()
+    return redis_manager
+
+
+@cache
+def get_async_session_store() -> AsyncSessionStore:
+    """SESSION_STORE に応じたセッションストア（asyncio）。memory は同期版と同じ内容を参照する"""
+    store = get_session_store()
+    if isinstance(store, RedisSessionManager):
+        return AsyncRedisSessionStore(store.redis_url)
+    return AsyncSessionStoreAdapter(store)
@@ -0,0 +1,331 @@
+"""
+署名付きセッショントークン（SESSION_MODE=signed）
+
+セッション Cookie に HMAC-SHA256 で署名したトークンを入れ、リクエストごとの検証を
+Redis へのアクセスなしにプロセス内で完結させる。
+
+トークンの形式: base64url(本体 32 バイト) + "." + base64url(署名 16 バイト)
+- 本体: ユーザーの public_id（16 バイト）, 有効期限（UNIX 時刻）, 世代番号, トークン ID（8 バイト）
+  トークン ID はログインごとに発行し、延長（再発行）では引き継ぐ（セッションの識別子）
+- 署名: HMAC-SHA256(SESSION_SECRET_KEY, 本体) の先頭 16 バイト
+
+失効（ログアウト・全セッションの失効）は Redis で管理し、プロセス内にキャッシュする。
+- session_tokens:revoked     → 失効したトークン ID（ZSet、score は同じ ID のトークンの最も遅い有効期限。
+                               期限切れの要素は削除）
+- session_tokens:generations → ユーザーごとの有効な最小の世代番号（Hash。これ未満のトークンは失効）
+- session_tokens:events      → 失効の通知（Pub/Sub）。"revoked:{トークン ID}" /
+                               "generation:{ユーザー ID}:{世代番号}" を受信したプロセスは、
+                               その 1 件だけをキャッシュに反映する（失効リスト全体は読み直さない）
+
+Pub/Sub の取りこぼしに備え、キャッシュは SESSION_REVOCATION_REFRESH_SECONDS を過ぎたら
+次の検証時にも読み直す（asyncio からはスレッドで読み直す）。購読が切れた場合は指数バックオフで
+再接続する（再接続時にも全体を読み直す）。
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
+
+REVOKED_KEY = "session_tokens:revoked"
+GENERATIONS_KEY = "session_tokens:generations"
+EVENTS_CHANNEL = "session_tokens:events"
+
+# 本体: public_id(16) + exp(uint32) + generation(uint32) + token_id(uint64)
+_BODY = struct.Struct(">16sIIQ")
+_SIGNATURE_BYTES = 16
+
+# 購読が切れたときの再接続間隔（指数バックオフ。上限は SESSION_REVOCATION_REFRESH_SECONDS）
+_LISTENER_RETRY_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: str  # ユーザーの public_id
+    exp_timestamp: int
+    generation: int
+    token_id: int
+
+
+def _secret() -> bytes:
+    if not settings.SESSION_SECRET_KEY:
+        raise RuntimeError("SESSION_SECRET_KEY must be set when SESSION_MODE=signed")
+    return settings.SESSION_SECRET_KEY.encode("utf-8")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(_secret(), body, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def encode_token(claims: TokenClaims) -> str:
+    body = _BODY.pack(
+        uuid.UUID(claims.user_id).bytes, claims.exp_timestamp, claims.generation, claims.token_id
+    )
+    return f"{_b64encode(body)}.{_b64encode(_sign(body))}"
+
+
+def decode_token(token: str) -> TokenClaims | None:
+    """署名と形式を検証してトークンの内容を返す（有効期限・失効は確認しない）"""
+    try:
+        encoded_body, encoded_signature = token.split(".")
+        body = _b64decode(encoded_body)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        return None
+    if len(body) != _BODY.size or not hmac.compare_digest(signature, _sign(body)):
+        return None
+    user_bytes, exp_timestamp, generation, token_id = _BODY.unpack(body)
+    return TokenClaims(str(uuid.UUID(bytes=user_bytes)), exp_timestamp, generation, token_id)
+
+
+# ==================================================
+# 失効リストのキャッシュ
+# ==================================================
+class RevocationCache:
+    """失効したトークン ID とユーザーごとの世代番号のプロセス内キャッシュ"""
+
+    def __init__(self) -> None:
+        self.revoked: frozenset[int] = frozenset()
+        self.generations: dict[str, int] = {}
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._listener: Any = None
+        self._retry: threading.Timer | None = None
+        self._retry_delay = _LISTENER_RETRY_SECONDS
+        self._stopped = True
+        # 読み直しの途中で反映した通知（読み直した内容で上書きして取りこぼさないよう重ねる）
+        self._applied_revoked: set[int] = set()
+
+    def refresh(self) -> None:
+        """Redis から失効リストを読み直す（期限切れの要素はこのとき削除する）"""
+        now = int(time.time())
+        with self._lock:
+            self._applied_revoked = set()
+        pipe = redis_manager.redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(REVOKED_KEY, "-inf", now)
+        pipe.zrange(REVOKED_KEY, 0, -1)
+        pipe.hgetall(GENERATIONS_KEY)
+        _, revoked, generations = pipe.execute()
+        with self._lock:
+            self.revoked = frozenset(int(token_id) for token_id in revoked) | self._applied_revoked
+            # 世代番号は減らないため、読み直した値と反映済みの値の大きい方を使う
+            self.generations = {
+                user_id: max(int(value), self.generations.get(user_id, 0))
+                for user_id, value in generations.items()
+            }
+            self.loaded_at = time.monotonic()
+
+    def apply_revoked(self, token_id: int) -> None:
+        """失効したトークン ID を 1 件キャッシュに追加する"""
+        with self._lock:
+            self.revoked = self.revoked | {token_id}
+            self._applied_revoked.add(token_id)
+
+    def apply_generation(self, user_id: str, generation: int) -> None:
+        """ユーザーの世代番号をキャッシュに反映する（古い通知で戻さない）"""
+        with self._lock:
+            if generation > self.generations.get(user_id, 0):
+                self.generations = {**self.generations, user_id: generation}
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        """失効の通知を 1 件反映する（形式が不明な通知は全体を読み直す）"""
+        kind, _, value = str(message["data"]).partition(":")
+        try:
+            if kind == "revoked":
+                self.apply_revoked(int(value))
+                return
+            if kind == "generation":
+                user_id, _, generation = value.rpartition(":")
+                if user_id:
+                    self.apply_generation(user_id, int(generation))
+                    return
+        except ValueError:
+            pass
+        logger.warning(f"Unknown session revocation event: {message['data']!r}")
+        self.refresh()
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > settings.SESSION_REVOCATION_REFRESH_SECONDS
+
+    def ensure_fresh(self) -> None:
+        if not self.is_stale():
+            return
+        try:
+            self.refresh()
+        except redis.RedisError as e:
+            # 読み込み済みなら Redis 障害中は古いキャッシュで検証を続ける（次の周期で再試行）
+            if not self.loaded_at:
+                raise
+            logger.warning(f"Session revocation refresh failed: {type(e).__name__}")
+            self.loaded_at = time.monotonic()
+
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        self.ensure_fresh()
+        return claims.token_id in self.revoked or claims.generation < self.generations.get(
+            claims.user_id, 0
+        )
+
+    def start(self) -> None:
+        """Pub/Sub の購読を開始する（通知を受けたらキャッシュを読み直す）"""
+        if self._listener is not None:
+            return
+        _secret()  # 署名鍵の未設定は起動時に検出する
+        self._stopped = False
+        self._subscribe()
+
+    def _subscribe(self) -> None:
+        self.refresh()
+        pubsub = redis_manager.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{EVENTS_CHANNEL: self._on_message})
+        self._listener = pubsub.run_in_thread(
+            sleep_time=1, daemon=True, exception_handler=self._on_listener_error
+        )
+        self._retry_delay = _LISTENER_RETRY_SECONDS
+
+    def _on_listener_error(self, error: BaseException, pubsub: Any, thread: Any) -> None:
+        # 購読が切れている間もキャッシュは定期的に読み直される。バックオフしながら再接続する
+        logger.warning(f"Session revocation listener stopped: {type(error).__name__}")
+        thread.stop()
+        self._listener = None
+        self._schedule_resubscribe()
+
+    def _schedule_resubscribe(self) -> None:
+        if self._stopped:
+            return
+        self._retry = threading.Timer(self._retry_delay, self._resubscribe)
+        self._retry.daemon = True
+        self._retry.start()
+        self._retry_delay = min(
+            self._retry_delay * 2, float(settings.SESSION_REVOCATION_REFRESH_SECONDS)
+        )
+
+    def _resubscribe(self) -> None:
+        if self._stopped or self._listener is not None:
+            return
+        try:
+            self._subscribe()
+            logger.info("Session revocation listener restarted")
+        except redis.RedisError as e:
+            logger.warning(f"Session revocation listener restart failed: {type(e).__name__}")
+            self._schedule_resubscribe()
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+revocation_cache = RevocationCache()
+
+
+# ==================================================
+# 発行・検証・失効
+# ==================================================
+def issue_token(user_id: str, ttl_seconds: int) -> str:
+    """
+    トークンを発行する（ログイン時）
+
+    世代番号はユーザーの現在の世代を使う（全セッションの失効後に発行したトークンのみ有効）。
+    """
+    generation = int(redis_manager.redis_client.hget(GENERATIONS_KEY, user_id) or 0)
+    claims = TokenClaims(
+        user_id=user_id,
+        exp_timestamp=int(time.time()) + ttl_seconds,
+        generation=generation,
+        token_id=secrets.randbits(64),
+    )
+    return encode_token(claims)
+
+
+def reissue_token(claims: TokenClaims, ttl_seconds: int) -> str:
+    """
+    有効期限を延長したトークンを発行する
+
+    世代番号・トークン ID は引き継ぐ（延長前のトークンも同じセッションとして 1 件の失効で無効になる）。
+    """
+    return encode_token(
+        TokenClaims(
+            user_id=claims.user_id,
+            exp_timestamp=int(time.time()) + ttl_seconds,
+            generation=claims.generation,
+            token_id=claims.token_id,
+        )
+    )
+
+
+def verify_token(token: str) -> TokenClaims | None:
+    """署名・有効期限・失効を確認する（失効リストはプロセス内キャッシュを参照する）"""
+    claims = decode_token(token)
+    if claims is None or claims.exp_timestamp <= time.time():
+        return None
+    if revocation_cache.is_revoked(claims):
+        return None
+    return claims
+
+
+async def verify_token_async(token: str) -> TokenClaims | None:
+    """
+    verify_token の asyncio 版
+
+    失効リストの読み直し（Redis へのアクセス）が必要なときだけスレッドで行い、
+    イベントループをブロックしない（通常は署名の検証のみでプロセス内で完結する）。
+    """
+    if revocation_cache.is_stale():
+        await asyncio.to_thread(revocation_cache.ensure_fresh)
+    return verify_token(token)
+
+
+def revoke_token(token: str, ttl_seconds: int) -> bool:
+    """
+    トークンを失効させる（ログアウト時）
+
+    延長で発行された同じトークン ID のトークンはいずれも現在時刻 + ttl_seconds までに期限が切れるため、
+    失効リストにはその時刻まで残す（既に遅い時刻で登録されていれば短くしない）。
+    """
+    claims = decode_token(token)
+    if claims is None or claims.exp_timestamp <= time.time():
+        return False
+    latest_exp = max(claims.exp_timestamp, int(time.time()) + ttl_seconds)
+    pipe = redis_manager.redis_client.pipeline(transaction=True)
+    pipe.zadd(REVOKED_KEY, {str(claims.token_id): latest_exp}, gt=True)
+    pipe.publish(EVENTS_CHANNEL, f"revoked:{claims.token_id}")
+    pipe.execute()
+    revocation_cache.apply_revoked(claims.token_id)
+    return True
+
+
+def revoke_all_tokens(user_id: str) -> None:
+    """
+    ユーザーの発行済みトークンをすべて失効させる（世代番号を進める）
+
+    通知には進めた後の世代番号を含めるため、HINCRBY の結果を受け取ってから PUBLISH する
+    （通知が届かなかったプロセスも、SESSION_REVOCATION_REFRESH_SECONDS 以内の読み直しで反映される）。
+    """
+    generation = int(redis_manager.redis_client.hincrby(GENERATIONS_KEY, user_id, 1))
+    redis_manager.redis_client.publish(EVENTS_CHANNEL, f"generation:{user_id}:{generation}")
+    revocation_cache.apply_generation(user_id, generation)
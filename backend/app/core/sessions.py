@@ -0,0 +1,132 @@
+"""
+セッションの作成・参照・削除
+
+有効期限はスライディング方式。残り時間が SESSION_REFRESH_THRESHOLD_SECONDS を下回った
+セッションは、参照時に SESSION_TIMEOUT_HOURS まで延長する（Cookie はミドルウェアで
+apply_refreshed_session_cookie により更新する）。
+
+SESSION_MODE に応じて実装を切り替える。
+- redis:  ランダムなセッション ID を Cookie に入れ、セッションの内容はセッションストアに保存する
+          （SESSION_STORE で Redis / プロセス内を選ぶ。app.core.session_store）
+- signed: ユーザー ID・有効期限を含む署名付きトークンを Cookie に入れ、検証はプロセス内で行う
+          （Redis は失効リストの管理にのみ使う。app.core.session_tokens）
+"""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from fastapi import Request, Response
+
+from app.core import session_tokens
+from app.core.config import settings
+from app.core.session_store import get_async_session_store, get_session_store
+
+
+def session_ttl_seconds() -> int:
+    return settings.SESSION_TIMEOUT_HOURS * 3600
+
+
+def create_session(user_id: str) -> str:
+    """
+    セッションを作成して Cookie に設定する値を返す
+
+    Args:
+        user_id: ユーザーの public_id
+    """
+    if settings.SESSION_MODE == "signed":
+        return session_tokens.issue_token(user_id, session_ttl_seconds())
+    return get_session_store().create_session(
+        user_id=user_id, ttl_hours=settings.SESSION_TIMEOUT_HOURS
+    )
+
+
+async def touch_session(session_id: str) -> tuple[str | None, str | None]:
+    """
+    セッションを検証し、残り時間が少なければ有効期限を延長する
+
+    認証のたびに呼ばれるため、イベントループをブロックしない asyncio 版のストアを使う。
+
+    Returns:
+        (ユーザーの public_id, 延長した場合に Cookie に設定し直す値)。
+        無効・期限切れならユーザーの public_id は None
+    """
+    ttl_seconds = session_ttl_seconds()
+    threshold = settings.SESSION_REFRESH_THRESHOLD_SECONDS
+
+    if settings.SESSION_MODE == "signed":
+        claims = await session_tokens.verify_token_async(session_id)
+        if claims is None:
+            return None, None
+        if claims.exp_timestamp - time.time() < threshold:
+            return claims.user_id, session_tokens.reissue_token(claims, ttl_seconds)
+        return claims.user_id, None
+
+    # 取得と延長を 1 往復で行う（延長が不要なら書き込みは発生しない）
+    session_data, refreshed = await get_async_session_store().touch_session(
+        session_id, ttl_seconds, threshold
+    )
+    if not session_data:
+        return None, None
+    return session_data.get("user_id"), session_id if refreshed else None
+
+
+def delete_session(session_id: str) -> bool:
+    """セッションを削除する（signed モードではトークンを失効させる）"""
+    if settings.SESSION_MODE == "signed":
+        return session_tokens.revoke_token(session_id, session_ttl_seconds())
+    return get_session_store().delete_session(session_id)
+
+
+def session_handle(session_id: str) -> str:
+    """一覧に表示するセッションの識別子（Cookie の値そのものは返さない）"""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+
+
+def list_sessions(user_id: str) -> list[tuple[str, datetime]]:
+    """
+    ユーザーの有効なセッションを (識別子, 有効期限) で返す
+
+    signed モードはセッションごとの記録を持たないため空を返す。
+    """
+    if settings.SESSION_MODE == "signed":
+        return []
+    return [
+        (session_handle(session_id), datetime.fromtimestamp(exp_timestamp, timezone.utc))
+        for session_id, exp_timestamp in get_session_store().list_user_sessions(user_id)
+    ]
+
+
+def revoke_all_sessions(user_id: str) -> None:
+    """ユーザーのセッションをすべて失効させる（パスワード変更・全端末からのログアウト）"""
+    if settings.SESSION_MODE == "signed":
+        session_tokens.revoke_all_tokens(user_id)
+    else:
+        get_session_store().delete_user_sessions(user_id)
+
+
+def set_session_cookie(response: Response, session_id: str) -> None:
+    """セッション Cookie を設定する"""
+    response.set_cookie(
+        key="session_id",
+        value=session_id,
+        httponly=True,  # JavaScript からアクセス不可
+        secure=settings.SECURE_COOKIE,  # HTTPS のみ（本番環境）
+        samesite="lax",  # CSRF 対策
+        max_age=session_ttl_seconds(),  # SESSION_TIMEOUT_HOURS
+        path="/",
+    )
+
+
+def apply_refreshed_session_cookie(request: Request, response: Response) -> None:
+    """
+    get_current_user で延長したセッションの Cookie をレスポンスに設定する
+
+    レスポンスが既に session_id の Cookie を設定・削除している場合（ログアウトなど）は変更しない。
+    """
+    refreshed_session_id = getattr(request.state, "refreshed_session_id", None)
+    if not refreshed_session_id:
+        return
+    if any(cookie.startswith("session_id=") for cookie in response.headers.getlist("set-cookie")):
+        return
+    set_session_cookie(response, refreshed_session_id)
@@ -0,0 +1,140 @@
+"""
+記事本文の透過的な圧縮（articles.content / content_compressed）
+
+ARTICLE_COMPRESSION_ENABLED が有効な場合、ARTICLE_COMPRESSION_THRESHOLD バイトを超える本文は
+content（Text）ではなく content_compressed（bytea）に zlib 圧縮して保存する。
+
+- ユーザーごとに学習したプリセット辞書（compression_dictionaries）があれば zdict として使用する
+  （短めの Markdown でも定型的な見出し・front-matter などが辞書に載るため圧縮率が上がる）
+- どの辞書で圧縮したかは compression_dict_id に記録し、辞書は追記のみ（更新しない）
+- 展開は Article.content へのアクセス時に遅延して行う
+
+辞書は ID 単位で不変のため、プロセス内に無期限でキャッシュする。
+ユーザーごとの「最新の辞書」のみ一定時間でキャッシュを破棄する。
+"""
+
+import time
+import zlib
+from typing import Any
+
+from sqlalchemy import Connection, select
+
+from app.core.config import settings
+from app.db.models.compression_dictionary import CompressionDictionary
+
+# zlib のプリセット辞書は先頭 32KB までしか使われない
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+# ユーザーの最新辞書のキャッシュ保持期間
+ACTIVE_DICTIONARY_TTL_SECONDS = 300
+
+_dictionaries: dict[int, bytes] = {}
+_active_dictionaries: dict[int, tuple[float, int | None]] = {}
+
+
+# ==================================================
+# 圧縮 / 展開（DB 非依存）
+# ==================================================
+def compress_content(content: str, zdict: bytes | None = None) -> bytes:
+    encoded = content.encode("utf-8")
+    if zdict:
+        compressor = zlib.compressobj(settings.ARTICLE_COMPRESSION_LEVEL, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(settings.ARTICLE_COMPRESSION_LEVEL)
+    return compressor.compress(encoded) + compressor.flush()
+
+
+def decompress_content(data: bytes, zdict: bytes | None = None) -> str:
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+
+def should_compress(content: str) -> bool:
+    """圧縮対象の本文かどうか（有効化されており、閾値を超える）"""
+    # 1 文字は UTF-8 で最大 4 バイトのため、明らかに小さい本文はエンコードせずに判定する
+    return (
+        settings.ARTICLE_COMPRESSION_ENABLED
+        and len(content) * 4 > settings.ARTICLE_COMPRESSION_THRESHOLD
+        and len(content.encode("utf-8")) > settings.ARTICLE_COMPRESSION_THRESHOLD
+    )
+
+
+# ==================================================
+# 辞書の取得
+# ==================================================
+def load_dictionary(connection: Connection, dict_id: int) -> bytes:
+    """辞書 ID から辞書本体を取得する（プロセス内キャッシュ付き）"""
+    data = _dictionaries.get(dict_id)
+    if data is None:
+        data = connection.scalar(
+            select(CompressionDictionary.data).where(CompressionDictionary.id == dict_id)
+        )
+        if data is None:
+            raise LookupError(f"Compression dictionary {dict_id} not found")
+        _dictionaries[dict_id] = data
+    return data
+
+
+def active_dictionary(connection: Connection, user_id: int) -> tuple[int | None, bytes | None]:
+    """
+    ユーザーの最新の辞書を取得する
+
+    Returns:
+        (dict_id, data) のタプル。辞書が未学習なら (None, None)
+    """
+    cached = _active_dictionaries.get(user_id)
+    if cached is None or time.monotonic() - cached[0] > ACTIVE_DICTIONARY_TTL_SECONDS:
+        dict_id = connection.scalar(
+            select(CompressionDictionary.id)
+            .where(CompressionDictionary.user_id == user_id, CompressionDictionary.is_valid)
+            .order_by(CompressionDictionary.id.desc())
+            .limit(1)
+        )
+        cached = (time.monotonic(), dict_id)
+        _active_dictionaries[user_id] = cached
+
+    dict_id = cached[1]
+    if dict_id is None:
+        return None, None
+    return dict_id, load_dictionary(connection, dict_id)
+
+
+def forget_active_dictionary(user_id: int) -> None:
+    """辞書の再学習後にユーザーの最新辞書のキャッシュを破棄する"""
+    _active_dictionaries.pop(user_id, None)
+
+
+# ==================================================
+# カラム値との相互変換
+# ==================================================
+def encode_content(connection: Connection, user_id: int, content: str) -> dict[str, Any]:
+    """
+    本文を articles の保存用カラム値に変換する
+
+    Returns:
+        content_text / content_compressed / compression_dict_id をキーとする dict
+    """
+    if not should_compress(content):
+        return {"content_text": content, "content_compressed": None, "compression_dict_id": None}
+
+    dict_id, zdict = active_dictionary(connection, user_id)
+    return {
+        "content_text": None,
+        "content_compressed": compress_content(content, zdict),
+        "compression_dict_id": dict_id,
+    }
+
+
+def decode_content(
+    connection: Connection,
+    content_text: str | None,
+    content_compressed: bytes | None,
+    compression_dict_id: int | None,
+) -> str:
+    """articles の保存用カラム値から本文を復元する"""
+    if content_text is not None:
+        return content_text
+    if content_compressed is None:
+        return ""
+    zdict = load_dictionary(connection, compression_dict_id) if compression_dict_id else None
+    return decompress_content(content_compressed, zdict)
@@ -1,13 +1,23 @@
 from app.db.models.article import Article
+from app.db.models.article_draft import ArticleDraft
 from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.article_version import ArticleVersion
+from app.db.models.compression_dictionary import CompressionDictionary
 from app.db.models.folder import Folder
+from app.db.models.outbox_event import OutboxEvent
 from app.db.models.tag import Tag
+from app.db.models.tag_stat import TagStat
 from app.db.models.user import User
 
 __all__ = [
     "Article",
+    "ArticleDraft",
     "ArticleTagLink",
+    "ArticleVersion",
+    "CompressionDictionary",
     "Folder",
+    "OutboxEvent",
     "Tag",
+    "TagStat",
     "User",
 ]
@@ -1,13 +1,41 @@
-from sqlalchemy import ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Any
 
+from sqlalchemy import (
+    CheckConstraint,
+    Connection,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, object_session
+
+# 関数は呼び出し時に参照する（content_compression → models パッケージ → article の循環 import のため）
+from app.db import content_compression
 from app.db.base import AuditUserMixin, Base, IdMixin, PublicIdMixin, TimestampMixin, ValidityMixin
 
 
 class Article(Base, IdMixin, PublicIdMixin, ValidityMixin, AuditUserMixin, TimestampMixin):
-    """記事テーブル"""
+    """
+    記事テーブル
+
+    本文は通常 content（Text）に保存し、圧縮が有効な場合は大きな本文のみ
+    content_compressed（bytea）に保存する。アプリケーションからは content プロパティで
+    どちらも透過的に読み書きできる（詳細は app.db.content_compression）。
+    """
 
     __tablename__ = "articles"
+    __table_args__ = (
+        CheckConstraint(
+            "content IS NOT NULL OR content_compressed IS NOT NULL",
+            name="ck_articles_content_present",
+        ),
+        Index("ix_articles_user_id_folder_id", "user_id", "folder_id"),
+        Index("ix_articles_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     user_id: Mapped[int] = mapped_column(
         Integer,
@@ -26,7 +54,65 @@ class Article(Base, IdMixin, PublicIdMixin, ValidityMixin, AuditUserMixin, Times
         nullable=False,
     )
 
-    content: Mapped[str] = mapped_column(
+    # 非圧縮の本文（圧縮して保存した場合は NULL）
+    content_text: Mapped[str | None] = mapped_column(
+        "content",
         Text,
-        nullable=False,
+        nullable=True,
     )
+
+    # 圧縮済みの本文（本文にアクセスするまで読み込まない）
+    content_compressed: Mapped[bytes | None] = mapped_column(
+        LargeBinary,
+        nullable=True,
+        deferred=True,
+    )
+
+    compression_dict_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("compression_dictionaries.id"),
+        nullable=True,
+    )
+
+    @property
+    def content(self) -> str:
+        """記事本文（圧縮されていれば初回アクセス時に展開する）"""
+        if self.content_text is not None:
+            return self.content_text
+
+        compressed = self.content_compressed
+        cached = self.__dict__.get("_decoded_content")
+        if cached is not None and cached[0] == compressed:
+            return cached[1]
+
+        session = object_session(self)
+        if session is None:
+            raise RuntimeError("Compressed article content requires a bound session")
+        content = content_compression.decode_content(
+            session.connection(), None, compressed, self.compression_dict_id
+        )
+        self.__dict__["_decoded_content"] = (compressed, content)
+        return content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.content_text = value
+        self.content_compressed = None
+        self.compression_dict_id = None
+        self.__dict__.pop("_decoded_content", None)
+
+
+@event.listens_for(Article, "before_insert")
+@event.listens_for(Article, "before_update")
+def _compress_content(mapper: Mapper[Any], connection: Connection, target: Article) -> None:
+    """大きな本文は保存時に圧縮カラムへ移す"""
+    content = target.content_text
+    if content is None or not content_compression.should_compress(content):
+        return
+
+    values = content_compression.encode_content(connection, target.user_id, content)
+    target.content_text = None
+    target.content_compressed = values["content_compressed"]
+    target.compression_dict_id = values["compression_dict_id"]
+    # 直後のレスポンス生成で再展開しないよう、元の本文を保持しておく
+    target.__dict__["_decoded_content"] = (values["content_compressed"], content)
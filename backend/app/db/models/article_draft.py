@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import AuditUserMixin, Base, IdMixin, TimestampMixin, ValidityMixin
+
+
+class ArticleDraft(Base, IdMixin, ValidityMixin, AuditUserMixin, TimestampMixin):
+    """記事下書きテーブル（記事ごとに最新の下書き 1 件を保持）"""
+
+    __tablename__ = "article_drafts"
+
+    article_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("articles.id"),
+        unique=True,
+        nullable=False,
+    )
+
+    title: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    content: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    # 下書きが Redis に書き込まれた日時（古い下書きによる上書きを防ぐ）
+    saved_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, ForeignKey, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import AuditUserMixin, Base, IdMixin, TimestampMixin, ValidityMixin
+
+
+class ArticleVersion(Base, IdMixin, ValidityMixin, AuditUserMixin, TimestampMixin):
+    """
+    記事バージョン履歴テーブル
+
+    本文は一定間隔ごとのスナップショットと、その間の前方差分（直前バージョンからの差分）で保持する。
+    data はいずれも zlib 圧縮済みのバイト列。
+    """
+
+    __tablename__ = "article_versions"
+    __table_args__ = (
+        UniqueConstraint(
+            "article_id", "version_number", name="uq_article_versions_article_id_version_number"
+        ),
+    )
+
+    article_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("articles.id"),
+        nullable=False,
+    )
+
+    version_number: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    title: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    # True: data は本文全体、False: data は直前バージョンからの差分
+    is_snapshot: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+    )
+
+    data: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+    )
+
+    # 復元後の本文の文字数（一覧表示用）
+    content_length: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
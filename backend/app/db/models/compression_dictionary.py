@@ -0,0 +1,22 @@
+from sqlalchemy import ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import AuditUserMixin, Base, IdMixin, TimestampMixin, ValidityMixin
+
+
+class CompressionDictionary(Base, IdMixin, ValidityMixin, AuditUserMixin, TimestampMixin):
+    """記事本文の圧縮用プリセット辞書テーブル（ユーザーごと、最新の 1 件を使用）"""
+
+    __tablename__ = "compression_dictionaries"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False,
+    )
+
+    # zlib のプリセット辞書（最大 32KB）
+    data: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+    )
@@ -1,13 +1,28 @@
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import AuditUserMixin, Base, IdMixin, PublicIdMixin, TimestampMixin, ValidityMixin
 
 
 class Folder(Base, IdMixin, PublicIdMixin, ValidityMixin, AuditUserMixin, TimestampMixin):
-    """フォルダテーブル"""
+    """
+    フォルダテーブル
+
+    parent_id（隣接リスト）に加え、ルートから自身までの ID を連結した
+    マテリアライズドパス（例: "/3/17/42/"）を保持する。
+    サブツリーの取得・移動・削除は path の前方一致で 1 クエリで行う（app.services.folders）。
+    """
 
     __tablename__ = "folders"
+    __table_args__ = (
+        # 前方一致（LIKE 'prefix%'）でインデックスを使うため text_pattern_ops を指定する
+        Index(
+            "ix_folders_user_id_path",
+            "user_id",
+            "path",
+            postgresql_ops={"path": "text_pattern_ops"},
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(
         Integer,
@@ -25,3 +40,8 @@ class Folder(Base, IdMixin, PublicIdMixin, ValidityMixin, AuditUserMixin, Timest
         ForeignKey("folders.id"),
         nullable=True,
     )
+
+    path: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin
+
+
+class TagStat(Base, TimestampMixin):
+    """
+    タグ利用件数の集計テーブル（非正規化）
+
+    タグごとの有効な記事数を保持する。article_tag_links / articles の書き込みと
+    同じトランザクションで増減させ、ダッシュボードでは集計クエリを使わずにこの表を読む。
+    ずれた場合は app.services.tag_stats の再集計ジョブで作り直す。
+    """
+
+    __tablename__ = "tag_stats"
+
+    tag_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tags.id"),
+        primary_key=True,
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False,
+        index=True,
+    )
+
+    article_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
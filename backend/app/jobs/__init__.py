@@ -0,0 +1,9 @@
+"""
+バックグラウンドジョブ
+
+ジョブの登録は app.jobs.queue.enqueue、実行は app.worker で行う。
+"""
+
+from app.jobs.queue import enqueue, job
+
+__all__ = ["enqueue", "job"]
@@ -0,0 +1,195 @@
+"""
+Redis Streams によるジョブキュー
+
+Redis のキー構成:
+- jobs:stream:{queue} → ジョブのストリーム（コンシューマーグループ "workers" で分散処理）
+- jobs:delayed        → 遅延実行・リトライ待ちのジョブ（ZSet、score は実行予定の UNIX 時刻）
+- jobs:dead           → リトライ上限に達したジョブ（デッドレター、Stream）
+- jobs:metrics:{name} → ジョブ種別ごとの実行件数・処理時間（Hash）
+
+配信の流れ:
+1. enqueue: XADD（遅延指定時は jobs:delayed に ZADD し、実行予定を過ぎたらワーカーがストリームに移す）
+2. ワーカーが XREADGROUP で取得 → 実行 → 成功したら XACK + XDEL
+3. 失敗したら XACK + XDEL したうえで、バックオフ後に再実行するよう jobs:delayed に登録する
+   （attempt がリトライ上限を超えたら jobs:dead に移す）
+4. ワーカーが落ちて ACK されないまま visibility timeout を過ぎたジョブは、
+   別のワーカーが XAUTOCLAIM で引き取り、失敗として 3 と同様に扱う
+
+ジョブの実装は @job デコレーターで登録する（app.jobs.tasks）。
+"""
+
+import json
+import random
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_manager import redis_manager
+
+STREAM_PREFIX = "jobs:stream:"
+DELAYED_KEY = "jobs:delayed"
+DEAD_LETTER_STREAM = "jobs:dead"
+METRICS_PREFIX = "jobs:metrics:"
+CONSUMER_GROUP = "workers"
+DEFAULT_QUEUE = "default"
+
+# デッドレターの保持件数（古いものから削除）
+DEAD_LETTER_MAX_LENGTH = 10_000
+
+# 遅延ジョブ 1 件をストリームに移す（ZREM で取り除けた場合のみ XADD する。
+# 複数のワーカーが同じジョブを同時に移しても、ストリームに入るのは 1 回だけ）
+# KEYS[1]: jobs:delayed、KEYS[2]: 移動先のストリーム（member 内の queue から呼び出し側で組み立てる）
+# ARGV[1]: jobs:delayed の member
+PROMOTE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+local job = cjson.decode(ARGV[1])
+local fields = {}
+for key, value in pairs(job.fields) do
+    table.insert(fields, key)
+    table.insert(fields, value)
+end
+redis.call('XADD', KEYS[2], '*', unpack(fields))
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """ジョブ種別の定義"""
+
+    name: str
+    func: Callable[..., Any]
+    queue: str = DEFAULT_QUEUE
+    max_retries: int | None = None  # None なら JOB_MAX_RETRIES
+    timeout_seconds: float | None = None  # None なら無制限（visibility timeout より短くすること）
+    cpu_bound: bool = False  # True ならプロセスプールで実行する
+
+    @property
+    def retries(self) -> int:
+        return settings.JOB_MAX_RETRIES if self.max_retries is None else self.max_retries
+
+
+_registry: dict[str, JobSpec] = {}
+
+
+def job(
+    name: str,
+    *,
+    queue: str = DEFAULT_QUEUE,
+    max_retries: int | None = None,
+    timeout_seconds: float | None = None,
+    cpu_bound: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    関数をジョブとして登録するデコレーター
+
+    ジョブ関数はキーワード引数で payload を受け取る（payload は JSON 化できること）。
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _registry[name] = JobSpec(name, func, queue, max_retries, timeout_seconds, cpu_bound)
+        return func
+
+    return decorator
+
+
+def get_job(name: str) -> JobSpec | None:
+    return _registry.get(name)
+
+
+def registered_queues() -> set[str]:
+    return {spec.queue for spec in _registry.values()} or {DEFAULT_QUEUE}
+
+
+def stream_key(queue: str) -> str:
+    return STREAM_PREFIX + queue
+
+
+def build_fields(name: str, payload: dict[str, Any], attempt: int = 0) -> dict[str, str]:
+    """ストリームに格納するフィールドを組み立てる"""
+    return {
+        "job_id": uuid.uuid4().hex,
+        "name": name,
+        "payload": json.dumps(payload, ensure_ascii=False),
+        "attempt": str(attempt),
+        "enqueued_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def delayed_queue(member: str) -> str:
+    """jobs:delayed の member からキュー名を取り出す"""
+    return str(json.loads(member)["queue"])
+
+
+def schedule(client: "redis.Redis", queue: str, fields: dict[str, str], run_at: float) -> None:
+    """ジョブを指定時刻に実行されるよう jobs:delayed に登録する"""
+    member = json.dumps({"queue": queue, "fields": fields}, ensure_ascii=False)
+    client.zadd(DELAYED_KEY, {member: run_at})
+
+
+def enqueue(
+    name: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    queue: str = DEFAULT_QUEUE,
+    delay_seconds: float = 0,
+) -> str:
+    """
+    ジョブを登録する
+
+    Args:
+        name: ジョブ名（@job で登録した名前）
+        payload: ジョブ関数に渡すキーワード引数
+        queue: キュー名
+        delay_seconds: 実行を遅らせる秒数
+
+    Returns:
+        ジョブ ID
+    """
+    fields = build_fields(name, payload or {})
+    client = redis_manager.redis_client
+    if delay_seconds > 0:
+        schedule(client, queue, fields, time.time() + delay_seconds)
+    else:
+        client.xadd(stream_key(queue), fields)  # type: ignore[arg-type]
+    return fields["job_id"]
+
+
+def backoff_seconds(attempt: int) -> float:
+    """attempt 回目の失敗後の待ち時間（指数バックオフ + ジッター）"""
+    delay = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** max(attempt - 1, 0))
+    delay = min(delay, settings.JOB_RETRY_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+# ==================================================
+# メトリクス
+# ==================================================
+def get_metrics() -> dict[str, dict[str, float]]:
+    """ジョブ種別ごとのメトリクスを取得する"""
+    client = redis_manager.redis_client
+    keys = sorted(client.scan_iter(match=METRICS_PREFIX + "*"))
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.hgetall(key)
+
+    metrics: dict[str, dict[str, float]] = {}
+    for key, data in zip(keys, pipe.execute()):
+        values = {field: float(value) for field, value in data.items()}
+        runs = values.get("succeeded", 0) + values.get("failed", 0)
+        if runs:
+            values["avg_ms"] = values.get("total_ms", 0) / runs
+        metrics[key[len(METRICS_PREFIX) :]] = values
+    return metrics
+
+
+def dead_letter_count() -> int:
+    return int(redis_manager.redis_client.xlen(DEAD_LETTER_STREAM))
@@ -0,0 +1,62 @@
+"""
+ジョブの実装
+
+ワーカー（app.worker）が起動時に読み込み、@job で登録されたジョブを実行する。
+ジョブ関数の引数は enqueue 時の payload（JSON）から渡されるため、Path などは文字列で受け取る。
+"""
+
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.db.models.article import Article
+from app.db.session import SessionLocal
+from app.jobs.queue import job
+from app.services.markdown_import import run_import_job
+from app.services.markdown_render import prerender
+from app.services.tag_index import build_tag_index
+from app.services.tag_stats import rebuild_tag_stats
+
+
+@job("markdown.import", max_retries=0, timeout_seconds=600)
+def import_markdown_job(job_id: str, user_id: int, source: str) -> None:
+    """
+    Markdown インポート
+
+    途中まで取り込んだ状態で再実行すると重複判定に頼ることになるため、リトライしない
+    （失敗はインポートジョブのステータスに記録される）。
+    """
+    run_import_job(job_id, user_id, Path(source))
+
+
+@job("markdown.prerender", timeout_seconds=60, cpu_bound=True)
+def prerender_articles_job(article_ids: list[int]) -> None:
+    """記事本文をレンダリングしてキャッシュに載せる"""
+    db = SessionLocal()
+    try:
+        articles = db.scalars(
+            select(Article).where(Article.id.in_(article_ids), Article.is_valid)
+        ).all()
+        prerender(article.content for article in articles)
+    finally:
+        db.close()
+
+
+@job("tags.rebuild_index", timeout_seconds=120)
+def rebuild_tag_index_job(user_id: int) -> None:
+    """ユーザーのタグインデックスを再構築する"""
+    db = SessionLocal()
+    try:
+        build_tag_index(db, user_id)
+    finally:
+        db.close()
+
+
+@job("tags.rebuild_stats", timeout_seconds=600)
+def rebuild_tag_stats_job(user_id: int | None = None) -> None:
+    """タグ利用件数を再集計する"""
+    db = SessionLocal()
+    try:
+        rebuild_tag_stats(db, user_id)
+    finally:
+        db.close()
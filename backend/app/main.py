@@ -1,4 +1,8 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
@@ -9,10 +13,52 @@ from app.api.router import api_router
 from app.core.config import settings
 from app.core.exceptions import AppException
 from app.core.logging import setup_logging
+from app.core.openapi_cache import load_schema, save_schema, source_fingerprint
+from app.core.redis_manager import redis_manager
+from app.core.security import calibrate_shared_bcrypt_rounds
+from app.core.session_store import get_async_session_store
+from app.core.session_tokens import revocation_cache
+from app.core.sessions import apply_refreshed_session_cookie
+from app.services.drafts import draft_flush_loop, flush_pending_drafts
 
 logger = logging.getLogger("app")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # --- Redis の疎通確認（応答するまでリクエストを受け付けない） ---
+    await asyncio.to_thread(redis_manager.wait_until_ready, settings.REDIS_STARTUP_TIMEOUT_SECONDS)
+
+    # --- bcrypt のコストを検証時間の目標に合わせる（デプロイごとに 1 回調整して共有） ---
+    if settings.BCRYPT_TARGET_VERIFY_MS:
+        rounds = await asyncio.to_thread(
+            calibrate_shared_bcrypt_rounds, settings.BCRYPT_TARGET_VERIFY_MS
+        )
+        logger.info(
+            f"bcrypt rounds calibrated: {rounds} (target {settings.BCRYPT_TARGET_VERIFY_MS}ms)"
+        )
+
+    # --- 署名付きセッションの失効リスト（Pub/Sub で更新） ---
+    if settings.SESSION_MODE == "signed":
+        await asyncio.to_thread(revocation_cache.start)
+
+    # --- 下書きの定期フラッシュ ---
+    draft_flusher = asyncio.create_task(draft_flush_loop(settings.DRAFT_FLUSH_INTERVAL_SECONDS))
+
+    yield
+
+    draft_flusher.cancel()
+    # 停止時に未フラッシュの下書きを書き出す
+    try:
+        await asyncio.to_thread(flush_pending_drafts)
+    except Exception:
+        logger.exception("Draft flush on shutdown failed")
+
+    revocation_cache.stop()
+    await get_async_session_store().close()
+    redis_manager.close()
+
+
 def create_app() -> FastAPI:
     setup_logging()
 
@@ -20,6 +66,7 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         version=settings.app_version,
         debug=settings.debug,
+        lifespan=lifespan,
         openapi_url=f"{settings.api_prefix}/openapi.json",
         docs_url=f"{settings.api_prefix}/docs",
         redoc_url=f"{settings.api_prefix}/redoc",
@@ -32,8 +79,16 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],  # 記事更新時の If-Match に使う
     )
 
+    # --- 延長したセッションの Cookie（StreamingResponse・204 などエンドポイント独自のレスポンスにも設定） ---
+    @app.middleware("http")
+    async def refresh_session_cookie(request: Request, call_next):
+        response = await call_next(request)
+        apply_refreshed_session_cookie(request, response)
+        return response
+
     @app.exception_handler(AppException)
     async def app_exception_handler(request: Request, exc: AppException):
         show_trace = settings.debug or exc.status_code >= 500
@@ -52,6 +107,7 @@ def create_app() -> FastAPI:
                     "details": exc.details,
                 }
             },
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
@@ -74,12 +130,21 @@ def create_app() -> FastAPI:
     app.include_router(api_router, prefix=settings.api_prefix)
 
     # --- OpenAPI カスタマイズ: 422を削除して400に統一 ---
+    # 生成は初回アクセス時まで遅延し、結果は OPENAPI_CACHE_PATH にキャッシュする
     original_openapi = app.openapi
 
     def custom_openapi():
         if app.openapi_schema:
             return app.openapi_schema
 
+        cache_path = Path(settings.OPENAPI_CACHE_PATH) if settings.OPENAPI_CACHE_PATH else None
+        fingerprint = source_fingerprint(app) if cache_path else ""
+        if cache_path:
+            cached = load_schema(cache_path, fingerprint)
+            if cached is not None:
+                app.openapi_schema = cached
+                return app.openapi_schema
+
         openapi_schema = original_openapi()
 
         # すべてのレスポンスから422を削除
@@ -91,6 +156,9 @@ def create_app() -> FastAPI:
                         if "422" in operation["responses"]:
                             del operation["responses"]["422"]
 
+        if cache_path:
+            save_schema(cache_path, fingerprint, openapi_schema)
+
         app.openapi_schema = openapi_schema
         return app.openapi_schema
 
@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
 
 
 # ==================================================
@@ -51,6 +52,50 @@ class ArticleUpdate(BaseModel):
     )
 
 
+class ArticlePatch(BaseModel):
+    """記事の部分更新リクエスト（指定した項目のみ更新する）"""
+
+    title: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=255,
+        description="記事タイトル",
+    )
+
+    content: str | None = Field(
+        default=None,
+        min_length=1,
+        description="記事本文",
+    )
+
+    folder_id: int | None = Field(
+        default=None,
+        description="フォルダID（内部ID）。null を指定するとフォルダから外す",
+    )
+
+    @field_validator("title", "content")
+    @classmethod
+    def not_null(cls, v):
+        """title / content は省略のみ可能（null は指定できない）"""
+        if v is None:
+            raise ValueError("null は指定できません")
+        return v
+
+
+ContentHash = Annotated[str, StringConstraints(pattern=r"^[0-9a-f]{64}$")]
+
+
+class ArticleContentDelta(BaseModel):
+    """記事本文の差分更新リクエスト（バージョン履歴の差分と同じ形式の操作列）"""
+
+    base_hash: ContentHash = Field(description="差分の元になった本文の SHA-256（16進）")
+    ops: list[tuple[int, int] | str] = Field(
+        min_length=1,
+        description="[i, j]: 元の本文の i〜j-1 行目をコピー / 文字列: 挿入するテキスト",
+    )
+    result_hash: ContentHash = Field(description="差分を適用した後の本文の SHA-256（16進）")
+
+
 # ==================================================
 # レスポンス用Schema
 # ==================================================
@@ -67,6 +112,14 @@ class ArticleDetailResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ArticleContentDeltaResponse(BaseModel):
+    """記事本文の差分更新レスポンス（本文は返さない）"""
+
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    content_hash: str = Field(description="更新後の本文の SHA-256（次の差分の base_hash）")
+    updated_at: datetime = Field(description="更新日時")
+
+
 # ==================================================
 # リスト用Schema（軽量版）
 # ==================================================
@@ -79,3 +132,37 @@ class ArticleListItem(BaseModel):
     updated_at: datetime = Field(description="更新日時")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ==================================================
+# HTML レンダリング用Schema
+# ==================================================
+class ArticleHtmlResponse(BaseModel):
+    """記事の HTML レンダリング結果"""
+
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    content_hash: str = Field(description="本文の SHA-256（キャッシュキー）")
+    html: str = Field(description="サニタイズ済み HTML")
+
+
+# ==================================================
+# タグ付け用Schema
+# ==================================================
+TagName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+
+
+class ArticleTagsUpdate(BaseModel):
+    """記事のタグ一括設定リクエスト"""
+
+    tags: list[TagName] = Field(
+        ...,
+        max_length=100,
+        description="記事に付けるタグ名の一覧（この一覧で置き換える。空配列ですべて外す）",
+    )
+
+
+class ArticleTagsResponse(BaseModel):
+    """記事のタグ一覧"""
+
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    tags: list[str] = Field(description="タグ名（名前順）")
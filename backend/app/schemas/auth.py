@@ -2,6 +2,8 @@
 認証関連のリクエスト/レスポンス スキーマ
 """
 
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
@@ -46,3 +48,11 @@ class SessionResponse(BaseModel):
 
     session_id: str = Field(..., description="セッション ID")
     user: UserResponse = Field(..., description="ユーザー情報")
+
+
+class ActiveSessionResponse(BaseModel):
+    """有効なセッション（ログイン中の端末）"""
+
+    session_id: str = Field(..., description="セッションの識別子（Cookie の値とは異なる）")
+    expires_at: datetime = Field(..., description="有効期限")
+    current: bool = Field(..., description="このリクエストのセッションか")
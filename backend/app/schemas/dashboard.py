@@ -0,0 +1,34 @@
+"""
+ダッシュボードのレスポンス スキーマ
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TagUsage(BaseModel):
+    """タグの利用件数"""
+
+    public_id: UUID = Field(description="タグの外部公開ID")
+    name: str = Field(description="タグ名")
+    article_count: int = Field(description="タグが付いた記事数")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RecentArticle(BaseModel):
+    """最近更新された記事"""
+
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    title: str = Field(description="記事タイトル")
+    tags: list[str] = Field(description="タグ名")
+    updated_at: datetime = Field(description="更新日時")
+
+
+class DashboardResponse(BaseModel):
+    """ダッシュボード"""
+
+    recent_articles: list[RecentArticle] = Field(description="最近更新された記事（新しい順）")
+    tag_usage: list[TagUsage] = Field(description="タグの利用件数（多い順）")
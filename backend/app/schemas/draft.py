@@ -0,0 +1,31 @@
+"""
+下書き関連のリクエスト/レスポンス スキーマ
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class DraftSaveRequest(BaseModel):
+    """下書き保存リクエスト"""
+
+    title: str = Field(..., max_length=255, description="記事タイトル（下書き）")
+    content: str = Field(..., description="記事本文（下書き）")
+
+
+class DraftResponse(BaseModel):
+    """下書きレスポンス"""
+
+    article_public_id: UUID = Field(description="対象記事の外部公開ID")
+    title: str = Field(description="記事タイトル（下書き）")
+    content: str = Field(description="記事本文（下書き）")
+    saved_at: datetime = Field(description="下書きの保存日時")
+
+
+class DraftSavedResponse(BaseModel):
+    """下書き保存結果（本文は返さない）"""
+
+    article_public_id: UUID = Field(description="対象記事の外部公開ID")
+    saved_at: datetime = Field(description="下書きの保存日時")
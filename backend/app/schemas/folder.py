@@ -0,0 +1,65 @@
+"""
+フォルダ API のリクエスト / レスポンス スキーマ
+"""
+
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# ==================================================
+# リクエスト用Schema
+# ==================================================
+class FolderCreate(BaseModel):
+    """フォルダ作成リクエスト"""
+
+    name: str = Field(..., min_length=1, max_length=100, description="フォルダ名")
+    parent_public_id: UUID | None = Field(
+        default=None, description="親フォルダの外部公開ID（省略時はルート）"
+    )
+
+
+class FolderMove(BaseModel):
+    """フォルダ移動リクエスト"""
+
+    parent_public_id: UUID | None = Field(
+        default=None, description="移動先の親フォルダの外部公開ID（null でルートへ移動）"
+    )
+
+
+# ==================================================
+# レスポンス用Schema
+# ==================================================
+class FolderResponse(BaseModel):
+    """フォルダレスポンス"""
+
+    id: int = Field(description="フォルダID（内部ID、記事の folder_id に指定する）")
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    name: str = Field(description="フォルダ名")
+    parent_id: int | None = Field(description="親フォルダID")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FolderTreeArticle(BaseModel):
+    """ツリー内の記事"""
+
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    title: str = Field(description="記事タイトル")
+
+
+class FolderTreeNode(BaseModel):
+    """ツリー内のフォルダ（子フォルダ・記事を含む）"""
+
+    id: int = Field(description="フォルダID（内部ID）")
+    public_id: UUID = Field(description="外部公開ID（API/URL用）")
+    name: str = Field(description="フォルダ名")
+    folders: list["FolderTreeNode"] = Field(description="子フォルダ（名前順）")
+    articles: list[FolderTreeArticle] = Field(description="フォルダ直下の記事（タイトル順）")
+
+
+class FolderTreeResponse(BaseModel):
+    """フォルダ・記事のツリー全体"""
+
+    folders: list[FolderTreeNode] = Field(description="ルート直下のフォルダ（名前順）")
+    articles: list[FolderTreeArticle] = Field(description="フォルダに属さない記事（タイトル順）")
@@ -0,0 +1,21 @@
+"""
+インポート関連のレスポンス スキーマ
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ImportJobResponse(BaseModel):
+    """インポートジョブのステータス"""
+
+    job_id: str = Field(description="ジョブID")
+    status: Literal["pending", "running", "completed", "failed"] = Field(description="ジョブの状態")
+    total: int = Field(default=0, description="対象ファイル数")
+    processed: int = Field(default=0, description="処理済みファイル数")
+    imported: int = Field(default=0, description="登録した記事数")
+    duplicates: int = Field(default=0, description="重複のためスキップした件数")
+    failed: int = Field(default=0, description="パースに失敗した件数")
+    errors: list[str] = Field(default_factory=list, description="エラー内容（先頭20件）")
+    error: str | None = Field(default=None, description="ジョブ自体の失敗理由")
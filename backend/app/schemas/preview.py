@@ -0,0 +1,46 @@
+"""
+インクリメンタルプレビューのリクエスト/レスポンス スキーマ
+"""
+
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class TextEditRequest(BaseModel):
+    """ベース版に対するテキスト置換"""
+
+    start: int = Field(..., ge=0, description="置換開始位置（ベース版のコードポイント単位）")
+    end: int = Field(..., ge=0, description="置換終了位置（この位置は含まない）")
+    text: str = Field(default="", description="挿入するテキスト")
+
+
+class PreviewRequest(BaseModel):
+    """プレビューリクエスト"""
+
+    article_id: UUID | None = Field(
+        default=None, description="編集中の記事の public_id（新規作成中は省略）"
+    )
+    content: str | None = Field(default=None, description="本文全体（初回・再同期時）")
+    base_hash: str | None = Field(default=None, description="ベース版の content_hash")
+    edits: list[TextEditRequest] = Field(default_factory=list, description="ベース版への編集操作")
+    expected_hash: str | None = Field(
+        default=None, description="編集適用後の本文の SHA-256（指定時は検証する）"
+    )
+
+    @model_validator(mode="after")
+    def content_or_base(self) -> "PreviewRequest":
+        """content と base_hash のどちらか一方が必要"""
+        if (self.content is None) == (self.base_hash is None):
+            raise ValueError("content または base_hash のいずれか一方を指定してください")
+        return self
+
+
+class PreviewResponse(BaseModel):
+    """プレビューレスポンス"""
+
+    content_hash: str = Field(description="編集適用後の本文の SHA-256（次回の base_hash）")
+    blocks: list[str] = Field(description="ブロックのハッシュ（表示順）")
+    fragments: dict[str, str] = Field(
+        description="ベース版に存在しないブロックの HTML（ブロックハッシュ → HTML）"
+    )
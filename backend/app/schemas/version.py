@@ -0,0 +1,34 @@
+"""
+記事バージョン履歴のレスポンス スキーマ
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ArticleVersionItem(BaseModel):
+    """バージョン一覧アイテム"""
+
+    version_number: int = Field(description="バージョン番号")
+    title: str = Field(description="当時のタイトル")
+    content_length: int = Field(description="当時の本文の文字数")
+    created_at: datetime = Field(description="保存日時")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArticleVersionDetail(BaseModel):
+    """バージョン詳細"""
+
+    version_number: int = Field(description="バージョン番号")
+    title: str = Field(description="当時のタイトル")
+    content: str = Field(description="当時の本文")
+
+
+class ArticleVersionDiff(BaseModel):
+    """バージョン間の差分"""
+
+    from_version: int = Field(description="比較元のバージョン番号")
+    to_version: int = Field(description="比較先のバージョン番号")
+    diff: str = Field(description="本文の unified diff")
@@ -0,0 +1,120 @@
+"""
+記事のタグ付け（タグの一括作成・タグリンクの差分更新）
+
+タグの数に関わらず往復回数が一定になるよう、以下をそれぞれ 1 ステートメントで行う。
+
+- upsert_tags: INSERT ... ON CONFLICT DO NOTHING RETURNING で新規タグを作成し、
+  既存タグの ID と合わせて返す（CTE で 1 往復）
+- replace_article_tags: 記事のタグリンクを指定したタグ集合に揃える。
+  不要なリンクの論理削除と、新規リンクの INSERT（論理削除済みなら復活）を CTE で 1 往復にまとめ、
+  実際に追加・削除されたタグ ID を返す
+"""
+
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import Boolean, literal_column, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.tag import Tag
+
+
+def upsert_tags(db: Session, user_id: int, names: Iterable[str]) -> dict[str, int]:
+    """
+    タグ名 → タグ ID を返す（存在しないタグは作成する）
+
+    INSERT の RETURNING は新規作成した行しか返さないため、
+    同じステートメント内の SELECT で既存タグを補う（SELECT は INSERT 前のスナップショットを見る）。
+    """
+    names = set(names)
+    if not names:
+        return {}
+
+    rows = [
+        {
+            "public_id": uuid.uuid4(),
+            "user_id": user_id,
+            "name": name,
+            "created_by": user_id,
+            "updated_by": user_id,
+        }
+        for name in names
+    ]
+    inserted = (
+        pg_insert(Tag)
+        .values(rows)
+        .on_conflict_do_nothing(constraint="uq_tags_user_id_name")
+        .returning(Tag.id, Tag.name)
+        .cte("inserted")
+    )
+    stmt = union_all(
+        select(inserted.c.id, inserted.c.name),
+        select(Tag.id, Tag.name).where(Tag.user_id == user_id, Tag.name.in_(names)),
+    )
+    tag_ids = {name: tag_id for tag_id, name in db.execute(stmt).tuples()}
+
+    # 並行するトランザクションが同時に作成したタグはどちらにも現れないため、取り直す
+    missing = names - tag_ids.keys()
+    if missing:
+        result = db.execute(
+            select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(missing))
+        )
+        tag_ids.update(result.tuples())
+    return tag_ids
+
+
+def replace_article_tags(
+    db: Session, user_id: int, article_id: int, tag_ids: Iterable[int]
+) -> tuple[list[int], list[int]]:
+    """
+    記事のタグリンクを tag_ids の集合に揃える（コミットは呼び出し側で行う）
+
+    Returns:
+        (追加したタグ ID, 削除したタグ ID) のタプル
+    """
+    tag_ids = sorted(set(tag_ids))
+
+    removed = (
+        update(ArticleTagLink)
+        .where(
+            ArticleTagLink.article_id == article_id,
+            ArticleTagLink.tag_id.not_in(tag_ids),
+            ArticleTagLink.is_valid,
+        )
+        .values(is_valid=False, updated_by=user_id)
+        .returning(ArticleTagLink.tag_id)
+        .cte("removed")
+    )
+    selects = [select(literal_column("false", Boolean).label("added"), removed.c.tag_id)]
+
+    if tag_ids:
+        insert_stmt = pg_insert(ArticleTagLink).values(
+            [
+                {
+                    "article_id": article_id,
+                    "tag_id": tag_id,
+                    "created_by": user_id,
+                    "updated_by": user_id,
+                }
+                for tag_id in tag_ids
+            ]
+        )
+        # 既存の有効なリンクは更新しない（RETURNING にも含めない）
+        added = (
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_article_tag_links_article_id_tag_id",
+                set_={"is_valid": True, "updated_by": insert_stmt.excluded.updated_by},
+                where=ArticleTagLink.is_valid.is_(False),
+            )
+            .returning(ArticleTagLink.tag_id)
+            .cte("added")
+        )
+        selects.append(select(literal_column("true", Boolean).label("added"), added.c.tag_id))
+
+    added_ids: list[int] = []
+    removed_ids: list[int] = []
+    for is_added, tag_id in db.execute(union_all(*selects)).tuples():
+        (added_ids if is_added else removed_ids).append(tag_id)
+    return added_ids, removed_ids
@@ -0,0 +1,307 @@
+"""
+記事の更新・論理削除（1 文の UPDATE ... RETURNING）
+
+対象の記事の取得・所有者チェック・更新を、WHERE public_id AND user_id AND is_valid 付きの
+UPDATE 1 文で行う（該当行がなければ NotFoundError）。
+
+更新では、バージョン履歴に差分を記録するために更新前のタイトル・本文も必要になる。
+FROM 句の副問い合わせ（FOR UPDATE で行ロック）で更新前の値を取り出し、更新後の値と合わせて
+RETURNING で受け取るため、更新前の値を読むための SELECT も発生しない。
+
+楽観的ロック（If-Match）の条件 updated_at = :expected も同じ WHERE 句に含める。
+更新されなかった場合に限り、記事の有無を確認して 404 と 412 を区別する。
+
+本文の差分更新（apply_content_delta）は、現在の本文に行単位の操作列を適用して update_article で保存する。
+元の本文・適用結果をそれぞれ SHA-256 で照合し、一致しなければ更新せずにエラー（details.fallback =
+"PUT"）を返すため、クライアントは全文の PUT でやり直す。
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.exceptions import (
+    ConflictError,
+    NotFoundError,
+    PreconditionFailedError,
+    ValidationError,
+)
+from app.db.content_compression import decode_content, encode_content
+from app.db.models.article import Article
+from app.services.markdown_render import content_hash
+from app.services.versioning import apply_ops, record_version
+
+
+@dataclass(frozen=True)
+class UpdatedArticle:
+    """更新後の記事（ArticleDetailResponse の属性を持つ）"""
+
+    id: int
+    public_id: UUID
+    title: str
+    content: str
+    folder_id: int | None
+    created_at: datetime
+    updated_at: datetime
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _not_found(public_id: UUID) -> NotFoundError:
+    return NotFoundError(f"Article with public_id {public_id} not found")
+
+
+def _current_updated_at(db: Session, public_id: UUID, user_id: int) -> datetime | None:
+    return db.scalar(
+        select(Article.updated_at).where(
+            Article.public_id == public_id,
+            Article.user_id == user_id,
+            Article.is_valid,
+        )
+    )
+
+
+def article_etag(updated_at: datetime) -> str:
+    """記事の ETag（updated_at の UNIX 時刻をマイクロ秒の整数で表したもの）"""
+    return f'"{(updated_at - _EPOCH) // timedelta(microseconds=1)}"'
+
+
+def parse_if_match(if_match: str | None) -> datetime | None:
+    """
+    If-Match ヘッダーを updated_at に変換する
+
+    ETag（article_etag の値）と updated_at の ISO 8601 表記のどちらも受け付ける。
+    未指定・"*" の場合は None（条件なし）。
+
+    Raises:
+        ValidationError: 形式が不正な場合
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    value = if_match.strip().removeprefix("W/").strip('"')
+    try:
+        if value.isdigit():
+            return _EPOCH + timedelta(microseconds=int(value))
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError("If-Match の形式が不正です", details={"if_match": if_match})
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def update_article(
+    db: Session,
+    public_id: UUID,
+    user_id: int,
+    values: dict[str, Any],
+    *,
+    expected_updated_at: datetime | None = None,
+) -> UpdatedArticle:
+    """
+    ユーザーの有効な記事を更新する（コミットは呼び出し側で行う）
+
+    タイトル・本文が変わった場合はバージョン履歴にも追加する。
+
+    Args:
+        db: SQLAlchemy セッション
+        public_id: 記事の public_id
+        user_id: 操作ユーザーの内部 ID（所有者であること）
+        values: 更新する値（title / content / folder_id のうち指定したもののみ更新する）
+        expected_updated_at: 指定した場合、記事の updated_at が一致するときのみ更新する
+
+    Returns:
+        更新後の記事
+
+    Raises:
+        NotFoundError: 記事が存在しない・削除済み・他のユーザーの記事の場合
+        PreconditionFailedError: expected_updated_at と一致しない（他の更新と競合した）場合
+    """
+    connection = db.connection()
+    column_values = {key: value for key, value in values.items() if key != "content"}
+    if "content" in values:
+        column_values.update(encode_content(connection, user_id, values["content"]))
+
+    # 更新前の値（FOR UPDATE で行ロックしてから読むため、同時更新があっても差分の起点がずれない）
+    old_row = aliased(Article, name="old")
+    old_select = select(
+        old_row.id,
+        old_row.title,
+        old_row.content_text,
+        old_row.content_compressed,
+        old_row.compression_dict_id,
+    ).where(
+        old_row.public_id == public_id,
+        old_row.user_id == user_id,
+        old_row.is_valid,
+    )
+    if expected_updated_at is not None:
+        old_select = old_select.where(old_row.updated_at == expected_updated_at)
+    old = old_select.with_for_update().subquery("old")
+    stmt = (
+        update(Article)
+        .where(Article.id == old.c.id)
+        .values(**column_values, updated_by=user_id)
+        .returning(
+            Article.id,
+            Article.public_id,
+            Article.title,
+            Article.content_text,
+            Article.content_compressed,
+            Article.compression_dict_id,
+            Article.folder_id,
+            Article.created_at,
+            Article.updated_at,
+            old.c.title.label("old_title"),
+            old.c.content_text.label("old_content_text"),
+            old.c.content_compressed.label("old_content_compressed"),
+            old.c.compression_dict_id.label("old_compression_dict_id"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(stmt).one_or_none()
+    if row is None:
+        current = _current_updated_at(db, public_id, user_id) if expected_updated_at else None
+        if current is not None:
+            raise PreconditionFailedError(
+                "記事は他の操作で更新されています。最新の内容を取得してから再度お試しください。",
+                details={"etag": article_etag(current)},
+            )
+        raise _not_found(public_id)
+
+    content = values.get("content")
+    if content is None:
+        content = decode_content(
+            connection, row.content_text, row.content_compressed, row.compression_dict_id
+        )
+    previous_content = decode_content(
+        connection, row.old_content_text, row.old_content_compressed, row.old_compression_dict_id
+    )
+
+    # タイトル・本文が変わった場合のみバージョン履歴に追加
+    if (row.title, content) != (row.old_title, previous_content):
+        record_version(
+            db,
+            row.id,
+            user_id,
+            row.title,
+            content,
+            previous=(row.old_title, previous_content),
+        )
+
+    return UpdatedArticle(
+        id=row.id,
+        public_id=row.public_id,
+        title=row.title,
+        content=content,
+        folder_id=row.folder_id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+def apply_content_delta(
+    db: Session,
+    public_id: UUID,
+    user_id: int,
+    base_hash: str,
+    ops: Sequence[Any],
+    result_hash: str,
+) -> UpdatedArticle:
+    """
+    ユーザーの有効な記事の本文に差分を適用して更新する（コミットは呼び出し側で行う）
+
+    本文を読んだ時点の updated_at を条件に update_article で保存するため、読んでから保存するまでの
+    間に他の更新があった場合は 412 になる。
+
+    Args:
+        db: SQLAlchemy セッション
+        public_id: 記事の public_id
+        user_id: 操作ユーザーの内部 ID（所有者であること）
+        base_hash: 差分の元になった本文の SHA-256
+        ops: 操作列（app.services.versioning の差分と同じ形式）
+        result_hash: 差分を適用した後の本文の SHA-256
+
+    Returns:
+        更新後の記事
+
+    Raises:
+        NotFoundError: 記事が存在しない・削除済み・他のユーザーの記事の場合
+        PreconditionFailedError: 現在の本文が base_hash と一致しない（他の更新と競合した）場合
+        ValidationError: 操作列が不正・適用結果が空の場合
+        ConflictError: 適用結果が result_hash と一致しない場合
+    """
+    row = db.execute(
+        select(
+            Article.content_text,
+            Article.content_compressed,
+            Article.compression_dict_id,
+            Article.updated_at,
+        ).where(
+            Article.public_id == public_id,
+            Article.user_id == user_id,
+            Article.is_valid,
+        )
+    ).first()
+    if row is None:
+        raise _not_found(public_id)
+
+    base = decode_content(
+        db.connection(), row.content_text, row.content_compressed, row.compression_dict_id
+    )
+    current_hash = content_hash(base)
+    if current_hash != base_hash:
+        raise PreconditionFailedError(
+            "記事の本文が差分の元になった内容と一致しません。本文全体を送信して更新してください。",
+            details={
+                "content_hash": current_hash,
+                "etag": article_etag(row.updated_at),
+                "fallback": "PUT",
+            },
+        )
+
+    try:
+        content = apply_ops(base, ops)
+    except ValueError as e:
+        raise ValidationError(f"差分が不正です: {e}", details={"fallback": "PUT"})
+    if not content:
+        raise ValidationError("記事本文を空にすることはできません")
+    if content_hash(content) != result_hash:
+        raise ConflictError(
+            "差分を適用した結果が一致しません。本文全体を送信して更新してください。",
+            details={"fallback": "PUT"},
+        )
+
+    return update_article(
+        db, public_id, user_id, {"content": content}, expected_updated_at=row.updated_at
+    )
+
+
+def soft_delete_article(db: Session, public_id: UUID, user_id: int) -> int:
+    """
+    ユーザーの有効な記事を論理削除する（コミットは呼び出し側で行う）
+
+    Returns:
+        削除した記事の内部 ID
+
+    Raises:
+        NotFoundError: 記事が存在しない・削除済み・他のユーザーの記事の場合
+    """
+    article_id = db.execute(
+        update(Article)
+        .where(
+            Article.public_id == public_id,
+            Article.user_id == user_id,
+            Article.is_valid,
+        )
+        .values(is_valid=False, updated_by=user_id)
+        .returning(Article.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if article_id is None:
+        raise _not_found(public_id)
+    return article_id
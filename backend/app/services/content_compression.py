@@ -0,0 +1,172 @@
+"""
+記事本文の圧縮辞書の学習と、既存記事の再圧縮
+
+- train_dictionary: ユーザーの記事に繰り返し現れる行（見出し・front-matter・定型文など）から
+  zlib のプリセット辞書を作る
+- recompress_articles: 現在の設定・最新の辞書で既存記事をバッチ単位で保存し直す
+
+CLI:
+    python -m app.services.content_compression --email user@example.com --train --recompress
+"""
+
+import argparse
+from collections import Counter
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, undefer
+
+from app.core.logging import logger
+from app.db.content_compression import (
+    MAX_DICTIONARY_SIZE,
+    encode_content,
+    forget_active_dictionary,
+)
+from app.db.models.article import Article
+from app.db.models.compression_dictionary import CompressionDictionary
+from app.db.session import SessionLocal
+
+# 辞書の学習に使う記事数（新しい順）
+TRAINING_SAMPLE_SIZE = 500
+
+# 再圧縮で 1 回に処理する記事数
+RECOMPRESS_BATCH_SIZE = 200
+
+
+def train_dictionary(
+    db: Session, user_id: int, sample_size: int = TRAINING_SAMPLE_SIZE
+) -> int | None:
+    """
+    ユーザーの記事から圧縮辞書を学習して保存する（コミットは呼び出し側で行う）
+
+    複数の記事に現れる行を出現記事数の多い順に選び、MAX_DICTIONARY_SIZE に収まるだけ連結する。
+    zlib は辞書の末尾ほど短い距離で参照できるため、頻出する行ほど末尾に配置する。
+
+    Returns:
+        作成した辞書の ID。学習に十分な記事がなければ None
+    """
+    articles = db.scalars(
+        select(Article)
+        .options(undefer(Article.content_compressed))
+        .where(Article.user_id == user_id, Article.is_valid)
+        .order_by(Article.id.desc())
+        .limit(sample_size)
+    )
+
+    document_frequency: Counter[str] = Counter()
+    for article in articles:
+        lines = {line for line in article.content.splitlines(keepends=True) if line.strip()}
+        document_frequency.update(lines)
+
+    selected: list[bytes] = []
+    size = 0
+    for line, count in document_frequency.most_common():
+        if count < 2:
+            break
+        encoded = line.encode("utf-8")
+        if size + len(encoded) > MAX_DICTIONARY_SIZE:
+            continue
+        selected.append(encoded)
+        size += len(encoded)
+
+    if not selected:
+        return None
+
+    dictionary = CompressionDictionary(
+        user_id=user_id,
+        data=b"".join(reversed(selected)),
+        created_by=user_id,
+        updated_by=user_id,
+    )
+    db.add(dictionary)
+    db.flush()
+    forget_active_dictionary(user_id)
+    return dictionary.id
+
+
+def recompress_articles(
+    db: Session, user_id: int | None = None, batch_size: int = RECOMPRESS_BATCH_SIZE
+) -> int:
+    """
+    既存記事を現在の設定（閾値・最新の辞書）で保存し直す
+
+    id 順のキーセットページングで batch_size 件ずつ処理し、バッチごとにコミットする。
+    圧縮が無効な場合は圧縮済みの本文を非圧縮に戻す。
+    本文の内容は変わらないため updated_at（ETag・一覧の並び順）は保持する。
+
+    Returns:
+        保存形式が変わった記事数
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Article)
+            .options(undefer(Article.content_compressed))
+            .where(Article.id > last_id)
+            .order_by(Article.id)
+            .limit(batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(Article.user_id == user_id)
+        articles = db.scalars(stmt).all()
+        if not articles:
+            break
+
+        connection = db.connection()
+        rows = []
+        for article in articles:
+            values = encode_content(connection, article.user_id, article.content)
+            if (
+                values["content_text"] != article.content_text
+                or values["compression_dict_id"] != article.compression_dict_id
+            ):
+                # 保存形式の変更のみのため updated_at は変えない（onupdate を上書きする。
+                # 変えると ETag が変わり、並行する If-Match の更新が 412 になる）
+                rows.append({"id": article.id, **values, "updated_at": article.updated_at})
+
+        if rows:
+            db.execute(update(Article), rows)
+        db.commit()
+
+        changed += len(rows)
+        last_id = articles[-1].id
+        logger.debug(f"Articles recompressed: {changed} (last_id={last_id})")
+
+    return changed
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.models.user import User
+
+    parser = argparse.ArgumentParser(description="記事本文の圧縮辞書の学習・既存記事の再圧縮")
+    parser.add_argument("--email", default=None, help="対象ユーザー（省略時は全ユーザー）")
+    parser.add_argument("--train", action="store_true", help="圧縮辞書を学習する")
+    parser.add_argument("--recompress", action="store_true", help="既存記事を再圧縮する")
+    parser.add_argument("--batch-size", type=int, default=RECOMPRESS_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        query = select(User.id).where(User.is_valid)
+        if args.email:
+            query = query.where(User.email == args.email)
+        user_ids = list(db.scalars(query))
+        if not user_ids:
+            parser.error(f"user not found: {args.email}")
+
+        if args.train:
+            for user_id in user_ids:
+                dict_id = train_dictionary(db, user_id)
+                print(f"user_id={user_id} dictionary={dict_id}")
+            db.commit()
+
+        if args.recompress:
+            target = user_ids[0] if args.email else None
+            changed = recompress_articles(db, target, batch_size=args.batch_size)
+            print(f"recompressed={changed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
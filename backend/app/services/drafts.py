@@ -0,0 +1,308 @@
+"""
+下書きの自動保存（Redis への書き込み集約 + 定期フラッシュ）
+
+自動保存のたびに articles を UPDATE するのではなく、下書きは Redis に書き込み
+（同じ記事への連続した書き込みは最後の 1 件だけが残る）、バックグラウンドの
+フラッシャーが一定間隔で article_drafts にまとめて UPSERT する。
+
+Redis のキー構成:
+- draft:{user_id}:{article_public_id} → {title, content, saved_at}（Hash）
+- drafts:dirty    → 未フラッシュの下書き（"{user_id}:{article_public_id}" の Set）
+- drafts:inflight → フラッシュ処理中の下書き（ZSet、score は取り出した時刻。完了後に削除）
+
+クラッシュ対策:
+- dirty からの取り出しと inflight への登録は Lua スクリプトで原子的に行う
+- フラッシャーが DB コミット前に落ちても inflight に残るため、取り出してから
+  DRAFT_FLUSH_LEASE_SECONDS を過ぎたものを dirty に戻して再処理する（フラッシュのたびに確認する。
+  他のプロセスがフラッシュ中の下書きは期限内のため取り上げない）
+- Redis 自体は AOF（appendonly yes）で永続化される前提
+- UPSERT は saved_at が新しい場合のみ上書きするため、再処理しても古い下書きで上書きされない
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
+from app.db.models.article import Article
+from app.db.models.article_draft import ArticleDraft
+from app.db.session import SessionLocal
+
+DRAFT_KEY_PREFIX = "draft:"
+DRAFTS_DIRTY_KEY = "drafts:dirty"
+DRAFTS_INFLIGHT_KEY = "drafts:inflight"
+
+# Redis 上の下書きの保持期間（フラッシュ後も読み込み用に残す）
+DRAFT_TTL_SECONDS = 24 * 3600
+
+# dirty から最大 N 件を取り出し、取り出した時刻とともに inflight に移す
+# KEYS[1]: drafts:dirty, KEYS[2]: drafts:inflight
+# ARGV[1]: 件数, ARGV[2]: 現在時刻（UNIX 時刻）
+_CLAIM_SCRIPT = """
+local members = redis.call('SPOP', KEYS[1], ARGV[1])
+for _, member in ipairs(members) do
+    redis.call('ZADD', KEYS[2], ARGV[2], member)
+end
+return members
+"""
+
+# 取り出してから期限を過ぎた inflight の下書きを dirty に戻す
+# KEYS[1]: drafts:dirty, KEYS[2]: drafts:inflight
+# ARGV[1]: 期限（この時刻以前に取り出したものを戻す）
+_RECLAIM_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+if #members > 0 then
+    redis.call('SADD', KEYS[1], unpack(members))
+    redis.call('ZREM', KEYS[2], unpack(members))
+end
+return #members
+"""
+
+
+def _member(user_id: int, public_id: UUID | str) -> str:
+    return f"{user_id}:{public_id}"
+
+
+def _draft_key(member: str) -> str:
+    return DRAFT_KEY_PREFIX + member
+
+
+# ==================================================
+# Redis 側の操作（リクエスト処理から呼び出す）
+# ==================================================
+def save_draft(user_id: int, public_id: UUID, title: str, content: str) -> datetime:
+    """
+    下書きを Redis に保存する（last-write-wins）
+
+    HSET・EXPIRE・dirty への登録を MULTI で 1 往復にまとめる。
+
+    Returns:
+        保存日時
+    """
+    saved_at = datetime.now(timezone.utc)
+    member = _member(user_id, public_id)
+    key = _draft_key(member)
+
+    pipe = redis_manager.redis_client.pipeline(transaction=True)
+    pipe.hset(key, mapping={"title": title, "content": content, "saved_at": saved_at.isoformat()})
+    pipe.expire(key, DRAFT_TTL_SECONDS)
+    pipe.sadd(DRAFTS_DIRTY_KEY, member)
+    pipe.execute()
+    return saved_at
+
+
+def has_cached_draft(user_id: int, public_id: UUID) -> bool:
+    """Redis 上に下書きがあるか（ある場合は作成時に所有者を確認済み）"""
+    return bool(redis_manager.redis_client.exists(_draft_key(_member(user_id, public_id))))
+
+
+def get_cached_draft(user_id: int, public_id: UUID) -> dict[str, Any] | None:
+    """Redis 上の下書きを取得する（存在しなければ None）"""
+    data = redis_manager.redis_client.hgetall(_draft_key(_member(user_id, public_id)))
+    if not data:
+        return None
+    return {
+        "title": data["title"],
+        "content": data["content"],
+        "saved_at": datetime.fromisoformat(data["saved_at"]),
+    }
+
+
+def discard_cached_draft(user_id: int, public_id: UUID) -> None:
+    """Redis 上の下書きを破棄する"""
+    member = _member(user_id, public_id)
+    pipe = redis_manager.redis_client.pipeline(transaction=True)
+    pipe.delete(_draft_key(member))
+    pipe.srem(DRAFTS_DIRTY_KEY, member)
+    pipe.execute()
+
+
+# ==================================================
+# DB へのフラッシュ
+# ==================================================
+def _parse_member(member: str) -> tuple[int, UUID] | None:
+    try:
+        user_id, public_id = member.split(":", 1)
+        return int(user_id), UUID(public_id)
+    except ValueError:
+        return None
+
+
+def _persist(db: Session, members: list[str]) -> int:
+    """
+    指定した下書きを article_drafts に一括 UPSERT する
+
+    Returns:
+        書き込んだ件数
+    """
+    pipe = redis_manager.redis_client.pipeline(transaction=False)
+    for member in members:
+        pipe.hmget(_draft_key(member), ["title", "content", "saved_at"])
+    drafts: dict[tuple[int, UUID], tuple[str, str, datetime]] = {}
+    for member, (title, content, saved_at) in zip(members, pipe.execute()):
+        parsed = _parse_member(member)
+        # TTL 切れ・破棄済みの下書きは対象外
+        if parsed is None or content is None:
+            continue
+        drafts[parsed] = (title, content, datetime.fromisoformat(saved_at))
+
+    if not drafts:
+        return 0
+
+    # 所有者チェックを兼ねて記事 ID を 1 クエリで解決する
+    articles = db.execute(
+        select(Article.id, Article.user_id, Article.public_id).where(
+            tuple_(Article.user_id, Article.public_id).in_(list(drafts)),
+            Article.is_valid,
+        )
+    ).all()
+
+    rows = []
+    for article in articles:
+        title, content, saved_at = drafts[(article.user_id, article.public_id)]
+        rows.append(
+            {
+                "article_id": article.id,
+                "title": title,
+                "content": content,
+                "saved_at": saved_at,
+                "created_by": article.user_id,
+                "updated_by": article.user_id,
+            }
+        )
+    if not rows:
+        return 0
+
+    stmt = pg_insert(ArticleDraft).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArticleDraft.article_id],
+        set_={
+            "title": stmt.excluded.title,
+            "content": stmt.excluded.content,
+            "saved_at": stmt.excluded.saved_at,
+            "updated_by": stmt.excluded.updated_by,
+            "is_valid": True,
+            # ON CONFLICT DO UPDATE では TimestampMixin の onupdate が効かないため明示する
+            "updated_at": func.now(),
+        },
+        # 再処理時に古い下書きで上書きしない
+        where=ArticleDraft.saved_at < stmt.excluded.saved_at,
+    )
+    db.execute(stmt)
+    db.commit()
+    return len(rows)
+
+
+def _flush_members(db: Session, members: list[str]) -> int:
+    try:
+        written = _persist(db, members)
+    except Exception:
+        db.rollback()
+        # 失敗した下書きは dirty に戻して次回に再試行する
+        pipe = redis_manager.redis_client.pipeline(transaction=True)
+        pipe.sadd(DRAFTS_DIRTY_KEY, *members)
+        pipe.zrem(DRAFTS_INFLIGHT_KEY, *members)
+        pipe.execute()
+        raise
+    redis_manager.redis_client.zrem(DRAFTS_INFLIGHT_KEY, *members)
+    return written
+
+
+def flush_draft(db: Session, user_id: int, public_id: UUID) -> bool:
+    """
+    指定した下書きを即座に DB に書き込む（手動保存）
+
+    Returns:
+        True: 書き込み成功、False: 下書きが存在しない（または記事が見つからない）
+    """
+    member = _member(user_id, public_id)
+    pipe = redis_manager.redis_client.pipeline(transaction=True)
+    pipe.srem(DRAFTS_DIRTY_KEY, member)
+    pipe.zadd(DRAFTS_INFLIGHT_KEY, {member: int(time.time())})
+    pipe.execute()
+    return _flush_members(db, [member]) > 0
+
+
+def flush_pending_drafts(batch_size: int | None = None) -> int:
+    """
+    未フラッシュの下書きをバッチ単位ですべて DB に書き込む
+
+    Returns:
+        書き込んだ件数
+    """
+    batch_size = batch_size or settings.DRAFT_FLUSH_BATCH_SIZE
+    claim = redis_manager.redis_client.register_script(_CLAIM_SCRIPT)
+    written = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            members = claim(
+                keys=[DRAFTS_DIRTY_KEY, DRAFTS_INFLIGHT_KEY], args=[batch_size, int(time.time())]
+            )
+            if not members:
+                break
+            written += _flush_members(db, list(members))
+    finally:
+        db.close()
+
+    if written:
+        logger.debug(f"Drafts flushed: {written}")
+    return written
+
+
+def recover_flushing_drafts(lease_seconds: int | None = None) -> int:
+    """
+    フラッシュ中に中断された下書きを dirty に戻す
+
+    取り出してから lease_seconds（省略時は DRAFT_FLUSH_LEASE_SECONDS）を過ぎたもののみ戻すため、
+    他のプロセスがフラッシュ中の下書きは取り上げない。
+    """
+    lease_seconds = lease_seconds or settings.DRAFT_FLUSH_LEASE_SECONDS
+    reclaim = redis_manager.redis_client.register_script(_RECLAIM_SCRIPT)
+    recovered = int(
+        reclaim(
+            keys=[DRAFTS_DIRTY_KEY, DRAFTS_INFLIGHT_KEY], args=[int(time.time()) - lease_seconds]
+        )
+    )
+    if recovered:
+        logger.warning(f"Recovered interrupted draft flush: {recovered} drafts")
+    return recovered
+
+
+def discard_persisted_draft(db: Session, user_id: int, public_id: UUID) -> None:
+    """DB 上の下書きを論理削除する"""
+    article_id = (
+        select(Article.id)
+        .where(Article.public_id == public_id, Article.user_id == user_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(ArticleDraft)
+        .where(ArticleDraft.article_id == article_id, ArticleDraft.is_valid)
+        .values(is_valid=False, updated_by=user_id)
+    )
+    db.commit()
+
+
+async def draft_flush_loop(interval_seconds: int) -> None:
+    """一定間隔で下書きをフラッシュするバックグラウンドタスク（期限切れの inflight も回収する）"""
+    while True:
+        try:
+            await run_in_threadpool(recover_flushing_drafts)
+        except Exception:
+            logger.exception("Draft flush recovery failed")
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(flush_pending_drafts)
+        except Exception:
+            logger.exception("Draft flush failed")
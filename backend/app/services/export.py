@@ -0,0 +1,235 @@
+"""
+ナレッジベースのエクスポート（NDJSON / Markdown zip）
+
+記事はサーバーサイドカーソル（yield_per）でチャンク単位に読み出し、
+1 件ずつシリアライズして返すため、メモリ使用量は記事件数に依存しない。
+"""
+
+import json
+import re
+import zipfile
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.db.content_compression import decode_content
+from app.db.models.article import Article
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.folder import Folder
+from app.db.models.tag import Tag
+
+# サーバーサイドカーソルから一度に取得する行数
+EXPORT_CHUNK_SIZE = 500
+
+# ファイル名に使えない文字
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class ExportRow(NamedTuple):
+    """エクスポート 1 件分（本文は展開済み）"""
+
+    public_id: UUID
+    folder_id: int | None
+    title: str
+    content: str
+    created_at: datetime
+    updated_at: datetime
+    tags: list[str] | None
+
+
+def build_folder_paths(db: Session, user_id: int) -> dict[int, str]:
+    """
+    ユーザーのフォルダ ID → フォルダパス（例: "仕事/議事録"）の対応表を作る
+
+    フォルダ数は記事数に比べて十分小さい前提で、全件をメモリに載せる。
+    """
+    rows = db.execute(
+        select(Folder.id, Folder.name, Folder.parent_id).where(
+            Folder.user_id == user_id,
+            Folder.is_valid,
+        )
+    ).all()
+    folders = {row.id: (row.name, row.parent_id) for row in rows}
+
+    paths: dict[int, str] = {}
+
+    def resolve(folder_id: int) -> str:
+        if folder_id in paths:
+            return paths[folder_id]
+        parts: list[str] = []
+        seen: set[int] = set()
+        current: int | None = folder_id
+        # 親をたどる（循環参照・無効な親は打ち切る）
+        while current is not None and current in folders and current not in seen:
+            seen.add(current)
+            name, parent_id = folders[current]
+            parts.append(sanitize_filename(name))
+            current = parent_id
+        paths[folder_id] = "/".join(reversed(parts))
+        return paths[folder_id]
+
+    for folder_id in folders:
+        resolve(folder_id)
+    return paths
+
+
+def iter_export_rows(db: Session, user_id: int) -> Iterator[ExportRow]:
+    """
+    エクスポート対象の記事をタグ名付きで 1 行ずつ返す
+
+    yield_per によりサーバーサイドカーソルから EXPORT_CHUNK_SIZE 件ずつ読み出す。
+    圧縮保存された本文は 1 件ずつ展開する。
+    """
+    tag_names = (
+        select(func.array_agg(aggregate_order_by(Tag.name, Tag.name)))
+        .join(ArticleTagLink, ArticleTagLink.tag_id == Tag.id)
+        .where(
+            ArticleTagLink.article_id == Article.id,
+            ArticleTagLink.is_valid,
+            Tag.is_valid,
+        )
+        .scalar_subquery()
+    )
+
+    stmt = (
+        select(
+            Article.public_id,
+            Article.folder_id,
+            Article.title,
+            Article.content_text,
+            Article.content_compressed,
+            Article.compression_dict_id,
+            Article.created_at,
+            Article.updated_at,
+            tag_names.label("tags"),
+        )
+        .where(
+            Article.user_id == user_id,
+            Article.is_valid,
+        )
+        .order_by(Article.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+
+    connection = db.connection()
+    for row in db.execute(stmt):
+        yield ExportRow(
+            public_id=row.public_id,
+            folder_id=row.folder_id,
+            title=row.title,
+            content=decode_content(
+                connection, row.content_text, row.content_compressed, row.compression_dict_id
+            ),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            tags=row.tags,
+        )
+
+
+def sanitize_filename(name: str) -> str:
+    """ファイル名・ディレクトリ名として安全な文字列に変換する"""
+    cleaned = _UNSAFE_FILENAME_CHARS.sub("_", name).strip().strip(".")
+    return cleaned or "untitled"
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def row_to_dict(row: ExportRow, folder_paths: dict[int, str]) -> dict[str, Any]:
+    """エクスポート 1 行を JSON 化可能な dict に変換する"""
+    return {
+        "public_id": str(row.public_id),
+        "title": row.title,
+        "content": row.content,
+        "folder": folder_paths.get(row.folder_id) if row.folder_id else None,
+        "tags": list(row.tags or []),
+        "created_at": _isoformat(row.created_at),
+        "updated_at": _isoformat(row.updated_at),
+    }
+
+
+def render_markdown_file(row: ExportRow) -> str:
+    """記事を front-matter 付きの Markdown テキストに変換する"""
+    front_matter = [
+        "---",
+        f"title: {json.dumps(row.title, ensure_ascii=False)}",
+        f"public_id: {row.public_id}",
+        f"tags: {json.dumps(list(row.tags or []), ensure_ascii=False)}",
+        f"created_at: {_isoformat(row.created_at)}",
+        f"updated_at: {_isoformat(row.updated_at)}",
+        "---",
+        "",
+    ]
+    return "\n".join(front_matter) + row.content
+
+
+def stream_ndjson(db: Session, user_id: int) -> Iterator[bytes]:
+    """記事を 1 行 1 JSON（NDJSON）でストリーミングする"""
+    folder_paths = build_folder_paths(db, user_id)
+    for row in iter_export_rows(db, user_id):
+        line = json.dumps(row_to_dict(row, folder_paths), ensure_ascii=False)
+        yield (line + "\n").encode("utf-8")
+
+
+class _ChunkBuffer:
+    """
+    zipfile の書き込み先として使う追記専用バッファ
+
+    seek/tell を持たないため zipfile はストリーミングモード（データ記述子付き）で書き込む。
+    書き込まれたバイト列は drain() で取り出して破棄する。
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_markdown_zip(db: Session, user_id: int) -> Iterator[bytes]:
+    """
+    記事をフォルダ階層どおりに配置した .md ファイルの zip としてストリーミングする
+
+    本文は 1 件ずつ圧縮して即座に送り出す。zip の仕様上、末尾のセントラルディレクトリ用に
+    エントリごとのメタデータ（ファイル名等）のみ保持する。
+    """
+    folder_paths = build_folder_paths(db, user_id)
+    buffer = _ChunkBuffer()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for row in iter_export_rows(db, user_id):
+            directory = folder_paths.get(row.folder_id, "") if row.folder_id else ""
+            # 同名タイトルの衝突を避けるため public_id の先頭 8 文字を付与する
+            filename = f"{sanitize_filename(row.title)}_{str(row.public_id)[:8]}.md"
+            arcname = f"{directory}/{filename}" if directory else filename
+
+            info = zipfile.ZipInfo(arcname, date_time=row.updated_at.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, render_markdown_file(row))
+
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+
+    # セントラルディレクトリ
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
@@ -0,0 +1,240 @@
+"""
+フォルダ階層（マテリアライズドパス）の操作
+
+folders.path はルートから自身までのフォルダ ID を "/" で連結した文字列（例: "/3/17/42/"）。
+あるフォルダのサブツリーは「path が自身の path で始まる行」であり、
+(user_id, path text_pattern_ops) のインデックスで前方一致検索できる。
+
+- 作成: ID を先に採番し、親の path + 自身の ID を同じ INSERT で書き込む
+- 移動: 移動元・移動先とその祖先の行を ID 順に FOR UPDATE でロックしてから、
+  サブツリー全体の path の付け替えを 1 回の UPDATE で行う
+- 削除: サブツリー全体（とその配下の記事）を前方一致で論理削除する
+- ツリー取得: フォルダと記事を 1 クエリで取得する（組み立ては呼び出し側で O(n) で行う）
+"""
+
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    Row,
+    String,
+    case,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import NotFoundError, ValidationError
+from app.db.models.article import Article
+from app.db.models.folder import Folder
+from app.services.outbox import (
+    ARTICLE_DELETED,
+    FOLDER_CREATED,
+    FOLDER_DELETED,
+    FOLDER_MOVED,
+    record_event,
+)
+from app.services.tag_stats import apply_article_removal
+
+PATH_SEPARATOR = "/"
+
+
+def build_path(parent_path: str | None, folder_id: int) -> str:
+    """親の path と自身の ID から path を作る"""
+    return f"{parent_path or PATH_SEPARATOR}{folder_id}{PATH_SEPARATOR}"
+
+
+def path_ids(path: str) -> list[int]:
+    """path に含まれるフォルダ ID（ルート側から順に、自身を含む）"""
+    return [int(part) for part in path.strip(PATH_SEPARATOR).split(PATH_SEPARATOR) if part]
+
+
+def get_owned_folder(db: Session, user_id: int, public_id: uuid.UUID) -> Folder:
+    folder = db.scalar(
+        select(Folder).where(
+            Folder.public_id == public_id,
+            Folder.user_id == user_id,
+            Folder.is_valid,
+        )
+    )
+    if folder is None:
+        raise NotFoundError(f"Folder with public_id {public_id} not found")
+    return folder
+
+
+def insert_folders(db: Session, user_id: int, items: Sequence[tuple[str, int | None]]) -> list[int]:
+    """
+    フォルダを一括作成する（コミットは呼び出し側で行う）
+
+    path に自身の ID を含めるため、シーケンスから ID を先に採番してから INSERT する。
+
+    Args:
+        items: (name, parent_id) のリスト。親は作成済みであること
+
+    Returns:
+        items と同じ順序のフォルダ ID
+    """
+    if not items:
+        return []
+
+    parent_ids = {parent_id for _, parent_id in items if parent_id is not None}
+    parent_paths: dict[int, str] = {}
+    if parent_ids:
+        parent_paths = dict(
+            db.execute(
+                select(Folder.id, Folder.path).where(
+                    Folder.id.in_(parent_ids), Folder.user_id == user_id
+                )
+            ).tuples()
+        )
+
+    ids = list(
+        db.scalars(
+            select(func.nextval("folders_id_seq")).select_from(func.generate_series(1, len(items)))
+        )
+    )
+
+    rows = []
+    for folder_id, (name, parent_id) in zip(ids, items):
+        if parent_id is not None and parent_id not in parent_paths:
+            raise NotFoundError(f"Folder with id {parent_id} not found")
+        rows.append(
+            {
+                "id": folder_id,
+                "public_id": uuid.uuid4(),
+                "user_id": user_id,
+                "name": name,
+                "parent_id": parent_id,
+                "path": build_path(parent_paths.get(parent_id) if parent_id else None, folder_id),
+                "created_by": user_id,
+                "updated_by": user_id,
+            }
+        )
+    db.execute(insert(Folder), rows)
+    record_event(db, user_id, FOLDER_CREATED, {"folder_ids": ids})
+    return ids
+
+
+def move_folder(db: Session, user_id: int, folder: Folder, new_parent: Folder | None) -> None:
+    """
+    フォルダをサブツリーごと別の親の下に移動する（コミットは呼び出し側で行う）
+
+    サブツリー全行の path の付け替えと、移動元フォルダの parent_id の更新を 1 回の UPDATE で行う。
+
+    同時に行われる移動と競合しないよう、移動元・移動先とそれぞれの祖先の行を ID 順に
+    FOR UPDATE でロックし、ロック後に読み直した path で循環の検査と付け替えを行う
+    （A を B へ・B を A へ の同時移動で循環ができる、祖先の移動で付け替え前の path が
+    古くなる、といったことを防ぐ）。祖先が変わっていた場合は新しい祖先もロックし直す。
+
+    Raises:
+        NotFoundError: ロック後に移動元・移動先が削除されていた場合
+        ValidationError: 自身または自身の子孫フォルダへ移動しようとした場合
+    """
+    _lock_with_ancestors(db, user_id, folder, new_parent)
+    if new_parent is not None and new_parent.path.startswith(folder.path):
+        raise ValidationError("Cannot move a folder into itself or its descendants")
+
+    old_prefix = folder.path
+    new_prefix = build_path(new_parent.path if new_parent else None, folder.id)
+    if old_prefix == new_prefix:
+        return
+
+    db.execute(
+        update(Folder)
+        .where(Folder.user_id == user_id, Folder.path.like(old_prefix + "%"))
+        .values(
+            path=literal(new_prefix) + func.substr(Folder.path, len(old_prefix) + 1),
+            parent_id=case(
+                (Folder.id == folder.id, new_parent.id if new_parent else None),
+                else_=Folder.parent_id,
+            ),
+            updated_by=user_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    record_event(
+        db,
+        user_id,
+        FOLDER_MOVED,
+        {"folder_id": folder.id, "parent_id": new_parent.id if new_parent else None},
+    )
+    db.expire(folder)
+
+
+def _lock_with_ancestors(
+    db: Session, user_id: int, folder: Folder, new_parent: Folder | None
+) -> None:
+    """移動元・移動先とその祖先の行を ID 順にロックし、folder / new_parent を最新の値にする"""
+    targets = [folder] if new_parent is None else [folder, new_parent]
+    locked: set[int] = set()
+    while True:
+        ids = {folder_id for target in targets for folder_id in path_ids(target.path)}
+        if ids <= locked:
+            break
+        db.scalars(
+            select(Folder)
+            .where(Folder.id.in_(ids), Folder.user_id == user_id)
+            .order_by(Folder.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).all()
+        locked |= ids
+
+    for target in targets:
+        if not target.is_valid:
+            raise NotFoundError(f"Folder with public_id {target.public_id} not found")
+
+
+def delete_folder(db: Session, user_id: int, folder: Folder) -> None:
+    """フォルダをサブツリーと配下の記事ごと論理削除する（コミットは呼び出し側で行う）"""
+    subtree = select(Folder.id).where(
+        Folder.user_id == user_id, Folder.path.like(folder.path + "%")
+    )
+    article_ids = db.scalars(
+        update(Article)
+        .where(Article.user_id == user_id, Article.folder_id.in_(subtree), Article.is_valid)
+        .values(is_valid=False, updated_by=user_id)
+        .returning(Article.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    apply_article_removal(db, user_id, article_ids)
+    if article_ids:
+        record_event(db, user_id, ARTICLE_DELETED, {"article_ids": list(article_ids)})
+    db.execute(
+        update(Folder)
+        .where(Folder.id.in_(subtree), Folder.is_valid)
+        .values(is_valid=False, updated_by=user_id)
+        .execution_options(synchronize_session=False)
+    )
+    record_event(db, user_id, FOLDER_DELETED, {"folder_id": folder.id})
+    db.expire(folder)
+
+
+def load_tree_rows(db: Session, user_id: int) -> Sequence[Row[Any]]:
+    """
+    ツリー表示用にフォルダと記事を 1 クエリで取得する
+
+    フォルダ・記事を UNION ALL でまとめ、(kind, id, public_id, name, parent_id) の行を
+    名前順で返す。記事の name はタイトル、parent_id は所属フォルダ ID。
+    """
+    folders = select(
+        literal_column("'folder'", String).label("kind"),
+        Folder.id,
+        Folder.public_id,
+        Folder.name,
+        Folder.parent_id,
+    ).where(Folder.user_id == user_id, Folder.is_valid)
+    articles = select(
+        literal_column("'article'", String).label("kind"),
+        Article.id,
+        Article.public_id,
+        Article.title,
+        Article.folder_id,
+    ).where(Article.user_id == user_id, Article.is_valid)
+    return db.execute(union_all(folders, articles).order_by("kind", "name")).all()
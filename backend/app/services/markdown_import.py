@@ -0,0 +1,544 @@
+"""
+Markdown ディレクトリ / zip のインポートパイプライン
+
+Obsidian Vault などの .md ファイル群を一括で取り込む。
+
+処理の流れ:
+1. ソース（ディレクトリ / zip / アップロードファイル群）から .md ファイルを列挙
+2. プロセスプールで front-matter・タグ・フォルダパスを並列パース
+3. 本文の SHA-256 で重複排除（既存記事・同一インポート内の両方）
+4. folders / tags / articles / article_tag_links にバッチ単位で一括 INSERT
+
+進捗は Redis のジョブステータス（import_job:{job_id}）に書き込む。
+
+CLI:
+    python -m app.services.markdown_import <path> --email user@example.com
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import re
+import shutil
+import uuid
+import zipfile
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import groupby, islice
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
+from app.db.content_compression import decode_content, encode_content
+from app.db.models.article import Article
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.folder import Folder
+from app.db.session import SessionLocal
+from app.services.article_tags import upsert_tags
+from app.services.folders import insert_folders
+from app.services.outbox import ARTICLE_IMPORTED, record_event
+from app.services.tag_stats import apply_tag_deltas
+
+# 1 バッチで INSERT する記事数
+IMPORT_BATCH_SIZE = 200
+
+# ジョブステータスの保持期間（秒）
+IMPORT_JOB_TTL_SECONDS = 24 * 3600
+
+MARKDOWN_SUFFIXES = {".md", ".markdown"}
+
+_FRONT_MATTER = re.compile(r"\A---\s*\n(.*?)\n---\s*(?:\n|\Z)", re.DOTALL)
+# Obsidian 形式のインラインタグ（#tag, #親/子）。見出しの "# " は対象外
+_INLINE_TAG = re.compile(r"(?:^|\s)#([^\s#!-/:-@\[-^`{-~][^\s#]*)")
+_FENCED_CODE = re.compile(r"^(```|~~~).*?^\1", re.DOTALL | re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ParsedNote:
+    """パース済みの Markdown ファイル（プロセス間で受け渡すため picklable に保つ）"""
+
+    source_path: str
+    title: str
+    content: str
+    folder_path: tuple[str, ...]
+    tags: tuple[str, ...]
+    content_hash: str
+
+
+@dataclass
+class ImportStats:
+    """インポート結果の集計"""
+
+    total: int = 0
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+# ==================================================
+# パース（プロセスプールで実行）
+# ==================================================
+def _normalize_tags(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = re.split(r"[,\s]+", value)
+    if not isinstance(value, list):
+        return []
+    return [str(tag).lstrip("#").strip() for tag in value if str(tag).strip()]
+
+
+def parse_markdown(source_path: str, raw: bytes) -> ParsedNote:
+    """
+    Markdown ファイル 1 件をパースする
+
+    Args:
+        source_path: ソース内の相対パス（例: "仕事/議事録/2026-01-01.md"）
+        raw: ファイルのバイト列
+
+    Returns:
+        ParsedNote
+    """
+    text = raw.decode("utf-8", errors="replace").lstrip("\ufeff").replace("\r\n", "\n")
+    path = PurePosixPath(source_path)
+
+    meta: dict[str, Any] = {}
+    body = text
+    match = _FRONT_MATTER.match(text)
+    if match:
+        # PyYAML はインポート処理でしか使わないため、API の起動時には読み込まない
+        import yaml
+
+        try:
+            loaded = yaml.safe_load(match.group(1))
+            if isinstance(loaded, dict):
+                meta = loaded
+                body = text[match.end() :]
+        except yaml.YAMLError:
+            # 壊れた front-matter は本文の一部として扱う
+            pass
+
+    title = str(meta.get("title") or path.stem).strip()[:255] or "untitled"
+
+    tags = _normalize_tags(meta.get("tags"))
+    tags += _INLINE_TAG.findall(_FENCED_CODE.sub("", body))
+    unique_tags = tuple(dict.fromkeys(tag[:100] for tag in tags if tag))
+
+    folder_path = tuple(part[:100] for part in path.parent.parts if part not in ("", "."))
+
+    return ParsedNote(
+        source_path=source_path,
+        title=title,
+        content=body,
+        folder_path=folder_path,
+        tags=unique_tags,
+        content_hash=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+    )
+
+
+def _parse_entry(entry: tuple[str, bytes]) -> ParsedNote | str:
+    """プロセスプール用ラッパー（失敗時はエラーメッセージを返す）"""
+    source_path, raw = entry
+    try:
+        return parse_markdown(source_path, raw)
+    except Exception as e:
+        return f"{source_path}: {type(e).__name__}: {e}"
+
+
+# ==================================================
+# ソースの列挙
+# ==================================================
+def _is_markdown(name: str) -> bool:
+    path = PurePosixPath(name)
+    # .obsidian などの隠しディレクトリ・隠しファイルは除外
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return False
+    return path.suffix.lower() in MARKDOWN_SUFFIXES
+
+
+def _check_size(name: str, size: int, total: int) -> None:
+    """展開後のサイズを上限と比較する（zip bomb 対策）"""
+    if size > settings.IMPORT_MAX_FILE_BYTES:
+        raise ValidationError(
+            "ファイルサイズが上限を超えています",
+            details={"file": name, "size": size, "limit": settings.IMPORT_MAX_FILE_BYTES},
+        )
+    if total > settings.IMPORT_MAX_TOTAL_BYTES:
+        raise ValidationError(
+            "インポートするファイルの合計サイズが上限を超えています",
+            details={"total": total, "limit": settings.IMPORT_MAX_TOTAL_BYTES},
+        )
+
+
+def count_sources(source: Path) -> int:
+    """
+    ソース内の Markdown ファイル数を数える（進捗表示用）
+
+    展開後のサイズ（zip はヘッダーの値）も確認し、上限を超えていれば読み込む前に中止する。
+
+    Raises:
+        ValidationError: 1 ファイル・合計のサイズが上限を超える場合
+    """
+    count = 0
+    total = 0
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_markdown(info.filename):
+                    count += 1
+                    total += info.file_size
+                    _check_size(info.filename, info.file_size, total)
+        return count
+
+    for p in source.rglob("*"):
+        if p.is_file() and _is_markdown(p.relative_to(source).as_posix()):
+            size = p.stat().st_size
+            count += 1
+            total += size
+            _check_size(p.name, size, total)
+    return count
+
+
+def iter_sources(source: Path) -> Iterator[tuple[str, bytes]]:
+    """
+    ディレクトリまたは zip から (相対パス, バイト列) を順に返す
+
+    zip の展開はヘッダーの展開後サイズで打ち切られる（zipfile の仕様）ため、読み込む前に
+    ヘッダーのサイズを上限と比較すれば、1 ファイルの展開で使うメモリは上限以内に収まる。
+
+    Raises:
+        ValidationError: 1 ファイル・合計のサイズが上限を超える場合
+    """
+    total = 0
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_markdown(info.filename):
+                    total += info.file_size
+                    _check_size(info.filename, info.file_size, total)
+                    yield info.filename, archive.read(info)
+        return
+
+    for file_path in sorted(source.rglob("*")):
+        relative = file_path.relative_to(source).as_posix()
+        if file_path.is_file() and _is_markdown(relative):
+            size = file_path.stat().st_size
+            total += size
+            _check_size(relative, size, total)
+            yield relative, file_path.read_bytes()
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ==================================================
+# DB への一括登録
+# ==================================================
+class _ImportContext:
+    """インポート中に使い回すキャッシュ（フォルダ・タグ・既存ハッシュ）"""
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self.folder_ids = self._load_folders()
+        self.tag_ids: dict[str, int] = {}
+        self.seen_hashes = self._load_content_hashes()
+
+    def _load_folders(self) -> dict[tuple[str, ...], int]:
+        rows = self.db.execute(
+            select(Folder.id, Folder.name, Folder.parent_id).where(
+                Folder.user_id == self.user_id,
+                Folder.is_valid,
+            )
+        ).all()
+        by_id = {row.id: (row.name, row.parent_id) for row in rows}
+
+        paths: dict[tuple[str, ...], int] = {}
+        for folder_id in by_id:
+            parts: list[str] = []
+            current: int | None = folder_id
+            while current is not None and current in by_id and len(parts) <= len(by_id):
+                name, current = by_id[current]
+                parts.append(name)
+            paths.setdefault(tuple(reversed(parts)), folder_id)
+        return paths
+
+    def _load_content_hashes(self) -> set[str]:
+        # PostgreSQL 11+ の組み込み sha256() でハッシュのみを取得する（本文は転送しない）
+        digest = func.encode(func.sha256(func.convert_to(Article.content_text, "UTF8")), "hex")
+        rows = self.db.execute(
+            select(digest, Article.content_compressed, Article.compression_dict_id).where(
+                Article.user_id == self.user_id,
+                Article.is_valid,
+            )
+        ).all()
+
+        # 圧縮保存された本文のみ展開してハッシュを計算する
+        connection = self.db.connection()
+        hashes: set[str] = set()
+        for hexdigest, compressed, dict_id in rows:
+            if hexdigest is None:
+                content = decode_content(connection, None, compressed, dict_id)
+                hexdigest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            hashes.add(hexdigest)
+        return hashes
+
+    def _audit(self) -> dict[str, int]:
+        return {"created_by": self.user_id, "updated_by": self.user_id}
+
+    def ensure_folders(self, paths: Iterable[tuple[str, ...]]) -> None:
+        """未作成のフォルダを階層ごとに 1 回の INSERT でまとめて作成する"""
+        missing = {p[:depth] for p in paths for depth in range(1, len(p) + 1)}
+        missing -= self.folder_ids.keys()
+
+        for _, group in groupby(sorted(missing, key=len), key=len):
+            level = list(group)
+            ids = insert_folders(
+                self.db,
+                self.user_id,
+                [(path[-1], self.folder_ids.get(path[:-1])) for path in level],
+            )
+            self.folder_ids.update(zip(level, ids))
+
+    def ensure_tags(self, names: Iterable[str]) -> None:
+        """未取得のタグを ON CONFLICT DO NOTHING で一括作成し、ID をキャッシュする"""
+        missing = set(names) - self.tag_ids.keys()
+        if missing:
+            self.tag_ids.update(upsert_tags(self.db, self.user_id, missing))
+
+    def insert_batch(self, notes: list[ParsedNote]) -> None:
+        """記事とタグリンクを一括 INSERT する（タグインデックスへの反映イベントも記録する）"""
+        self.ensure_folders(note.folder_path for note in notes if note.folder_path)
+        self.ensure_tags(tag for note in notes for tag in note.tags)
+
+        connection = self.db.connection()
+        rows = [
+            {
+                "public_id": uuid.uuid4(),
+                "user_id": self.user_id,
+                "folder_id": self.folder_ids.get(note.folder_path) if note.folder_path else None,
+                "title": note.title,
+                **encode_content(connection, self.user_id, note.content),
+                **self._audit(),
+            }
+            for note in notes
+        ]
+        article_ids = self.db.scalars(
+            insert(Article).returning(Article.id, sort_by_parameter_order=True), rows
+        ).all()
+
+        links = [
+            {"article_id": article_id, "tag_id": self.tag_ids[tag], **self._audit()}
+            for article_id, note in zip(article_ids, notes)
+            for tag in note.tags
+        ]
+        if links:
+            self.db.execute(insert(ArticleTagLink), links)
+            apply_tag_deltas(self.db, self.user_id, Counter(link["tag_id"] for link in links))
+
+        # タグインデックスへの反映はアウトボックス経由で行う
+        record_event(
+            self.db,
+            self.user_id,
+            ARTICLE_IMPORTED,
+            {
+                "article_ids": list(article_ids),
+                "added": [[link["article_id"], link["tag_id"]] for link in links],
+            },
+        )
+
+
+def import_markdown(
+    db: Session,
+    user_id: int,
+    entries: Iterable[tuple[str, bytes]],
+    total: int = 0,
+    max_workers: int | None = None,
+    on_progress: Callable[[ImportStats], None] | None = None,
+) -> ImportStats:
+    """
+    Markdown ファイル群をパースしてユーザーの記事として登録する
+
+    バッチごとにコミットするため、途中で失敗してもそれまでのバッチは保存される。
+
+    Args:
+        db: SQLAlchemy セッション
+        user_id: 取り込み先ユーザーの内部 ID
+        entries: (相対パス, バイト列) のイテラブル
+        total: ファイル総数（進捗表示用、不明なら 0）
+        max_workers: パースに使うプロセス数（None なら CPU 数）
+        on_progress: バッチ完了ごとに呼ばれるコールバック
+
+    Returns:
+        ImportStats
+    """
+    stats = ImportStats(total=total)
+    context = _ImportContext(db, user_id)
+
+    # ワーカーのジョブスレッドから呼ばれるため、fork せずに spawn で起動する
+    # （他のスレッドが保持している Redis・ロギングのロックを子プロセスに引き継がない）
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for batch in _batched(entries, IMPORT_BATCH_SIZE):
+            notes: list[ParsedNote] = []
+            for result in executor.map(_parse_entry, batch, chunksize=16):
+                stats.processed += 1
+                if isinstance(result, str):
+                    stats.failed += 1
+                    stats.errors.append(result)
+                    continue
+                if result.content_hash in context.seen_hashes:
+                    stats.duplicates += 1
+                    continue
+                context.seen_hashes.add(result.content_hash)
+                notes.append(result)
+
+            if notes:
+                context.insert_batch(notes)
+                db.commit()
+                stats.imported += len(notes)
+
+            if on_progress:
+                on_progress(stats)
+
+    return stats
+
+
+# ==================================================
+# ジョブステータス（Redis）
+# ==================================================
+def _job_key(job_id: str) -> str:
+    return f"import_job:{job_id}"
+
+
+def create_import_job(user_id: int) -> str:
+    """インポートジョブを作成し、ジョブ ID を返す"""
+    job_id = uuid.uuid4().hex
+    key = _job_key(job_id)
+    redis_manager.redis_client.hset(
+        key,
+        mapping={"user_id": user_id, "status": "pending", "total": 0, "processed": 0},
+    )
+    redis_manager.redis_client.expire(key, IMPORT_JOB_TTL_SECONDS)
+    return job_id
+
+
+def update_import_job(
+    job_id: str, status: str, stats: ImportStats | None = None, **extra: Any
+) -> None:
+    """ジョブステータスを更新する"""
+    mapping: dict[str, Any] = {"status": status, **extra}
+    if stats is not None:
+        mapping.update(
+            total=stats.total,
+            processed=stats.processed,
+            imported=stats.imported,
+            duplicates=stats.duplicates,
+            failed=stats.failed,
+            # エラーは先頭 20 件のみ保持する
+            errors=json.dumps(stats.errors[:20], ensure_ascii=False),
+        )
+    redis_manager.redis_client.hset(_job_key(job_id), mapping=mapping)
+
+
+def get_import_job(job_id: str) -> dict[str, Any] | None:
+    """ジョブステータスを取得する（存在しなければ None）"""
+    data = redis_manager.redis_client.hgetall(_job_key(job_id))
+    return data or None
+
+
+def run_import_job(job_id: str, user_id: int, source: Path, cleanup: bool = True) -> None:
+    """
+    インポートジョブを実行する（ジョブ markdown.import から呼び出す）
+
+    Args:
+        job_id: ジョブ ID
+        user_id: 取り込み先ユーザーの内部 ID
+        source: アップロードを展開したディレクトリまたは zip ファイル
+        cleanup: 完了後に source を削除するか
+    """
+    db = SessionLocal()
+    try:
+        total = count_sources(source)
+        update_import_job(job_id, "running", ImportStats(total=total))
+        stats = import_markdown(
+            db,
+            user_id,
+            iter_sources(source),
+            total=total,
+            on_progress=lambda s: update_import_job(job_id, "running", s),
+        )
+        update_import_job(job_id, "completed", stats)
+        logger.info(
+            f"Import completed: job_id={job_id}, imported={stats.imported}, "
+            f"duplicates={stats.duplicates}, failed={stats.failed}"
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Import failed: job_id={job_id}: {type(e).__name__}", exc_info=True)
+        update_import_job(job_id, "failed", error=type(e).__name__)
+    finally:
+        db.close()
+        if cleanup:
+            _remove(source)
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv: list[str] | None = None) -> None:
+    from app.db.models.user import User
+
+    parser = argparse.ArgumentParser(description="Markdown ディレクトリ / zip をインポートする")
+    parser.add_argument("source", type=Path, help="Markdown ディレクトリまたは zip ファイル")
+    parser.add_argument("--email", required=True, help="取り込み先ユーザーのメールアドレス")
+    parser.add_argument("--workers", type=int, default=None, help="パースに使うプロセス数")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_id = db.scalar(select(User.id).where(User.email == args.email, User.is_valid))
+        if user_id is None:
+            parser.error(f"user not found: {args.email}")
+
+        total = count_sources(args.source)
+        stats = import_markdown(
+            db,
+            user_id,
+            iter_sources(args.source),
+            total=total,
+            max_workers=args.workers,
+            on_progress=lambda s: print(f"\r{s.processed}/{s.total} files", end="", flush=True),
+        )
+        print()
+        print(f"imported={stats.imported} duplicates={stats.duplicates} failed={stats.failed}")
+        for error in stats.errors:
+            print(f"  ✗ {error}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Markdown → HTML レンダリングサービス
+
+- markdown-it-py（CommonMark + table / strikethrough）でレンダリングする
+- 生 HTML は無効化（エスケープ）し、javascript: 等の危険な URL はリンク化しない
+- レンダリング結果は本文の SHA-256 をキーに、プロセス内 LRU と Redis の 2 段でキャッシュする
+  （同じ本文は二度レンダリングしない）
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import cache
+from typing import TYPE_CHECKING
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import redis_manager
+from app.jobs import enqueue
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+RENDER_CACHE_PREFIX = "md_html:"
+
+
+@cache
+def _markdown() -> "MarkdownIt":
+    """パーサー（初回のレンダリング時に markdown-it を import して作成する）"""
+    from markdown_it import MarkdownIt
+
+    return MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+
+class LruCache:
+    """スレッドセーフな固定長 LRU キャッシュ（文字列キー → 文字列値）"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+_local_cache = LruCache(settings.RENDER_LRU_SIZE)
+
+
+def content_hash(content: str) -> str:
+    """本文の SHA-256（16 進文字列）"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def render_markdown(content: str) -> str:
+    """キャッシュを使わずに Markdown を HTML にレンダリングする"""
+    return _markdown().render(content)
+
+
+def render_html(content: str) -> tuple[str, str]:
+    """
+    本文をレンダリングする（LRU → Redis → レンダリングの順に参照）
+
+    Args:
+        content: Markdown 本文
+
+    Returns:
+        (content_hash, html) のタプル
+    """
+    key = content_hash(content)
+
+    html = _local_cache.get(key)
+    if html is not None:
+        return key, html
+
+    try:
+        html = redis_manager.redis_client.get(RENDER_CACHE_PREFIX + key)
+    except redis.RedisError as e:
+        # キャッシュ障害時はレンダリングを継続する
+        logger.warning(f"Render cache read failed: {type(e).__name__}")
+        html = None
+
+    if html is None:
+        html = render_markdown(content)
+        try:
+            redis_manager.redis_client.set(
+                RENDER_CACHE_PREFIX + key, html, ex=settings.RENDER_CACHE_TTL_SECONDS
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Render cache write failed: {type(e).__name__}")
+
+    _local_cache.set(key, html)
+    return key, html
+
+
+def render_many(contents: Iterable[str]) -> dict[str, str]:
+    """
+    複数の本文をまとめてレンダリングする（キャッシュ済みのものは再利用）
+
+    Redis へは MGET 1 回 + パイプライン SET 1 回でアクセスする。
+
+    Args:
+        contents: Markdown 本文のイテラブル
+
+    Returns:
+        content_hash → html の dict
+    """
+    results: dict[str, str] = {}
+    pending: dict[str, str] = {}
+    for content in contents:
+        key = content_hash(content)
+        if key in results or key in pending:
+            continue
+        html = _local_cache.get(key)
+        if html is None:
+            pending[key] = content
+        else:
+            results[key] = html
+    if not pending:
+        return results
+
+    keys = list(pending)
+    try:
+        cached = redis_manager.redis_client.mget([RENDER_CACHE_PREFIX + k for k in keys])
+    except redis.RedisError as e:
+        logger.warning(f"Render cache read failed: {type(e).__name__}")
+        cached = [None] * len(keys)
+
+    rendered: dict[str, str] = {}
+    for key, html in zip(keys, cached):
+        if html is None:
+            html = render_markdown(pending[key])
+            rendered[key] = html
+        _local_cache.set(key, html)
+        results[key] = html
+
+    if rendered:
+        try:
+            pipe = redis_manager.redis_client.pipeline(transaction=False)
+            for key, html in rendered.items():
+                pipe.set(RENDER_CACHE_PREFIX + key, html, ex=settings.RENDER_CACHE_TTL_SECONDS)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Render cache write failed: {type(e).__name__}")
+
+    return results
+
+
+def prerender(contents: Iterable[str]) -> None:
+    """本文をまとめてレンダリングしてキャッシュに載せる（ジョブ markdown.prerender の本体）"""
+    render_many(contents)
+
+
+def schedule_prerender(article_ids: Iterable[int]) -> None:
+    """
+    記事保存後の事前レンダリングをジョブキューに登録する
+
+    事前レンダリングはキャッシュを温めるだけなので、登録に失敗しても保存処理は失敗させない。
+    """
+    try:
+        enqueue("markdown.prerender", {"article_ids": list(article_ids)})
+    except redis.RedisError as e:
+        logger.warning(f"Prerender enqueue failed: {type(e).__name__}")
@@ -0,0 +1,272 @@
+"""
+トランザクショナルアウトボックス
+
+記事・タグ・フォルダの変更に伴う Redis 側の処理（タグインデックスの更新、事前レンダリングの
+ジョブ登録など）を、書き込みリクエストの中で同期的に行わず、変更と同じトランザクションで
+outbox_events に記録しておき、リレーがコミット後にまとめて配信する。
+
+- record_event: イベントを記録する（コミットは呼び出し側。ロールバックされればイベントも残らない）
+- リレー: 未配信のイベントを id 順に FOR UPDATE SKIP LOCKED で取り出し、
+  1. すべてのイベントを Redis Stream（outbox:events）に 1 パイプラインで XADD する
+  2. 登録されたハンドラーを、対象のイベントを id 順にまとめて 1 回ずつ呼び出す
+  3. 成功したイベントを削除し、失敗したものは attempts を増やして次回に再配信する
+
+配信は at-least-once（失敗時や、削除前にリレーが落ちた場合は同じイベントを再配信する）。
+ハンドラー・ストリームの購読側は冪等に処理すること。
+
+リレーの起動:
+    python -m app.services.outbox [--once]
+"""
+
+import argparse
+import json
+import signal
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import logger, setup_logging
+from app.core.redis_manager import redis_manager
+from app.db.models.outbox_event import OutboxEvent
+from app.db.session import SessionLocal
+from app.services.markdown_render import schedule_prerender
+from app.services.tag_index import add_tag_links, remove_tag_links
+
+OUTBOX_STREAM = "outbox:events"
+
+# イベント種別
+ARTICLE_CREATED = "article.created"  # {"article_ids": [...]}
+ARTICLE_UPDATED = "article.updated"  # {"article_ids": [...]}
+ARTICLE_DELETED = "article.deleted"  # {"article_ids": [...]}
+ARTICLE_IMPORTED = (
+    "article.imported"  # {"article_ids": [...], "added": [[article_id, tag_id], ...]}
+)
+ARTICLE_TAGS_CHANGED = (
+    "article.tags_changed"  # {"added": [[article_id, tag_id], ...], "removed": ...}
+)
+FOLDER_CREATED = "folder.created"  # {"folder_ids": [...]}
+FOLDER_MOVED = "folder.moved"  # {"folder_id": ..., "parent_id": ...}
+FOLDER_DELETED = "folder.deleted"  # {"folder_id": ...}
+
+Handler = Callable[[Sequence[OutboxEvent]], None]
+
+_handlers: dict[str, list[Handler]] = {}
+
+
+def handles(*event_types: str) -> Callable[[Handler], Handler]:
+    """イベント種別のハンドラーを登録するデコレーター"""
+
+    def decorator(handler: Handler) -> Handler:
+        for event_type in event_types:
+            _handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    return decorator
+
+
+# ==================================================
+# 記録
+# ==================================================
+def record_event(db: Session, user_id: int, event_type: str, payload: dict[str, Any]) -> None:
+    """イベントを記録する（呼び出し側のトランザクションでコミットされる）"""
+    db.execute(insert(OutboxEvent).values(user_id=user_id, event_type=event_type, payload=payload))
+
+
+# ==================================================
+# ハンドラー
+# ==================================================
+@handles(ARTICLE_CREATED, ARTICLE_UPDATED)
+def _prerender(events: Sequence[OutboxEvent]) -> None:
+    """保存された記事の事前レンダリングを 1 ジョブにまとめて登録する"""
+    article_ids = {article_id for event in events for article_id in event.payload["article_ids"]}
+    schedule_prerender(sorted(article_ids))
+
+
+@handles(ARTICLE_TAGS_CHANGED, ARTICLE_IMPORTED)
+def _update_tag_index(events: Sequence[OutboxEvent]) -> None:
+    """
+    タグリンクの追加・削除をユーザーごとにまとめてタグインデックスへ反映する
+
+    同じリンクの削除と追加が同じバッチに含まれる場合に備え、イベントを id 順に適用して
+    (article_id, tag_id) ごとの最終状態に畳み込んでから書き込む。
+    """
+    linked: dict[int, dict[tuple[int, int], bool]] = {}
+    for event in sorted(events, key=lambda event: event.id):
+        links = linked.setdefault(event.user_id, {})
+        for article_id, tag_id in event.payload.get("added", []):
+            links[(article_id, tag_id)] = True
+        for article_id, tag_id in event.payload.get("removed", []):
+            links[(article_id, tag_id)] = False
+    for user_id, links in linked.items():
+        add_tag_links(user_id, [link for link, present in links.items() if present])
+        remove_tag_links(user_id, [link for link, present in links.items() if not present])
+
+
+# ==================================================
+# リレー
+# ==================================================
+def _publish(events: Sequence[OutboxEvent]) -> None:
+    """イベントを Redis Stream に 1 パイプラインで配信する"""
+    pipe = redis_manager.redis_client.pipeline(transaction=False)
+    for event in events:
+        pipe.xadd(
+            OUTBOX_STREAM,
+            {
+                "event_id": str(event.id),
+                "event_type": event.event_type,
+                "user_id": str(event.user_id),
+                "payload": json.dumps(event.payload, ensure_ascii=False),
+                "created_at": event.created_at.isoformat(),
+            },
+            maxlen=settings.OUTBOX_STREAM_MAX_LENGTH,
+            approximate=True,
+        )
+    pipe.execute()
+
+
+def _dispatch(events: Sequence[OutboxEvent]) -> dict[int, str]:
+    """
+    ハンドラーごとに、対象のイベントを id 順のまま 1 回で渡して呼び出す
+
+    複数の種別を扱うハンドラーにも種別をまたいだ順序が保たれる。
+
+    Returns:
+        失敗したイベントの id → エラー内容
+    """
+    grouped: dict[Handler, list[OutboxEvent]] = {}
+    for event in events:
+        for handler in _handlers.get(event.event_type, []):
+            grouped.setdefault(handler, []).append(event)
+
+    failures: dict[int, str] = {}
+    for handler, group in grouped.items():
+        try:
+            handler(group)
+        except Exception as e:
+            logger.warning(f"Outbox handler failed: {handler.__name__}: {type(e).__name__}: {e}")
+            failures.update((event.id, repr(e)[:1000]) for event in group)
+    return failures
+
+
+def relay_batch(db: Session, batch_size: int = settings.OUTBOX_BATCH_SIZE) -> int:
+    """
+    未配信のイベントを最大 batch_size 件配信する
+
+    FOR UPDATE SKIP LOCKED で取り出すため、複数のリレーを同時に動かしても同じイベントを
+    同時に配信しない。
+
+    Returns:
+        取り出したイベント数
+    """
+    events = db.scalars(
+        select(OutboxEvent)
+        .where(OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not events:
+        db.rollback()
+        return 0
+
+    try:
+        _publish(events)
+        failures = _dispatch(events)
+    except Exception as e:
+        logger.warning(f"Outbox publish failed: {type(e).__name__}: {e}")
+        failures = {event.id: repr(e)[:1000] for event in events}
+
+    done = [event.id for event in events if event.id not in failures]
+    for event in events:
+        if event.id in failures:
+            event.attempts += 1
+            event.last_error = failures[event.id]
+    if done:
+        db.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(done))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    logger.debug(f"Outbox relayed: published={len(done)} failed={len(failures)}")
+    return len(events)
+
+
+def run_relay(
+    poll_interval: float = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    batch_size: int = settings.OUTBOX_BATCH_SIZE,
+    once: bool = False,
+) -> None:
+    """
+    リレーのメインループ
+
+    バッチが満杯の間は待たずに続けて取り出し、未配信がなくなったら poll_interval 待つ。
+    SIGINT / SIGTERM を受けたら処理中のバッチを終えてから停止する。
+    """
+    stopping = False
+
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    redis_manager.wait_until_ready(settings.REDIS_STARTUP_TIMEOUT_SECONDS)
+    db = SessionLocal()
+    try:
+        while not stopping:
+            try:
+                count = relay_batch(db, batch_size)
+            except Exception:
+                db.rollback()
+                logger.exception("Outbox relay failed")
+                count = 0
+            if once and count < batch_size:
+                break
+            if count < batch_size:
+                time.sleep(poll_interval)
+    finally:
+        db.close()
+
+
+def pending_counts(db: Session) -> Iterable[tuple[str, int, int]]:
+    """未配信イベントの件数を (種別, 件数, うち配信を諦めた件数) で返す"""
+    return db.execute(
+        select(
+            OutboxEvent.event_type,
+            func.count(),
+            func.count().filter(OutboxEvent.attempts >= settings.OUTBOX_MAX_ATTEMPTS),
+        )
+        .group_by(OutboxEvent.event_type)
+        .order_by(OutboxEvent.event_type)
+    ).tuples()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="アウトボックスのイベントを Redis へ配信する")
+    parser.add_argument("--once", action="store_true", help="未配信のイベントを配信して終了")
+    parser.add_argument("--stats", action="store_true", help="未配信イベントの件数を表示して終了")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.stats:
+        db = SessionLocal()
+        try:
+            for event_type, count, dead in pending_counts(db):
+                print(f"{event_type}: pending={count} dead={dead}")
+        finally:
+            db.close()
+        return
+
+    run_relay(batch_size=args.batch_size, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
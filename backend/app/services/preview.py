@@ -0,0 +1,271 @@
+"""
+エディタ用のインクリメンタルプレビュー
+
+本文をトップレベルのブロック（空行区切り）に分割し、ブロック単位でレンダリング結果を
+キャッシュする。編集時はベース版との差分（テキスト編集操作）だけを受け取り、
+変更されたブロックのみをレンダリングして HTML 断片として返す。
+
+ブロック分割の規則:
+- 空行の直後にある、インデントされていない行から新しいブロックを開始する
+- フェンスコードブロック（``` / ~~~）の内側では分割しない
+- インデントされた行（リストの継続段落など）は直前のブロックに含める
+
+ベース版はユーザー・記事ごとに 1 つの Redis キー（preview_doc:{user_id}:{article_id}）に、
+本文・ブロックのハッシュ・ブロックの開始位置とともに上書き保存する。編集時は編集範囲にかかる
+ブロックのみを分割し直してハッシュを計算する（本文の長さによらず、編集の大きさに比例した処理量）。
+
+制約:
+- 参照リンク定義（[id]: url）は同じブロック内でのみ解決される
+"""
+
+import bisect
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.core.exceptions import ConflictError, ValidationError
+from app.core.redis_manager import redis_manager
+from app.services.markdown_render import content_hash, render_many
+
+PREVIEW_DOC_PREFIX = "preview_doc:"
+
+# ベース版の保持期間（編集セッション中のみ使用）
+PREVIEW_DOC_TTL_SECONDS = 3600
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """ベース版に対するテキスト置換（start〜end を text に置き換える）"""
+
+    start: int
+    end: int
+    text: str
+
+
+@dataclass(frozen=True)
+class PreviewResult:
+    """プレビュー結果"""
+
+    content_hash: str
+    blocks: list[str]
+    fragments: dict[str, str]
+
+
+@dataclass(frozen=True)
+class _Doc:
+    """保存するベース版（本文・ブロックのハッシュ・ブロックの開始位置）"""
+
+    content: str
+    block_hashes: list[str]
+    offsets: list[int]
+
+
+def _iter_blocks(content: str, start: int = 0) -> Iterator[tuple[int, str]]:
+    """
+    content の start 以降をブロックに分割し、(開始位置, ブロック) を順に返す（行単位の 1 パス走査）
+
+    ブロックの境界ではフェンスの外側にいるため、start にブロックの開始位置を渡せば
+    先頭から走査した場合と同じ分割になる。
+    """
+    fence: str | None = None
+    previous_blank = False
+    block_start = start
+    has_lines = False
+    position = start
+
+    while True:
+        newline = content.find("\n", position)
+        line = content[position:] if newline == -1 else content[position:newline]
+        stripped = line.strip()
+
+        if fence is None:
+            if has_lines and previous_blank and stripped and not line[:1].isspace():
+                yield block_start, content[block_start : position - 1]
+                block_start = position
+            match = _FENCE.match(line)
+            if match:
+                fence = match.group(1)
+        elif stripped.startswith(fence[0] * len(fence)) and not stripped.strip(fence[0]):
+            fence = None
+
+        has_lines = True
+        previous_blank = not stripped
+        if newline == -1:
+            break
+        position = newline + 1
+
+    yield block_start, content[block_start:]
+
+
+def split_blocks(content: str) -> list[str]:
+    """本文をトップレベルのブロックに分割する"""
+    return [block for _, block in _iter_blocks(content)]
+
+
+def apply_edits(base: str, edits: list[TextEdit]) -> str:
+    """
+    ベース版にテキスト編集を適用する
+
+    オフセットはすべてベース版に対する位置（Unicode コードポイント単位）で、
+    範囲は互いに重ならないこと。
+
+    Raises:
+        ValidationError: 範囲が不正、または重なっている場合
+    """
+    ordered = sorted(edits, key=lambda e: e.start)
+    position = 0
+    parts: list[str] = []
+    for edit in ordered:
+        if edit.start < position or edit.end < edit.start or edit.end > len(base):
+            raise ValidationError(
+                "編集範囲が不正です",
+                details={"start": edit.start, "end": edit.end, "length": len(base)},
+            )
+        parts.append(base[position : edit.start])
+        parts.append(edit.text)
+        position = edit.end
+    parts.append(base[position:])
+    return "".join(parts)
+
+
+def _doc_key(user_id: int, doc_id: UUID | None) -> str:
+    return f"{PREVIEW_DOC_PREFIX}{user_id}:{doc_id or 'new'}"
+
+
+def _load_base(user_id: int, doc_id: UUID | None, base_hash: str) -> _Doc:
+    stored_hash, content, block_hashes, offsets = redis_manager.redis_client.hmget(
+        _doc_key(user_id, doc_id), ["hash", "content", "blocks", "offsets"]
+    )
+    if content is None or stored_hash != base_hash:
+        raise ConflictError(
+            "プレビューのベース版が見つかりません。本文全体を送信してください",
+            details={"base_hash": base_hash},
+        )
+    return _Doc(
+        content=content,
+        block_hashes=block_hashes.split(","),
+        offsets=[int(offset) for offset in offsets.split(",")],
+    )
+
+
+def _store_doc(user_id: int, doc_id: UUID | None, doc_hash: str, doc: _Doc) -> None:
+    """ベース版を保存する（同じ記事の直前のベース版は上書きされる）"""
+    key = _doc_key(user_id, doc_id)
+    pipe = redis_manager.redis_client.pipeline(transaction=False)
+    pipe.hset(
+        key,
+        mapping={
+            "hash": doc_hash,
+            "content": doc.content,
+            "blocks": ",".join(doc.block_hashes),
+            "offsets": ",".join(map(str, doc.offsets)),
+        },
+    )
+    pipe.expire(key, PREVIEW_DOC_TTL_SECONDS)
+    pipe.execute()
+
+
+def _split_doc(content: str) -> tuple[_Doc, list[tuple[str, str]]]:
+    """本文全体を分割する。(ベース版, [(ブロックハッシュ, ブロック)]) を返す"""
+    offsets: list[int] = []
+    blocks: list[tuple[str, str]] = []
+    for offset, block in _iter_blocks(content):
+        offsets.append(offset)
+        blocks.append((content_hash(block), block))
+    return _Doc(content, [h for h, _ in blocks], offsets), blocks
+
+
+def _resplit_doc(
+    base: _Doc, content: str, edits: list[TextEdit]
+) -> tuple[_Doc, list[tuple[str, str]]]:
+    """
+    編集範囲にかかるブロックのみを分割し直す。(適用後の版, [(分割し直したブロックのハッシュ, ブロック)]) を返す
+
+    編集の直前のブロック（先頭行のインデントが変わると結合されうる）から走査を始め、
+    編集範囲より後ろでベース版と同じ位置（差分の長さだけずらした位置）のブロック境界に達したら止める。
+    以降の本文はベース版と同じため、ブロックのハッシュ・位置はベース版のものを引き継ぐ。
+    """
+    if not edits:
+        return base, []
+    edit_start = min(edit.start for edit in edits)
+    edit_end = max(edit.end for edit in edits)
+    delta = len(content) - len(base.content)
+
+    first = max(bisect.bisect_right(base.offsets, edit_start) - 2, 0)
+    offsets = base.offsets[:first]
+    block_hashes = base.block_hashes[:first]
+    blocks: list[tuple[str, str]] = []
+    for offset, block in _iter_blocks(content, base.offsets[first]):
+        if blocks and offset >= edit_end + delta:
+            index = bisect.bisect_left(base.offsets, offset - delta)
+            if index < len(base.offsets) and base.offsets[index] == offset - delta:
+                offsets.extend(base_offset + delta for base_offset in base.offsets[index:])
+                block_hashes.extend(base.block_hashes[index:])
+                break
+        block_hash = content_hash(block)
+        offsets.append(offset)
+        block_hashes.append(block_hash)
+        blocks.append((block_hash, block))
+    return _Doc(content, block_hashes, offsets), blocks
+
+
+def build_preview(
+    user_id: int,
+    content: str | None = None,
+    base_hash: str | None = None,
+    edits: list[TextEdit] | None = None,
+    expected_hash: str | None = None,
+    doc_id: UUID | None = None,
+) -> PreviewResult:
+    """
+    プレビューを生成する
+
+    - base_hash なし: content 全体をブロック分割し、全ブロックの HTML を返す
+    - base_hash あり: ベース版に edits を適用し、編集範囲にかかるブロックのみ分割し直して、
+      ベース版に存在しないブロックの HTML のみ返す
+
+    ベース版はユーザー・記事ごとに 1 件だけ保持し、新しい版で上書きする。
+
+    Args:
+        user_id: ユーザーの内部 ID
+        content: 本文全体（初回）
+        base_hash: クライアントが保持しているベース版のハッシュ
+        edits: ベース版に対する編集操作
+        expected_hash: 適用後の本文ハッシュ（指定時は一致を検証する）
+        doc_id: 編集中の記事の public_id（新規作成中は None）
+
+    Raises:
+        ConflictError: ベース版が見つからない（他の版で上書きされた場合を含む）、
+            または適用後のハッシュが一致しない場合
+    """
+    base: _Doc | None = None
+    if base_hash is not None:
+        base = _load_base(user_id, doc_id, base_hash)
+        content = apply_edits(base.content, edits or [])
+    elif content is None:
+        raise ValidationError("content または base_hash のいずれかが必要です")
+
+    doc_hash = content_hash(content)
+    if expected_hash is not None and expected_hash != doc_hash:
+        raise ConflictError(
+            "編集適用後の本文が一致しません。本文全体を送信してください",
+            details={"expected_hash": expected_hash, "actual_hash": doc_hash},
+        )
+
+    if base is None:
+        doc, blocks = _split_doc(content)
+        known_blocks: set[str] = set()
+    else:
+        doc, blocks = _resplit_doc(base, content, edits or [])
+        known_blocks = set(base.block_hashes)
+    fragments = render_many(block for h, block in blocks if h not in known_blocks)
+
+    if doc_hash != base_hash:
+        _store_doc(user_id, doc_id, doc_hash, doc)
+    else:
+        redis_manager.redis_client.expire(_doc_key(user_id, doc_id), PREVIEW_DOC_TTL_SECONDS)
+
+    return PreviewResult(content_hash=doc_hash, blocks=doc.block_hashes, fragments=fragments)
@@ -0,0 +1,321 @@
+"""
+タグ → 記事のビットマップインデックス（Redis）
+
+複数タグの AND / OR 検索を article_tag_links の JOIN + GROUP BY / HAVING ではなく、
+ユーザーごと・タグごとのビットマップの積集合 / 和集合で解決する。
+
+Redis のキー構成:
+- tag_index:{user_id}            → {base}（Hash、インデックス構築済みの印を兼ねる）
+- tag_index:{user_id}:{tag_id}   → ビットマップ（String、SETBIT / GET）
+- tag_index:{user_id}:building   → 構築中の印（String、構築ごとのトークン）
+- tag_index:{user_id}:pending    → 構築中に届いた更新（List、"記事 ID:タグ ID:値"）
+
+ビットの位置は「記事 ID - base」。base は構築時点でのユーザーの最小の記事 ID で、
+記事 ID は単調増加するため、以降に作成される記事も必ず base 以上になる。
+
+- 構築: 初回検索時（またはキャッシュ切れ時）に、リンクを 1 クエリで読み出して一括 SET する。
+  DB を読む前に構築中の印を立て、その間の更新を pending に溜めておき、読み出した内容に
+  順に適用してから保存する（読み出しと保存の間の更新を取りこぼさない）
+- 更新: タグリンクの追加・削除時に SETBIT で該当ビットのみ更新する（未構築なら何もしない）。
+  構築中であれば pending にも追加する
+- 検索: 対象タグのビットマップを MGET し、Python の int 同士の & / | で集合演算する
+
+ビットマップは Redis の SETBIT と同じく各バイトの上位ビットから順に並ぶ。
+"""
+
+import uuid
+from collections.abc import Iterable, Sequence
+from functools import cache
+from typing import Literal
+
+import redis
+from redis.commands.core import Script
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis_manager import create_redis_client
+from app.db.models.article import Article
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.tag import Tag
+
+TAG_INDEX_PREFIX = "tag_index:"
+
+# インデックスの保持期間（参照・更新のたびに延長しない。切れたら再構築する）
+TAG_INDEX_TTL_SECONDS = 24 * 3600
+
+# 構築中の印・pending の保持期間（構築が途中で失敗しても、この時間が過ぎれば更新を溜めなくなる）
+TAG_INDEX_BUILD_TTL_SECONDS = 300
+
+# 構築の保存時に pending が増え続けて競合した場合の再試行回数
+_BUILD_MAX_ATTEMPTS = 5
+
+# 構築済みの場合のみ SETBIT する（未構築のまま部分的なビットマップを作らない）
+# 構築中の場合は pending にも追加する（構築の保存時に読み出した内容へ順に適用する）
+# KEYS[1]: メタ情報のキー、KEYS[2]: 構築中の印のキー、KEYS[3]: pending のキー、
+# KEYS[4..]: ビットマップのキー
+# ARGV[1]: TTL、ARGV[2]: 構築中の印・pending の TTL、
+# ARGV[3..]: (記事 ID, タグ ID, 値) の組を KEYS[4..] の順に並べたもの
+_UPDATE_SCRIPT = """
+local building = redis.call('EXISTS', KEYS[2]) == 1
+if building then
+    for i = 4, #KEYS do
+        local offset = (i - 4) * 3 + 3
+        redis.call('RPUSH', KEYS[3], ARGV[offset] .. ':' .. ARGV[offset + 1] .. ':' .. ARGV[offset + 2])
+    end
+    redis.call('EXPIRE', KEYS[3], ARGV[2])
+end
+local base = redis.call('HGET', KEYS[1], 'base')
+if not base then
+    return building and 1 or 0
+end
+base = tonumber(base)
+for i = 4, #KEYS do
+    local offset = (i - 4) * 3 + 3
+    local article_id = tonumber(ARGV[offset])
+    if article_id >= base then
+        redis.call('SETBIT', KEYS[i], article_id - base, ARGV[offset + 2])
+        redis.call('EXPIRE', KEYS[i], ARGV[1])
+    end
+end
+return 1
+"""
+
+# バイト値 → 立っているビットの位置（上位ビットから 0, 1, ...）
+_BIT_POSITIONS = [tuple(i for i in range(8) if value & (0x80 >> i)) for value in range(256)]
+
+
+@cache
+def _client() -> redis.Redis:
+    """ビットマップはバイナリのまま扱うため、decode_responses なしのクライアントを使う"""
+    return create_redis_client(settings.REDIS_URL, decode_responses=False)
+
+
+def _meta_key(user_id: int) -> str:
+    return f"{TAG_INDEX_PREFIX}{user_id}"
+
+
+def _bitmap_key(user_id: int, tag_id: int) -> str:
+    return f"{TAG_INDEX_PREFIX}{user_id}:{tag_id}"
+
+
+def _building_key(user_id: int) -> str:
+    return f"{TAG_INDEX_PREFIX}{user_id}:building"
+
+
+def _pending_key(user_id: int) -> str:
+    return f"{TAG_INDEX_PREFIX}{user_id}:pending"
+
+
+@cache
+def _update_script() -> Script:
+    return _client().register_script(_UPDATE_SCRIPT)
+
+
+# ==================================================
+# ビットマップ演算（Redis 非依存）
+# ==================================================
+def encode_bitmap(offsets: Iterable[int]) -> bytes:
+    """ビット位置の集合を Redis のビットマップ形式に変換する"""
+    offsets = list(offsets)
+    if not offsets:
+        return b""
+    data = bytearray(max(offsets) // 8 + 1)
+    for offset in offsets:
+        data[offset // 8] |= 0x80 >> (offset % 8)
+    return bytes(data)
+
+
+def decode_bitmap(data: bytes) -> list[int]:
+    """Redis のビットマップ形式からビット位置を昇順で取り出す"""
+    offsets: list[int] = []
+    for index, value in enumerate(data):
+        if value:
+            base = index * 8
+            offsets.extend(base + bit for bit in _BIT_POSITIONS[value])
+    return offsets
+
+
+def combine_bitmaps(bitmaps: Sequence[bytes], mode: Literal["and", "or"]) -> bytes:
+    """
+    ビットマップの積集合（and）/ 和集合（or）を求める
+
+    長さを揃えたうえで int に変換し、多倍長整数の & / | で一括演算する。
+    """
+    if not bitmaps:
+        return b""
+    length = max(len(bitmap) for bitmap in bitmaps)
+    values = [int.from_bytes(bitmap.ljust(length, b"\0"), "big") for bitmap in bitmaps]
+
+    result = values[0]
+    for value in values[1:]:
+        result = result & value if mode == "and" else result | value
+    return result.to_bytes(length, "big")
+
+
+# ==================================================
+# 構築・更新
+# ==================================================
+def build_tag_index(db: Session, user_id: int) -> int | None:
+    """
+    ユーザーのタグインデックスを DB から構築して Redis に保存する
+
+    Returns:
+        base（記事がなければ None）
+    """
+    built = _build(db, user_id)
+    return built[0] if built else None
+
+
+def _build(db: Session, user_id: int) -> tuple[int, dict[int, bytes]] | None:
+    """
+    インデックスを構築し、(base, タグ ID → ビットマップ) を返す
+
+    DB を読む前に構築中の印を立て、保存時に pending（読み出し以降に届いた更新）を
+    読み出した内容へ順に適用する。更新はリンクの最終状態を SETBIT するだけなので、
+    読み出しに含まれていた更新を重ねて適用しても結果は変わらない。
+    保存は WATCH + MULTI で行い、その間に pending・メタ情報・構築中の印が変われば読み直す。
+    後から始まった構築に印を上書きされた場合・インデックスが破棄された場合は保存しない
+    （読み出した内容は呼び出し側の検索にのみ使う）。
+    """
+    client = _client()
+    token = uuid.uuid4().hex
+    # pending を空にして印を立てる（間に届いた更新を消さないよう 1 トランザクションで行う）
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(_pending_key(user_id))
+    pipe.set(_building_key(user_id), token, ex=TAG_INDEX_BUILD_TTL_SECONDS)
+    pipe.execute()
+
+    base = db.scalar(select(func.min(Article.id)).where(Article.user_id == user_id))
+    if base is None:
+        client.delete(_building_key(user_id))
+        return None
+
+    rows = db.execute(
+        select(ArticleTagLink.tag_id, ArticleTagLink.article_id)
+        .join(Article, Article.id == ArticleTagLink.article_id)
+        .where(Article.user_id == user_id, Article.is_valid, ArticleTagLink.is_valid)
+    ).all()
+    snapshot: dict[int, set[int]] = {
+        tag_id: set() for tag_id in db.scalars(select(Tag.id).where(Tag.user_id == user_id))
+    }
+    for tag_id, article_id in rows:
+        snapshot.setdefault(tag_id, set()).add(article_id - base)
+
+    keys = (_meta_key(user_id), _building_key(user_id), _pending_key(user_id))
+    with client.pipeline(transaction=True) as pipe:
+        for _ in range(_BUILD_MAX_ATTEMPTS):
+            try:
+                pipe.watch(*keys)
+                if pipe.get(_building_key(user_id)) != token.encode():
+                    pipe.reset()
+                    logger.debug(f"Tag index build superseded: user_id={user_id}")
+                    return base, _encode_offsets(snapshot)
+
+                offsets = {tag_id: set(values) for tag_id, values in snapshot.items()}
+                for entry in pipe.lrange(_pending_key(user_id), 0, -1):  # type: ignore[union-attr]
+                    article_id, tag_id, value = map(int, entry.split(b":"))
+                    if article_id >= base:
+                        tag_offsets = offsets.setdefault(tag_id, set())
+                        if value:
+                            tag_offsets.add(article_id - base)
+                        else:
+                            tag_offsets.discard(article_id - base)
+                bitmaps = _encode_offsets(offsets)
+
+                pipe.multi()
+                for tag_id, bitmap in bitmaps.items():
+                    key = _bitmap_key(user_id, tag_id)
+                    if bitmap:
+                        pipe.set(key, bitmap, ex=TAG_INDEX_TTL_SECONDS)
+                    else:
+                        pipe.delete(key)
+                # メタ情報は最後に書き込む（存在すれば全ビットマップが揃っている）
+                pipe.hset(_meta_key(user_id), "base", str(base))
+                pipe.expire(_meta_key(user_id), TAG_INDEX_TTL_SECONDS)
+                pipe.delete(_building_key(user_id), _pending_key(user_id))
+                pipe.execute()
+            except redis.WatchError:
+                continue
+
+            logger.debug(
+                f"Tag index built: user_id={user_id} tags={len(bitmaps)} links={len(rows)}"
+            )
+            return base, bitmaps
+
+    # 更新が続いて保存できなかった（構築中の印は TTL で消え、次回の検索で再構築される）
+    logger.warning(
+        f"Tag index build gave up after {_BUILD_MAX_ATTEMPTS} attempts: user_id={user_id}"
+    )
+    return base, bitmaps
+
+
+def _encode_offsets(offsets: dict[int, set[int]]) -> dict[int, bytes]:
+    return {tag_id: encode_bitmap(values) for tag_id, values in offsets.items()}
+
+
+def _update_links(user_id: int, links: Iterable[tuple[int, int]], value: int) -> None:
+    links = list(links)
+    if not links:
+        return
+    keys = [_meta_key(user_id), _building_key(user_id), _pending_key(user_id)]
+    keys.extend(_bitmap_key(user_id, tag_id) for _, tag_id in links)
+    args: list[int] = [TAG_INDEX_TTL_SECONDS, TAG_INDEX_BUILD_TTL_SECONDS]
+    for article_id, tag_id in links:
+        args.extend((article_id, tag_id, value))
+    _update_script()(keys=keys, args=args)
+
+
+def add_tag_links(user_id: int, links: Iterable[tuple[int, int]]) -> None:
+    """タグリンクの追加をインデックスに反映する（links は (article_id, tag_id)）"""
+    _update_links(user_id, links, 1)
+
+
+def remove_tag_links(user_id: int, links: Iterable[tuple[int, int]]) -> None:
+    """タグリンクの削除をインデックスに反映する（links は (article_id, tag_id)）"""
+    _update_links(user_id, links, 0)
+
+
+def invalidate_tag_index(user_id: int) -> None:
+    """インデックスを破棄する（次回の検索時に再構築される。構築中のものも保存させない）"""
+    _client().delete(_meta_key(user_id), _building_key(user_id), _pending_key(user_id))
+
+
+# ==================================================
+# 検索
+# ==================================================
+def find_article_ids(
+    db: Session, user_id: int, tag_names: Sequence[str], mode: Literal["and", "or"] = "and"
+) -> list[int]:
+    """
+    指定タグを（and: すべて / or: いずれか）持つ記事 ID を昇順で返す
+
+    論理削除済みの記事が含まれることがあるため、呼び出し側で is_valid を確認すること。
+    """
+    tag_ids = list(
+        db.scalars(
+            select(Tag.id).where(Tag.user_id == user_id, Tag.name.in_(set(tag_names)), Tag.is_valid)
+        )
+    )
+    if mode == "and" and len(tag_ids) < len(set(tag_names)):
+        return []
+    if not tag_ids:
+        return []
+
+    pipe = _client().pipeline(transaction=False)
+    pipe.hget(_meta_key(user_id), "base")
+    pipe.mget([_bitmap_key(user_id, tag_id) for tag_id in tag_ids])
+    raw_base, bitmaps = pipe.execute()
+
+    if raw_base is None:
+        built = _build(db, user_id)
+        if built is None:
+            return []
+        base, built_bitmaps = built
+        bitmaps = [built_bitmaps.get(tag_id) for tag_id in tag_ids]
+    else:
+        base = int(raw_base)
+
+    result = combine_bitmaps([bitmap or b"" for bitmap in bitmaps], mode)
+    return [base + offset for offset in decode_bitmap(result)]
@@ -0,0 +1,171 @@
+"""
+タグ利用件数（tag_stats）の増減と再集計
+
+tag_stats.article_count は「そのタグが付いた有効な記事の数」。
+タグリンクの追加・削除、記事の論理削除と同じトランザクションで増減させる（コミットは呼び出し側）。
+
+再集計ジョブ:
+    python -m app.services.tag_stats [--email user@example.com]
+"""
+
+import argparse
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import Row, Select, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.logging import logger
+from app.db.models.article import Article
+from app.db.models.article_tag_link import ArticleTagLink
+from app.db.models.tag import Tag
+from app.db.models.tag_stat import TagStat
+from app.db.session import SessionLocal
+
+# 再集計で 1 回に処理するタグ数
+REBUILD_BATCH_SIZE = 1000
+
+
+def apply_tag_deltas(db: Session, user_id: int, deltas: Mapping[int, int]) -> None:
+    """
+    タグごとの記事数の増減を 1 回の UPSERT で反映する
+
+    Args:
+        deltas: tag_id → 増減数
+    """
+    rows = [
+        {"tag_id": tag_id, "user_id": user_id, "article_count": delta}
+        for tag_id, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(TagStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TagStat.tag_id],
+        set_={
+            "article_count": TagStat.article_count + stmt.excluded.article_count,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def apply_article_removal(db: Session, user_id: int, article_ids: Iterable[int]) -> None:
+    """
+    記事の論理削除に伴い、その記事に付いていたタグの件数を減らす
+
+    削除対象の記事のリンクを tag_id ごとに集計し、1 回の UPDATE ... FROM で反映する。
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return
+
+    removed = (
+        select(ArticleTagLink.tag_id, func.count().label("removed"))
+        .where(ArticleTagLink.article_id.in_(article_ids), ArticleTagLink.is_valid)
+        .group_by(ArticleTagLink.tag_id)
+        .subquery()
+    )
+    db.execute(
+        update(TagStat)
+        .where(TagStat.tag_id == removed.c.tag_id, TagStat.user_id == user_id)
+        .values(
+            article_count=TagStat.article_count - removed.c.removed,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _count_query(tag_ids: list[int]) -> Select[Any]:
+    return (
+        select(ArticleTagLink.tag_id, func.count())
+        .join(Article, Article.id == ArticleTagLink.article_id)
+        .where(ArticleTagLink.tag_id.in_(tag_ids), ArticleTagLink.is_valid, Article.is_valid)
+        .group_by(ArticleTagLink.tag_id)
+    )
+
+
+def rebuild_tag_stats(
+    db: Session, user_id: int | None = None, batch_size: int = REBUILD_BATCH_SIZE
+) -> int:
+    """
+    tag_stats を article_tag_links から再集計する
+
+    タグを id 順のキーセットページングで batch_size 件ずつ集計し、件数を上書きする。
+    バッチごとにコミットするため、大量のタグがあっても長時間ロックを保持しない。
+
+    Returns:
+        再集計したタグ数
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        query = select(Tag.id, Tag.user_id).where(Tag.id > last_id).order_by(Tag.id)
+        if user_id is not None:
+            query = query.where(Tag.user_id == user_id)
+        tags = db.execute(query.limit(batch_size)).all()
+        if not tags:
+            break
+
+        tag_ids = [tag.id for tag in tags]
+        counts = dict(db.execute(_count_query(tag_ids)).tuples())
+        rows = [
+            {"tag_id": tag.id, "user_id": tag.user_id, "article_count": counts.get(tag.id, 0)}
+            for tag in tags
+        ]
+        stmt = pg_insert(TagStat).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TagStat.tag_id],
+                set_={"article_count": stmt.excluded.article_count, "updated_at": func.now()},
+            )
+        )
+        db.commit()
+
+        processed += len(tags)
+        last_id = tag_ids[-1]
+        logger.debug(f"Tag stats rebuilt: {processed} (last_id={last_id})")
+
+    return processed
+
+
+def load_tag_usage(db: Session, user_id: int) -> list[Row[Any]]:
+    """タグごとの記事数（多い順）を tag_stats から取得する"""
+    return list(
+        db.execute(
+            select(Tag.public_id, Tag.name, TagStat.article_count)
+            .join(TagStat, TagStat.tag_id == Tag.id)
+            .where(TagStat.user_id == user_id, TagStat.article_count > 0, Tag.is_valid)
+            .order_by(TagStat.article_count.desc(), Tag.name)
+        ).all()
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.models.user import User
+
+    parser = argparse.ArgumentParser(description="タグ利用件数（tag_stats）を再集計する")
+    parser.add_argument("--email", default=None, help="対象ユーザー（省略時は全ユーザー）")
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_id = None
+        if args.email:
+            user_id = db.scalar(select(User.id).where(User.email == args.email, User.is_valid))
+            if user_id is None:
+                parser.error(f"user not found: {args.email}")
+
+        processed = rebuild_tag_stats(db, user_id, batch_size=args.batch_size)
+        print(f"rebuilt={processed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+記事バージョン履歴（スナップショット + 前方差分）
+
+- VERSION_SNAPSHOT_INTERVAL 件ごとに本文全体のスナップショットを保存する
+- その間のバージョンは直前バージョンからの行単位の差分のみ保存する
+- data はいずれも zlib で圧縮する
+- 任意のバージョンは「直近のスナップショット + 最大 (INTERVAL - 1) 件の差分」から復元できるため、
+  履歴の長さに関わらず復元コストは一定に抑えられる
+
+差分の形式（JSON 配列）:
+- [i, j]   : 直前バージョンの i〜j-1 行目をそのままコピー
+- "text"   : 挿入されたテキスト
+同じ形式を記事本文の差分更新（PATCH /api/articles/{public_id}/content）でも使う。
+"""
+
+import difflib
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.article_version import ArticleVersion
+
+# ==================================================
+# 差分のエンコード / 復元（DB 非依存）
+# ==================================================
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def diff_ops(base: str, target: str) -> list[Any]:
+    """base → target の行単位の前方差分（操作列）"""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+
+    ops: list[Any] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(target_lines[j1:j2]))
+        # delete は何も出力しない
+
+    return ops
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """base → target の行単位の前方差分を圧縮して返す"""
+    ops = diff_ops(base, target)
+    return compress_text(json.dumps(ops, ensure_ascii=False, separators=(",", ":")))
+
+
+def apply_ops(base: str, ops: Sequence[Any]) -> str:
+    """
+    base に差分の操作列（[i, j] / "text"）を適用する
+
+    記事本文の差分更新（クライアントが送る操作列）にも使うため、コピー範囲は base の行の範囲内かつ
+    重ならない昇順であることを検証する（同じ範囲を繰り返しコピーして本文を膨らませることはできない）。
+
+    Raises:
+        ValueError: 操作列が不正な場合
+    """
+    base_lines = base.splitlines(keepends=True)
+    parts: list[str] = []
+    position = 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+            continue
+        start, end = op
+        if not position <= start <= end <= len(base_lines):
+            raise ValueError(f"Invalid copy range: [{start}, {end}]")
+        parts.extend(base_lines[start:end])
+        position = end
+    return "".join(parts)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """base に前方差分を適用する"""
+    return apply_ops(base, json.loads(decompress_text(delta)))
+
+
+def reconstruct(snapshot: bytes, deltas: Sequence[bytes]) -> str:
+    """スナップショットに差分を順に適用して本文を復元する"""
+    content = decompress_text(snapshot)
+    for delta in deltas:
+        content = apply_delta(content, delta)
+    return content
+
+
+def encode_version(
+    content: str, previous_content: str | None, versions_since_snapshot: int
+) -> tuple[bool, bytes]:
+    """
+    保存形式を決めてエンコードする
+
+    以下のいずれかに当てはまる場合はスナップショットとして保存する。
+    - 直前バージョンがない
+    - 直近のスナップショットから VERSION_SNAPSHOT_INTERVAL 件に達した
+    - 差分がスナップショットの半分より大きい（大幅な書き換え）
+
+    Returns:
+        (is_snapshot, data) のタプル
+    """
+    snapshot = compress_text(content)
+    if previous_content is None or versions_since_snapshot >= settings.VERSION_SNAPSHOT_INTERVAL:
+        return True, snapshot
+
+    delta = encode_delta(previous_content, content)
+    if len(delta) * 2 > len(snapshot):
+        return True, snapshot
+    return False, delta
+
+
+# ==================================================
+# DB 操作
+# ==================================================
+
+
+def record_version(
+    db: Session,
+    article_id: int,
+    user_id: int,
+    title: str,
+    content: str,
+    previous: tuple[str, str] | None = None,
+) -> int:
+    """
+    記事の新しいバージョンを追加する（コミットは呼び出し側で行う）
+
+    Args:
+        db: SQLAlchemy セッション
+        article_id: 記事の内部 ID
+        user_id: 操作ユーザーの内部 ID
+        title: 新しいタイトル
+        content: 新しい本文
+        previous: 更新前の (title, content)。新規作成時は None
+
+    Returns:
+        追加したバージョン番号
+    """
+    latest, latest_snapshot = db.execute(
+        select(
+            func.max(ArticleVersion.version_number),
+            func.max(ArticleVersion.version_number).filter(ArticleVersion.is_snapshot),
+        ).where(ArticleVersion.article_id == article_id)
+    ).one()
+
+    audit = {"created_by": user_id, "updated_by": user_id}
+    previous_content = previous[1] if previous else None
+
+    # 履歴導入前から存在する記事は、更新前の状態を起点のスナップショットとして保存する
+    if latest is None and previous is not None:
+        db.add(
+            ArticleVersion(
+                article_id=article_id,
+                version_number=1,
+                title=previous[0],
+                is_snapshot=True,
+                data=compress_text(previous[1]),
+                content_length=len(previous[1]),
+                **audit,
+            )
+        )
+        latest, latest_snapshot = 1, 1
+    elif latest is None:
+        previous_content = None
+
+    version_number = (latest or 0) + 1
+    is_snapshot, data = encode_version(
+        content,
+        previous_content,
+        versions_since_snapshot=version_number - (latest_snapshot or 0),
+    )
+    db.add(
+        ArticleVersion(
+            article_id=article_id,
+            version_number=version_number,
+            title=title,
+            is_snapshot=is_snapshot,
+            data=data,
+            content_length=len(content),
+            **audit,
+        )
+    )
+    return version_number
+
+
+def list_versions(db: Session, article_id: int) -> Sequence[Row[Any]]:
+    """バージョン一覧（新しい順、本文は含まない）"""
+    return db.execute(
+        select(
+            ArticleVersion.version_number,
+            ArticleVersion.title,
+            ArticleVersion.content_length,
+            ArticleVersion.created_at,
+        )
+        .where(ArticleVersion.article_id == article_id, ArticleVersion.is_valid)
+        .order_by(ArticleVersion.version_number.desc())
+    ).all()
+
+
+def load_version(db: Session, article_id: int, version_number: int) -> tuple[str, str] | None:
+    """
+    指定バージョンの (title, content) を復元する
+
+    直近のスナップショットから対象バージョンまでを 1 クエリで取得し、差分を順に適用する。
+
+    Returns:
+        (title, content) のタプル。バージョンが存在しなければ None
+    """
+    nearest_snapshot = (
+        select(func.max(ArticleVersion.version_number))
+        .where(
+            ArticleVersion.article_id == article_id,
+            ArticleVersion.is_snapshot,
+            ArticleVersion.version_number <= version_number,
+        )
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(ArticleVersion.version_number, ArticleVersion.title, ArticleVersion.data)
+        .where(
+            ArticleVersion.article_id == article_id,
+            ArticleVersion.version_number.between(nearest_snapshot, version_number),
+        )
+        .order_by(ArticleVersion.version_number)
+    ).all()
+
+    if not rows or rows[-1].version_number != version_number:
+        return None
+
+    content = reconstruct(rows[0].data, [row.data for row in rows[1:]])
+    return rows[-1].title, content
+
+
+def diff_versions(
+    old: tuple[str, str], new: tuple[str, str], old_label: str, new_label: str
+) -> str:
+    """2 つのバージョンの本文の unified diff を返す"""
+    return "".join(
+        difflib.unified_diff(
+            old[1].splitlines(keepends=True),
+            new[1].splitlines(keepends=True),
+            fromfile=old_label,
+            tofile=new_label,
+        )
+    )
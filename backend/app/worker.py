@@ -0,0 +1,310 @@
+"""
+バックグラウンドジョブのワーカー
+
+    python -m app.worker [--concurrency 4] [--processes 2] [--queues default]
+    python -m app.worker --stats
+
+- concurrency 個の asyncio タスクが XREADGROUP でジョブを取得して実行する
+- 通常のジョブ（DB・Redis 中心）はスレッドで、cpu_bound なジョブはプロセスプールで実行する
+- 定期的に遅延ジョブをストリームへ移し、visibility timeout を過ぎた未 ACK のジョブを引き取る
+- SIGINT / SIGTERM で新規取得を止め、実行中のジョブの完了を待ってから終了する
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from collections.abc import Awaitable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.core.logging import logger, setup_logging
+from app.core.redis_manager import redis_manager
+from app.jobs import tasks  # noqa: F401  ジョブの登録
+from app.jobs.queue import (
+    CONSUMER_GROUP,
+    DEAD_LETTER_MAX_LENGTH,
+    DEAD_LETTER_STREAM,
+    DELAYED_KEY,
+    METRICS_PREFIX,
+    PROMOTE_SCRIPT,
+    STREAM_PREFIX,
+    JobSpec,
+    backoff_seconds,
+    delayed_queue,
+    get_job,
+    registered_queues,
+    stream_key,
+)
+
+# 遅延ジョブの移動・未 ACK ジョブの引き取りを行う間隔
+MAINTENANCE_INTERVAL_SECONDS = 1.0
+
+# 1 回のメンテナンスで処理する最大件数
+MAINTENANCE_BATCH_SIZE = 100
+
+# XREADGROUP のブロック時間（停止要求に反応できるよう短めにする）
+READ_BLOCK_MILLISECONDS = 1000
+
+
+def _run_in_process(name: str, payload: dict[str, Any]) -> Any:
+    """プロセスプール側でジョブを実行する（子プロセスもこのモジュールの import でジョブを登録する）"""
+    spec = get_job(name)
+    if spec is None:
+        raise LookupError(f"Unknown job: {name}")
+    return spec.func(**payload)
+
+
+class Worker:
+    """ジョブキューのコンシューマー"""
+
+    def __init__(self, queues: list[str], concurrency: int, processes: int):
+        self.queues = queues
+        self.concurrency = concurrency
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        )
+        # 親プロセスの DB 接続を引き継がないよう spawn で起動する
+        self.pool = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.promote = self.client.register_script(PROMOTE_SCRIPT)
+        self.stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        await asyncio.to_thread(
+            redis_manager.wait_until_ready, settings.REDIS_STARTUP_TIMEOUT_SECONDS
+        )
+        for queue in self.queues:
+            try:
+                await self.client.xgroup_create(
+                    stream_key(queue), CONSUMER_GROUP, id="0", mkstream=True
+                )
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        logger.info(
+            f"Worker started: consumer={self.consumer} queues={self.queues} "
+            f"concurrency={self.concurrency}"
+        )
+        tasks_ = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        tasks_.append(asyncio.create_task(self._maintain()))
+        try:
+            await asyncio.gather(*tasks_)
+        finally:
+            self.pool.shutdown(wait=True)
+            await self.client.aclose()
+            logger.info("Worker stopped")
+
+    # ==================================================
+    # 取得・実行
+    # ==================================================
+    async def _consume(self) -> None:
+        streams = {stream_key(queue): ">" for queue in self.queues}
+        while not self.stopping.is_set():
+            try:
+                response = await self.client.xreadgroup(
+                    CONSUMER_GROUP,
+                    self.consumer,
+                    streams,  # type: ignore[arg-type]
+                    count=1,
+                    block=READ_BLOCK_MILLISECONDS,
+                )
+            except Exception:
+                logger.exception("Job fetch failed")
+                await asyncio.sleep(1)
+                continue
+
+            for stream, messages in response or []:
+                for message_id, fields in messages:
+                    await self._handle(stream[len(STREAM_PREFIX) :], message_id, fields)
+
+    async def _execute(self, spec: JobSpec, payload: dict[str, Any]) -> None:
+        call: Awaitable[Any]
+        if spec.cpu_bound:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(self.pool, _run_in_process, spec.name, payload)
+        else:
+            call = asyncio.to_thread(spec.func, **payload)
+        # タイムアウトしてもスレッド / 子プロセス内の処理は止まらないため、
+        # ジョブ側も長時間ブロックしないように実装すること
+        await asyncio.wait_for(call, timeout=spec.timeout_seconds)
+
+    async def _handle(self, queue: str, message_id: str, fields: dict[str, str]) -> None:
+        name = fields.get("name", "")
+        spec = get_job(name)
+        if spec is None:
+            await self._dead_letter(queue, message_id, fields, f"Unknown job: {name}")
+            return
+
+        started = time.perf_counter()
+        try:
+            await self._execute(spec, json.loads(fields.get("payload", "{}")))
+        except Exception as e:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.warning(
+                f"Job failed: {name} job_id={fields.get('job_id')} "
+                f"attempt={fields.get('attempt')}: {type(e).__name__}: {e}"
+            )
+            await self._record(name, "failed", elapsed_ms)
+            await self._retry_or_dead_letter(spec, queue, message_id, fields, repr(e))
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xack(stream_key(queue), CONSUMER_GROUP, message_id)
+        pipe.xdel(stream_key(queue), message_id)
+        await pipe.execute()
+        await self._record(name, "succeeded", elapsed_ms)
+        logger.debug(f"Job succeeded: {name} job_id={fields.get('job_id')} {elapsed_ms:.1f}ms")
+
+    # ==================================================
+    # 失敗時の処理
+    # ==================================================
+    async def _retry_or_dead_letter(
+        self, spec: JobSpec, queue: str, message_id: str, fields: dict[str, str], error: str
+    ) -> None:
+        attempt = int(fields.get("attempt", "0")) + 1
+        if attempt > spec.retries:
+            await self._dead_letter(queue, message_id, fields, error)
+            return
+
+        retry_fields = {**fields, "attempt": str(attempt), "last_error": error[:1000]}
+        member = json.dumps({"queue": queue, "fields": retry_fields}, ensure_ascii=False)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zadd(DELAYED_KEY, {member: time.time() + backoff_seconds(attempt)})
+        pipe.xack(stream_key(queue), CONSUMER_GROUP, message_id)
+        pipe.xdel(stream_key(queue), message_id)
+        await pipe.execute()
+        await self._record(spec.name, "retried")
+
+    async def _dead_letter(
+        self, queue: str, message_id: str, fields: dict[str, str], error: str
+    ) -> None:
+        logger.error(
+            f"Job moved to dead letter: {fields.get('name')} job_id={fields.get('job_id')}"
+        )
+        dead_fields = {**fields, "queue": queue, "last_error": error[:1000]}
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xadd(
+            DEAD_LETTER_STREAM,
+            dead_fields,  # type: ignore[arg-type]
+            maxlen=DEAD_LETTER_MAX_LENGTH,
+            approximate=True,
+        )
+        pipe.xack(stream_key(queue), CONSUMER_GROUP, message_id)
+        pipe.xdel(stream_key(queue), message_id)
+        await pipe.execute()
+        await self._record(fields.get("name", "unknown"), "dead")
+
+    async def _record(self, name: str, outcome: str, elapsed_ms: float | None = None) -> None:
+        """ジョブ種別ごとのメトリクスを記録する"""
+        key = METRICS_PREFIX + name
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hincrby(key, outcome, 1)
+        if elapsed_ms is not None:
+            pipe.hincrbyfloat(key, "total_ms", elapsed_ms)
+            pipe.hset(key, "last_ms", f"{elapsed_ms:.3f}")
+        try:
+            await pipe.execute()
+        except Exception:
+            logger.exception("Job metrics update failed")
+
+    # ==================================================
+    # 遅延ジョブ・未 ACK ジョブ
+    # ==================================================
+    async def _maintain(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                await self._promote_due()
+                for queue in self.queues:
+                    await self._reclaim(queue)
+            except Exception:
+                logger.exception("Job maintenance failed")
+
+            try:
+                await asyncio.wait_for(self.stopping.wait(), MAINTENANCE_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _promote_due(self) -> None:
+        """実行予定を過ぎた遅延ジョブをそれぞれのキューのストリームに移す"""
+        due = await self.client.zrangebyscore(
+            DELAYED_KEY, "-inf", time.time(), start=0, num=MAINTENANCE_BATCH_SIZE
+        )
+        if not due:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for member in due:
+            await self.promote(
+                keys=[DELAYED_KEY, stream_key(delayed_queue(member))], args=[member], client=pipe
+            )
+        await pipe.execute()
+
+    async def _reclaim(self, queue: str) -> None:
+        """visibility timeout を過ぎた未 ACK のジョブを引き取り、失敗として扱う"""
+        _, messages, _ = await self.client.xautoclaim(
+            stream_key(queue),
+            CONSUMER_GROUP,
+            self.consumer,
+            min_idle_time=settings.JOB_VISIBILITY_TIMEOUT_SECONDS * 1000,
+            count=MAINTENANCE_BATCH_SIZE,
+        )
+        for message_id, fields in messages:
+            if not fields:
+                # 削除済みのエントリ
+                await self.client.xack(stream_key(queue), CONSUMER_GROUP, message_id)
+                continue
+            spec = get_job(fields.get("name", ""))
+            error = "visibility timeout exceeded"
+            if spec is None:
+                await self._dead_letter(queue, message_id, fields, error)
+            else:
+                await self._retry_or_dead_letter(spec, queue, message_id, fields, error)
+
+
+def print_stats() -> None:
+    from app.jobs.queue import dead_letter_count, get_metrics
+
+    for name, values in get_metrics().items():
+        summary = " ".join(f"{key}={value:g}" for key, value in sorted(values.items()))
+        print(f"{name}: {summary}")
+    print(f"dead letters: {dead_letter_count()}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="バックグラウンドジョブのワーカー")
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY)
+    parser.add_argument("--processes", type=int, default=settings.WORKER_PROCESSES)
+    parser.add_argument("--queues", default=None, help="カンマ区切りのキュー名（省略時はすべて）")
+    parser.add_argument("--stats", action="store_true", help="ジョブのメトリクスを表示して終了")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.stats:
+        print_stats()
+        return
+
+    queues = args.queues.split(",") if args.queues else sorted(registered_queues())
+    asyncio.run(Worker(queues, args.concurrency, args.processes).run())
+
+
+if __name__ == "__main__":
+    main()
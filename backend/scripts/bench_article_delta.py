@@ -0,0 +1,97 @@
+"""
+記事本文の差分更新（PATCH /api/articles/{public_id}/content）のベンチマークスクリプト
+
+大きな記事の 1 行を編集したときの以下を、全文の PUT（ArticleUpdate）と比較して表示する。
+- リクエストボディのサイズ
+- リクエストの解析時間（JSON のパース + Pydantic の検証）
+- サーバー側の処理時間（差分の適用 + 元の本文・適用結果の SHA-256 の照合）
+
+DB・Redis には接続せず、スキーマと app.services.versioning の処理のみを使用する。
+
+実行例:
+    cd backend && python scripts/bench_article_delta.py --size-kb 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.article import ArticleContentDelta, ArticleUpdate  # noqa: E402
+from app.services.markdown_render import content_hash  # noqa: E402
+from app.services.versioning import apply_ops, diff_ops  # noqa: E402
+
+WORDS = "knowledge note markdown fastapi python redis postgres index cache query tag folder".split()
+
+
+def random_note(rng: random.Random, size: int) -> str:
+    lines = []
+    total = 0
+    while total < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))) + "\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+
+def median_ms(operation: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--size-kb", type=int, default=200, help="記事本文のサイズ（KB）")
+    parser.add_argument("--repeat", type=int, default=50, help="計測の繰り返し回数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = random_note(rng, args.size_kb * 1024)
+    lines = base.splitlines(keepends=True)
+    index = len(lines) // 2
+    target = "".join(lines[:index] + ["edited line\n"] + lines[index + 1 :])
+
+    full_body = json.dumps({"title": "bench", "content": target}, ensure_ascii=False).encode()
+    delta_body = json.dumps(
+        {
+            "base_hash": content_hash(base),
+            "ops": diff_ops(base, target),
+            "result_hash": content_hash(target),
+        },
+        ensure_ascii=False,
+    ).encode()
+
+    def apply_delta_request() -> None:
+        payload = ArticleContentDelta.model_validate_json(delta_body)
+        assert content_hash(base) == payload.base_hash
+        assert content_hash(apply_ops(base, payload.ops)) == payload.result_hash
+
+    full_parse = median_ms(lambda: ArticleUpdate.model_validate_json(full_body), args.repeat)
+    delta_parse = median_ms(
+        lambda: ArticleContentDelta.model_validate_json(delta_body), args.repeat
+    )
+    delta_total = median_ms(apply_delta_request, args.repeat)
+
+    print(f"=== Article delta update benchmark ({len(base.encode()) / 1024:.0f} KB note) ===")
+    print(f"{'':<14}{'body':>12}{'parse p50':>14}")
+    print(f"{'full PUT':<14}{len(full_body):>10} B{full_parse:>11.3f} ms")
+    print(f"{'delta PATCH':<14}{len(delta_body):>10} B{delta_parse:>11.3f} ms")
+    print(f"body size ratio: {len(delta_body) / len(full_body):.4f}")
+    print(f"delta apply + hash verify p50: {delta_total:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
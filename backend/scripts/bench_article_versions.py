@@ -0,0 +1,115 @@
+"""
+記事バージョン履歴（スナップショット + 前方差分）のベンチマークスクリプト
+
+以下を計測：
+1. 1,000 件以上のリビジョンを持つ記事の保存サイズ（全文コピー方式との比較）
+2. 任意バージョンの復元レイテンシ（直近スナップショットからの差分適用）
+
+DB・Redis には接続せず、app.services.versioning のエンコード処理のみを使用する。
+
+実行例:
+    cd backend && python scripts/bench_article_versions.py --revisions 1500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+from app.services.versioning import decompress_text, encode_version, reconstruct  # noqa: E402
+
+WORDS = "knowledge note markdown fastapi python redis postgres index cache query tag folder".split()
+
+
+def random_line(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))) + "\n"
+
+
+def mutate(content: str, rng: random.Random) -> str:
+    """小さな編集（行の追加・変更・削除）を 1〜3 箇所加える"""
+    lines = content.splitlines(keepends=True)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.random()
+        index = rng.randrange(len(lines) + 1)
+        if op < 0.5 or not lines:
+            lines.insert(index, random_line(rng))
+        elif op < 0.85:
+            lines[min(index, len(lines) - 1)] = random_line(rng)
+        else:
+            del lines[min(index, len(lines) - 1)]
+    return "".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--revisions", type=int, default=1200, help="リビジョン数")
+    parser.add_argument("--lines", type=int, default=400, help="初版の行数")
+    parser.add_argument("--samples", type=int, default=500, help="復元レイテンシの計測回数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    content = "".join(random_line(rng) for _ in range(args.lines))
+
+    # (is_snapshot, data) をバージョン順に保持（DB の article_versions に相当）
+    versions: list[tuple[bool, bytes]] = []
+    full_copy_bytes = 0
+    previous: str | None = None
+    last_snapshot = 0
+    contents: list[str] = []
+
+    encode_started = time.perf_counter()
+    for number in range(1, args.revisions + 1):
+        if number > 1:
+            content = mutate(content, rng)
+        is_snapshot, data = encode_version(content, previous, number - last_snapshot)
+        if is_snapshot:
+            last_snapshot = number
+        versions.append((is_snapshot, data))
+        contents.append(content)
+        full_copy_bytes += len(content.encode("utf-8"))
+        previous = content
+    encode_elapsed = time.perf_counter() - encode_started
+
+    stored_bytes = sum(len(data) for _, data in versions)
+    snapshots = sum(1 for is_snapshot, _ in versions if is_snapshot)
+
+    # 復元レイテンシ
+    latencies: list[float] = []
+    for _ in range(args.samples):
+        target = rng.randrange(len(versions))
+        started = time.perf_counter()
+        base = max(i for i in range(target + 1) if versions[i][0])
+        restored = reconstruct(
+            versions[base][1], [data for _, data in versions[base + 1 : target + 1]]
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert restored == contents[target], f"version {target + 1} mismatch"
+
+    latencies.sort()
+    print("=== Article version storage benchmark ===")
+    print(f"revisions                : {args.revisions}")
+    print(f"snapshot interval        : {settings.VERSION_SNAPSHOT_INTERVAL}")
+    print(f"final content size       : {len(content.encode('utf-8')):,} bytes")
+    print(f"snapshots / deltas       : {snapshots} / {args.revisions - snapshots}")
+    print(f"full-copy storage        : {full_copy_bytes:,} bytes")
+    print(f"snapshot+delta storage   : {stored_bytes:,} bytes")
+    print(f"compression ratio        : {full_copy_bytes / stored_bytes:.1f}x")
+    print(f"encode time per revision : {encode_elapsed / args.revisions * 1000:.2f} ms")
+    print(f"reconstruct p50          : {statistics.median(latencies):.2f} ms")
+    print(f"reconstruct p99          : {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+    print(f"reconstruct max          : {latencies[-1]:.2f} ms")
+    print(
+        f"latest snapshot size     : {len(decompress_text(versions[last_snapshot - 1][1])):,} chars"
+    )
+
+
+if __name__ == "__main__":
+    main()
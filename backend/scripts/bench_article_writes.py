@@ -0,0 +1,190 @@
+"""
+記事の更新・論理削除の書き込みスループットのベンチマークスクリプト
+
+以下の 2 方式を同じ条件で計測し、1 操作あたりの所要時間・SQL 文の数・操作数/秒を表示する。
+- before: SELECT → Python で所有者チェック → UPDATE → commit → refresh（SELECT）
+- after:  UPDATE ... WHERE public_id AND user_id AND is_valid RETURNING 1 文（app.services.article_writes）
+
+更新はいずれもタイトル・本文を変更するため、バージョン履歴への追加（SELECT + INSERT）を含む。
+計測用のユーザー・記事を作成し、終了時に削除する。DB が必要（Redis には接続しない）。
+
+実行例:
+    cd backend && python scripts/bench_article_writes.py --articles 200 --rounds 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import delete, event, insert
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.exceptions import NotFoundError  # noqa: E402
+from app.db.models.article import Article  # noqa: E402
+from app.db.models.article_version import ArticleVersion  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.services import article_writes  # noqa: E402
+from app.services.versioning import record_version  # noqa: E402
+
+statement_count = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statements(*args) -> None:
+    global statement_count
+    statement_count += 1
+
+
+# ==================================================
+# before: 変更前の実装
+# ==================================================
+def legacy_update(db: Session, public_id: uuid.UUID, user_id: int, title: str, content: str):
+    article = db.query(Article).filter(Article.public_id == public_id, Article.is_valid).first()
+    if not article or article.user_id != user_id:
+        raise NotFoundError()
+    if (title, content) != (article.title, article.content):
+        record_version(
+            db, article.id, user_id, title, content, previous=(article.title, article.content)
+        )
+    article.title = title
+    article.content = content
+    article.updated_by = user_id
+    db.add(article)
+    db.commit()
+    db.refresh(article)
+    return article
+
+
+def legacy_delete(db: Session, public_id: uuid.UUID, user_id: int) -> None:
+    article = db.query(Article).filter(Article.public_id == public_id, Article.is_valid).first()
+    if not article or article.user_id != user_id:
+        raise NotFoundError()
+    article.is_valid = False
+    article.updated_by = user_id
+    db.add(article)
+    db.commit()
+
+
+# ==================================================
+# after: UPDATE ... RETURNING
+# ==================================================
+def single_update(db: Session, public_id: uuid.UUID, user_id: int, title: str, content: str):
+    article = article_writes.update_article(
+        db, public_id, user_id, {"title": title, "content": content}
+    )
+    db.commit()
+    return article
+
+
+def single_delete(db: Session, public_id: uuid.UUID, user_id: int) -> None:
+    article_writes.soft_delete_article(db, public_id, user_id)
+    db.commit()
+
+
+# ==================================================
+# 計測
+# ==================================================
+def create_articles(db: Session, user_id: int, count: int) -> list[uuid.UUID]:
+    public_ids = [uuid.uuid4() for _ in range(count)]
+    db.execute(
+        insert(Article),
+        [
+            {
+                "public_id": public_id,
+                "user_id": user_id,
+                "title": f"bench {index}",
+                "content_text": f"# bench {index}\n\nbody\n",
+                "created_by": user_id,
+                "updated_by": user_id,
+            }
+            for index, public_id in enumerate(public_ids)
+        ],
+    )
+    db.commit()
+    return public_ids
+
+
+def measure(operation: Callable[[uuid.UUID], object], public_ids: list[uuid.UUID]) -> dict:
+    global statement_count
+    statement_count = 0
+    samples = []
+    started = time.perf_counter()
+    for public_id in public_ids:
+        op_started = time.perf_counter()
+        operation(public_id)
+        samples.append((time.perf_counter() - op_started) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": statistics.median(samples),
+        "statements": statement_count / len(public_ids),
+        "ops_per_sec": len(public_ids) / elapsed,
+    }
+
+
+def report(label: str, result: dict) -> None:
+    print(
+        f"{label:<18}: p50 {result['p50_ms']:7.2f} ms | {result['statements']:4.1f} statements/op"
+        f" | {result['ops_per_sec']:8.1f} ops/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--articles", type=int, default=200, help="計測に使う記事数")
+    parser.add_argument("--rounds", type=int, default=5, help="更新の繰り返し回数")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = db.execute(
+        insert(User)
+        .values(
+            email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+            password_hash="-",
+            display_name="bench",
+            created_by=0,
+            updated_by=0,
+        )
+        .returning(User.id)
+    ).scalar_one()
+    db.commit()
+
+    try:
+        print("=== Article write benchmark ===")
+        for label, update_article, delete_article in (
+            ("before", legacy_update, legacy_delete),
+            ("after", single_update, single_delete),
+        ):
+            public_ids = create_articles(db, user_id, args.articles)
+            for round_index in range(args.rounds):
+                result = measure(
+                    lambda public_id: update_article(
+                        db, public_id, user_id, f"title {round_index}", f"body {round_index}\n"
+                    ),
+                    public_ids,
+                )
+            report(f"update ({label})", result)
+            report(
+                f"delete ({label})", measure(lambda p: delete_article(db, p, user_id), public_ids)
+            )
+            db.expunge_all()
+    finally:
+        db.rollback()
+        article_ids = db.query(Article.id).filter(Article.user_id == user_id).scalar_subquery()
+        db.execute(delete(ArticleVersion).where(ArticleVersion.article_id.in_(article_ids)))
+        db.execute(delete(Article).where(Article.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
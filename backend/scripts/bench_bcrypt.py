@@ -0,0 +1,80 @@
+"""
+bcrypt のコストごとのスループット計測
+
+コストごとに以下を表示：
+- 検証 1 回の所要時間（中央値）
+- 1 コアあたりの検証回数/秒（1 プロセスで連続実行）
+- 全コアの検証回数/秒（--processes 個のプロセスで並列実行。省略時は CPU コア数）
+- BCRYPT_TARGET_VERIFY_MS の自動調整で選ばれるコスト
+
+実行例:
+    cd backend && python scripts/bench_bcrypt.py
+    cd backend && python scripts/bench_bcrypt.py --min-rounds 10 --max-rounds 14 --seconds 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import bcrypt
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.security import calibrate_bcrypt_rounds  # noqa: E402
+
+PASSWORD = b"Benchmark-password-123"
+
+
+def verify_for(hashed: bytes, seconds: float) -> tuple[int, list[float]]:
+    """seconds 秒間検証を繰り返し、(回数, 各回の所要時間 ms) を返す"""
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while True:
+        started = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, hashed)
+        samples.append((time.perf_counter() - started) * 1000)
+        if started >= deadline:
+            return len(samples), samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--seconds", type=float, default=2.0, help="コストごとの計測時間")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="自動調整の目標（ms）")
+    args = parser.parse_args()
+
+    print(f"=== bcrypt benchmark ({args.processes} processes) ===")
+    print(f"{'rounds':>6} {'verify p50':>12} {'per core':>12} {'all cores':>12}")
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        for rounds in range(args.min_rounds, args.max_rounds + 1):
+            hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+
+            count, samples = verify_for(hashed, args.seconds)
+            per_core = count / (sum(samples) / 1000)
+
+            started = time.perf_counter()
+            results = list(
+                pool.map(verify_for, [hashed] * args.processes, [args.seconds] * args.processes)
+            )
+            total = sum(count for count, _ in results) / (time.perf_counter() - started)
+
+            print(
+                f"{rounds:>6} {statistics.median(samples):>9.1f} ms"
+                f" {per_core:>8.2f} h/s {total:>8.2f} h/s"
+            )
+
+    calibrated = calibrate_bcrypt_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"calibrated rounds for {args.target_ms:.0f} ms target: {calibrated}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+ログインのレート制限の負荷テスト
+
+以下を計測：
+1. bcrypt によるパスワード検証 1 回の所要時間（制限がない場合に攻撃者が消費させられる CPU 時間）
+2. レート制限の判定（check_rate_limit）1 回の所要時間（Redis の 1 往復）
+3. 上限を超えたメールアドレスで POST /api/auth/login を送ったときの 1 リクエストの所要時間
+   （ASGI アプリを直接呼び出す。429 が返り、ユーザー検索・bcrypt が行われないこと）
+
+--budget-ms を指定すると、3 の中央値が予算を超えた場合に終了コード 1 を返す。
+Redis が必要（DB には接続しない）。
+
+実行例:
+    cd backend && python scripts/bench_rate_limit.py --requests 2000
+    cd backend && python scripts/bench_rate_limit.py --budget-ms 1
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.exceptions import TooManyRequestsError  # noqa: E402
+from app.core.rate_limit import check_rate_limit  # noqa: E402
+from app.core.redis_manager import redis_manager  # noqa: E402
+from app.core.security import hash_password, verify_password  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+async def post_login(email: str) -> tuple[int, dict[str, str]]:
+    body = json.dumps({"email": email, "password": "wrong-password"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/auth/login",
+        "raw_path": b"/api/auth/login",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")],
+        "client": ("198.51.100.7", 0),
+        "server": ("localhost", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    headers = {key.decode(): value.decode() for key, value in start["headers"]}
+    return start["status"], headers
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<32}: p50 {statistics.median(samples):8.3f} ms"
+        f" | p99 {percentile(samples, 0.99):8.3f} ms | n {len(samples)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="送信するリクエスト数")
+    parser.add_argument("--budget-ms", type=float, default=None, help="拒否されたリクエストの予算")
+    args = parser.parse_args()
+
+    redis_manager.wait_until_ready(timeout=10)
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+
+    print("=== Login rate limit benchmark ===")
+
+    # 1. bcrypt の検証
+    password_hash = hash_password("bench-password-123")
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        verify_password("wrong-password", password_hash)
+        samples.append((time.perf_counter() - started) * 1000)
+    report("bcrypt verify", samples)
+
+    # 2. 判定のみ（上限に達するまで）
+    samples = []
+    while True:
+        started = time.perf_counter()
+        try:
+            check_rate_limit("login", email=email)
+        except TooManyRequestsError:
+            break
+        finally:
+            samples.append((time.perf_counter() - started) * 1000)
+    report("check_rate_limit", samples)
+
+    # 3. 上限を超えた状態でのログインリクエスト
+    samples = []
+    statuses: dict[int, int] = {}
+    retry_after = None
+
+    async def run() -> None:
+        nonlocal retry_after
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            status, headers = await post_login(email)
+            samples.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            retry_after = headers.get("retry-after", retry_after)
+
+    asyncio.run(run())
+    report("throttled POST /auth/login", samples)
+    print(f"{'status codes':<32}: {statuses} | Retry-After {retry_after}")
+
+    if set(statuses) != {429}:
+        sys.exit("FAIL: some requests were not throttled")
+    if args.budget_ms is not None:
+        p50 = statistics.median(samples)
+        if p50 > args.budget_ms:
+            sys.exit(f"FAIL: throttled login {p50:.3f} ms exceeds budget {args.budget_ms} ms")
+        print(f"OK: within budget {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
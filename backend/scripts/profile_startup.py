@@ -0,0 +1,208 @@
+"""
+アプリ起動時間のプロファイルと予算チェック
+
+以下を計測：
+1. `python -X importtime` の出力を解析し、import に時間のかかっているパッケージ・モジュールを表示
+2. 新しいプロセスでの各フェーズの所要時間
+   - import app.main（create_app を含む）
+   - create_app（モジュール読み込み済みの状態での再実行）
+   - 最初のリクエスト（GET /api/health。ミドルウェアスタックの構築を含む）
+   - OpenAPI スキーマの生成（キャッシュなし）/ ディスクキャッシュからの読み込み
+3. time-to-first-request（プロセス起動から最初のレスポンスまで）
+
+--budget-ms を指定すると、time-to-first-request の中央値が予算を超えた場合に終了コード 1 を返す（CI 用）。
+DB・Redis には接続しない（lifespan の Redis ヘルスゲートは含まない）。
+
+実行例:
+    cd backend && python scripts/profile_startup.py
+    cd backend && python scripts/profile_startup.py --runs 5 --budget-ms 3000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# 最初のリクエストを ASGI アプリに直接送る（HTTP サーバーを介さない）
+REQUEST_SNIPPET = """
+import asyncio
+
+async def first_request(asgi_app):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/health", "raw_path": b"/api/health",
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    assert messages[0]["status"] == 200, messages[0]
+"""
+
+PHASES_SNIPPET = (
+    """
+import json, os, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+app.main.create_app()
+created = time.perf_counter()
+"""
+    + REQUEST_SNIPPET
+    + """
+before_request = time.perf_counter()
+asyncio.run(first_request(app.main.app))
+responded = time.perf_counter()
+app.main.app.openapi()
+generated = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (responded - before_request) * 1000,
+    "openapi_ms": (generated - responded) * 1000,
+}), flush=True)
+os._exit(0)
+"""
+)
+
+TTFR_SNIPPET = (
+    """
+import os
+import app.main
+"""
+    + REQUEST_SNIPPET
+    + """
+asyncio.run(first_request(app.main.app))
+os._exit(0)
+"""
+)
+
+
+def _env(**overrides: str) -> dict[str, str]:
+    return {
+        **os.environ,
+        "REDIS_URL": os.environ.get("REDIS_URL") or "redis://localhost:6379/0",
+        "DATABASE_URL": os.environ.get("DATABASE_URL") or "postgresql://u:p@localhost/db",
+        "LOG_RICH": os.environ.get("LOG_RICH") or "false",
+        "log_level": "WARNING",
+        **overrides,
+    }
+
+
+def _run(args: list[str], env: dict[str, str]) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+
+
+def profile_imports(top: int) -> None:
+    """-X importtime の出力をパッケージ単位（自身の時間の合計）とモジュール単位（累積）で集計する"""
+    result = _run(["-X", "importtime", "-c", "import app.main"], _env())
+    modules: list[tuple[str, int, int]] = []  # (name, self_us, cumulative_us)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|")
+        modules.append((name.strip(), int(head.split(":")[1]), int(cumulative_us)))
+
+    total_us = sum(self_us for _, self_us, _ in modules)
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+
+    print(
+        f"--- import time by package (total {total_us / 1000:.1f} ms, {len(modules)} modules) ---"
+    )
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32} {self_us / 1000:8.1f} ms  {self_us / total_us:6.1%}")
+
+    print("--- slowest app modules (cumulative) ---")
+    app_modules = [m for m in modules if m[0].startswith("app.")]
+    for name, _, cumulative_us in sorted(app_modules, key=lambda m: -m[2])[:top]:
+        print(f"{name:<48} {cumulative_us / 1000:8.1f} ms")
+
+
+def measure_phases(runs: int, openapi_cache: Path) -> list[dict[str, float]]:
+    samples = []
+    for index in range(runs):
+        # 1 回目はキャッシュなし（生成 + 保存）、2 回目以降はキャッシュから読み込む
+        if index == 0:
+            openapi_cache.unlink(missing_ok=True)
+        result = _run(["-c", PHASES_SNIPPET], _env(OPENAPI_CACHE_PATH=str(openapi_cache)))
+        if result.returncode != 0:
+            sys.exit(result.stderr)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def measure_ttfr(runs: int) -> list[float]:
+    """プロセス起動から最初のレスポンスを受け取るまでの時間"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = _run(["-c", TTFR_SNIPPET], _env())
+        elapsed = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            sys.exit(result.stderr)
+        samples.append(elapsed)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument("--top", type=int, default=15, help="import 時間の表示件数")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="time-to-first-request の予算"
+    )
+    parser.add_argument("--skip-imports", action="store_true", help="importtime の集計を省略")
+    args = parser.parse_args()
+
+    print("=== Startup profile ===")
+    if not args.skip_imports:
+        profile_imports(args.top)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        phases = measure_phases(max(args.runs, 2), Path(tmp) / "openapi.json")
+
+    print("--- phases (p50) ---")
+    for key in ("import_ms", "create_app_ms", "first_request_ms"):
+        print(f"{key:<28} {statistics.median(p[key] for p in phases):8.1f} ms")
+    print(f"{'openapi_ms (generate)':<28} {phases[0]['openapi_ms']:8.1f} ms")
+    print(
+        f"{'openapi_ms (disk cache)':<28} {statistics.median(p['openapi_ms'] for p in phases[1:]):8.1f} ms"
+    )
+
+    ttfr = measure_ttfr(args.runs)
+    p50 = statistics.median(ttfr)
+    print("--- time to first request ---")
+    print(f"{'p50 / max':<28} {p50:8.1f} ms / {max(ttfr):.1f} ms")
+
+    if args.budget_ms is not None:
+        if p50 > args.budget_ms:
+            print(
+                f"FAIL: time to first request {p50:.1f} ms exceeds budget {args.budget_ms:.0f} ms"
+            )
+            sys.exit(1)
+        print(f"OK: within budget {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
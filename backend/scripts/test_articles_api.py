@@ -7,12 +7,20 @@ Article API 統合テストスクリプト
 3. バリデーションエラー（400）
 4. 認証なしでのアクセス（401）
 5. 存在しないリソース取得（404）
+6. If-Match 付き更新（200 / 古い ETag は 412 / 存在しない記事は 404）と ETag の往復
+7. PATCH の省略と null の区別（省略は更新しない・folder_id の null は外す・title の null は 400）
+8. 本文の差分更新（200 / base_hash 不一致は 412 / result_hash 不一致は 409）
+9. 本文全体の更新（PUT 200）・記事削除（204 / 削除済みは 404）
+10. タグの一括設定（追加・削除・付け直し・全削除 200 / 存在しない記事は 404）と、
+    ダッシュボードのタグ利用件数・?tags=a,b&mode=and|or の絞り込みへの反映
 
 テスト後は自動的にテストデータをクリーンアップ
 """
 
+import hashlib
 import subprocess
 import sys
+import time
 import uuid
 from typing import Any
 
@@ -35,6 +43,15 @@ TEST_USER = {
 # セッション情報
 session_cookies = {}
 
+# 更新系テストの対象記事（public_id / 現在の ETag / 古い ETag / 現在の本文）
+update_target: dict[str, Any] = {}
+
+# タグのテストの対象記事（X / Y → public_id）
+tag_articles: dict[str, str] = {}
+
+# タグインデックスへの反映（アウトボックス経由）を待つ最大秒数
+TAG_INDEX_WAIT_SECONDS = 5.0
+
 
 def log_test(test_name: str, expected_status: int, actual_status: int, passed: bool) -> None:
     """テスト結果をログ出力"""
@@ -79,7 +96,7 @@ def signup_test_user() -> bool:
 
 def test_201_create_article() -> None:
     """201: 正常な記事作成（認証あり）"""
-    print("\n[1/4] Testing 201 Created...")
+    print("\n[1/24] Testing 201 Created...")
     try:
         payload = {
             "title": f"TEST_201_normal_case_{UNIQUE_SUFFIX}",
@@ -108,7 +125,7 @@ def test_201_create_article() -> None:
 
 def test_400_validation_error() -> None:
     """400: バリデーションエラー（必須フィールド省略）"""
-    print("\n[2/4] Testing 400 Validation Error...")
+    print("\n[2/24] Testing 400 Validation Error...")
     try:
         # title を省略してバリデーションエラーを発生させる
         payload = {
@@ -135,7 +152,7 @@ def test_400_validation_error() -> None:
 
 def test_401_unauthorized() -> None:
     """401: 認証なしでのアクセス"""
-    print("\n[3/4] Testing 401 Unauthorized...")
+    print("\n[3/24] Testing 401 Unauthorized...")
     try:
         payload = {
             "title": f"TEST_401_unauthorized_{UNIQUE_SUFFIX}",
@@ -160,7 +177,7 @@ def test_401_unauthorized() -> None:
 
 def test_404_not_found() -> None:
     """404: 存在しないリソース"""
-    print("\n[4/4] Testing 404 Not Found...")
+    print("\n[4/24] Testing 404 Not Found...")
     try:
         response = requests.get(
             f"{API_BASE_URL}/articles/00000000-0000-0000-0000-000000000000",
@@ -177,6 +194,592 @@ def test_404_not_found() -> None:
         print(f"  Error: {e}")
 
 
+def content_sha256(content: str) -> str:
+    """本文の SHA-256（16進。PATCH /{public_id}/content の base_hash / result_hash）"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def error_details(response: requests.Response) -> dict[str, Any]:
+    """エラーレスポンスの details を取り出す"""
+    return response.json().get("error", {}).get("details") or {}
+
+
+def setup_update_target() -> bool:
+    """更新系テスト用の記事を作成し、ETag を取得"""
+    print("\n[Setup] Creating article for update tests...")
+    try:
+        content = "line 1\nline 2\nline 3\n"
+        response = requests.post(
+            f"{API_BASE_URL}/articles",
+            json={"title": f"TEST_{UNIQUE_SUFFIX}_update", "content": content, "folder_id": None},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        if response.status_code != 201:
+            print(f"✗ Create failed: {response.status_code}")
+            print(f"  Response: {response.text}")
+            return False
+        public_id = response.json()["public_id"]
+
+        response = requests.get(
+            f"{API_BASE_URL}/articles/{public_id}", cookies=session_cookies, timeout=5
+        )
+        etag = response.headers.get("ETag")
+        if response.status_code != 200 or not etag:
+            print(f"✗ ETag not returned: {response.status_code}")
+            return False
+
+        update_target.update(
+            {"public_id": public_id, "etag": etag, "stale_etag": None, "content": content}
+        )
+        print(f"✓ Article created: {public_id} (ETag {etag})")
+        return True
+    except Exception as e:
+        print(f"✗ Setup error: {e}")
+        return False
+
+
+def test_200_put_if_match() -> None:
+    """200: If-Match が現在の ETag と一致する PUT（ETag の往復）"""
+    print("\n[5/24] Testing 200 PUT with If-Match...")
+    try:
+        content = "line 1\nline 2 (put)\nline 3\n"
+        response = requests.put(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": f"TEST_{UNIQUE_SUFFIX}_put", "content": content, "folder_id": None},
+            headers={"If-Match": update_target["etag"]},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        new_etag = response.headers.get("ETag")
+        # 更新後の ETag が変わり、GET で同じ ETag が返ること
+        fetched = requests.get(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = (
+            response.status_code == 200
+            and new_etag is not None
+            and new_etag != update_target["etag"]
+            and fetched.headers.get("ETag") == new_etag
+        )
+        log_test("200 PUT If-Match", 200, response.status_code, passed)
+        if response.status_code == 200:
+            print(f"  ETag: {update_target['etag']} -> {new_etag}")
+            update_target.update(
+                {"stale_etag": update_target["etag"], "etag": new_etag, "content": content}
+            )
+        else:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT If-Match", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_412_put_stale_if_match() -> None:
+    """412: 古い ETag を If-Match に指定した PUT"""
+    print("\n[6/24] Testing 412 PUT with stale If-Match...")
+    try:
+        response = requests.put(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": f"TEST_{UNIQUE_SUFFIX}_stale", "content": "stale", "folder_id": None},
+            headers={"If-Match": update_target["stale_etag"] or '"0"'},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        # details.etag は現在の ETag
+        passed = (
+            response.status_code == 412
+            and error_details(response).get("etag") == update_target["etag"]
+        )
+        log_test("412 PUT stale If-Match", 412, response.status_code, passed)
+        if response.status_code == 412:
+            print(f"  Current ETag: {error_details(response).get('etag')}")
+        else:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("412 PUT stale If-Match", 412, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_404_put_not_found() -> None:
+    """404: 存在しない記事への If-Match 付き PUT（412 ではなく 404）"""
+    print("\n[7/24] Testing 404 PUT with If-Match on missing article...")
+    try:
+        response = requests.put(
+            f"{API_BASE_URL}/articles/00000000-0000-0000-0000-000000000000",
+            json={"title": f"TEST_{UNIQUE_SUFFIX}_missing", "content": "x", "folder_id": None},
+            headers={"If-Match": update_target["etag"]},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 404
+        log_test("404 PUT If-Match Not Found", 404, response.status_code, passed)
+        if response.status_code != 404:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("404 PUT If-Match Not Found", 404, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_patch_omitted_fields() -> None:
+    """200: PATCH で省略した項目は更新されない"""
+    print("\n[8/24] Testing 200 PATCH with omitted fields...")
+    try:
+        title = f"TEST_{UNIQUE_SUFFIX}_patch"
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": title},
+            headers={"If-Match": update_target["etag"]},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 200
+        if passed:
+            data = response.json()
+            # content は省略したので変わらない
+            passed = data["title"] == title and data["content"] == update_target["content"]
+            update_target["etag"] = response.headers.get("ETag")
+        log_test("200 PATCH omitted fields", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PATCH omitted fields", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_patch_null_folder() -> None:
+    """200: PATCH で folder_id に null を指定するとフォルダから外す"""
+    print("\n[9/24] Testing 200 PATCH with null folder_id...")
+    try:
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"folder_id": None},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 200
+        if passed:
+            data = response.json()
+            passed = data["folder_id"] is None and data["content"] == update_target["content"]
+            update_target["etag"] = response.headers.get("ETag")
+        log_test("200 PATCH null folder_id", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PATCH null folder_id", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_400_patch_null_title() -> None:
+    """400: PATCH で title に null を指定（省略のみ可能）"""
+    print("\n[10/24] Testing 400 PATCH with null title...")
+    try:
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": None},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 400
+        log_test("400 PATCH null title", 400, response.status_code, passed)
+        if response.status_code in (400, 422):
+            print(f"  Error Code: {response.json().get('error', {}).get('code', 'N/A')}")
+        else:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("400 PATCH null title", 400, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_412_patch_stale_if_match() -> None:
+    """412: 古い ETag を If-Match に指定した PATCH"""
+    print("\n[11/24] Testing 412 PATCH with stale If-Match...")
+    try:
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": f"TEST_{UNIQUE_SUFFIX}_stale"},
+            headers={"If-Match": update_target["stale_etag"] or '"0"'},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = (
+            response.status_code == 412
+            and error_details(response).get("etag") == update_target["etag"]
+        )
+        log_test("412 PATCH stale If-Match", 412, response.status_code, passed)
+        if response.status_code != 412:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("412 PATCH stale If-Match", 412, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_content_delta() -> None:
+    """200: 本文の差分更新（2 行目を置き換え）"""
+    print("\n[12/24] Testing 200 content delta...")
+    try:
+        base = update_target["content"]
+        lines = base.splitlines(keepends=True)
+        content = lines[0] + "line 2 (delta)\n" + "".join(lines[2:])
+        payload = {
+            "base_hash": content_sha256(base),
+            "ops": [[0, 1], "line 2 (delta)\n", [2, len(lines)]],
+            "result_hash": content_sha256(content),
+        }
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}/content",
+            json=payload,
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 200
+        if passed:
+            fetched = requests.get(
+                f"{API_BASE_URL}/articles/{update_target['public_id']}",
+                cookies=session_cookies,
+                timeout=5,
+            )
+            # 適用結果が保存され、GET で同じ ETag が返ること
+            passed = (
+                response.json()["content_hash"] == payload["result_hash"]
+                and fetched.json()["content"] == content
+                and fetched.headers.get("ETag") == response.headers.get("ETag")
+            )
+            update_target.update({"etag": response.headers.get("ETag"), "content": content})
+        log_test("200 Content Delta", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 Content Delta", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_412_content_delta_base_hash() -> None:
+    """412: base_hash が現在の本文と一致しない差分更新（全文の PUT にフォールバック）"""
+    print("\n[13/24] Testing 412 content delta with stale base_hash...")
+    try:
+        stale = "stale base\n"
+        payload = {
+            "base_hash": content_sha256(stale),
+            "ops": [[0, 1], "appended\n"],
+            "result_hash": content_sha256(stale + "appended\n"),
+        }
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}/content",
+            json=payload,
+            cookies=session_cookies,
+            timeout=5,
+        )
+        details = error_details(response) if response.status_code == 412 else {}
+        passed = (
+            response.status_code == 412
+            and details.get("fallback") == "PUT"
+            and details.get("content_hash") == content_sha256(update_target["content"])
+        )
+        log_test("412 Content Delta base_hash", 412, response.status_code, passed)
+        if response.status_code != 412:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("412 Content Delta base_hash", 412, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_409_content_delta_result_hash() -> None:
+    """409: 適用結果が result_hash と一致しない差分更新"""
+    print("\n[14/24] Testing 409 content delta with wrong result_hash...")
+    try:
+        base = update_target["content"]
+        payload = {
+            "base_hash": content_sha256(base),
+            "ops": [[0, len(base.splitlines())], "appended\n"],
+            "result_hash": content_sha256(base + "something else\n"),
+        }
+        response = requests.patch(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}/content",
+            json=payload,
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 409 and error_details(response).get("fallback") == "PUT"
+        log_test("409 Content Delta result_hash", 409, response.status_code, passed)
+        if response.status_code != 409:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("409 Content Delta result_hash", 409, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_put_article() -> None:
+    """200: 本文全体の PUT（If-Match なし）"""
+    print("\n[15/24] Testing 200 PUT...")
+    try:
+        title = f"TEST_{UNIQUE_SUFFIX}_put_full"
+        content = "replaced by full PUT\n"
+        response = requests.put(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            json={"title": title, "content": content, "folder_id": None},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 200
+        if passed:
+            data = response.json()
+            passed = (
+                data["public_id"] == update_target["public_id"]
+                and data["title"] == title
+                and data["content"] == content
+            )
+            update_target["content"] = content
+        log_test("200 PUT", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_204_delete_article() -> None:
+    """204: 記事削除（論理削除）"""
+    print("\n[16/24] Testing 204 DELETE...")
+    try:
+        response = requests.delete(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 204
+        log_test("204 DELETE", 204, response.status_code, passed)
+        if response.status_code != 204:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("204 DELETE", 204, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_404_delete_deleted_article() -> None:
+    """404: 削除済み記事の再削除"""
+    print("\n[17/24] Testing 404 DELETE on deleted article...")
+    try:
+        response = requests.delete(
+            f"{API_BASE_URL}/articles/{update_target['public_id']}",
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 404
+        log_test("404 DELETE deleted article", 404, response.status_code, passed)
+        if response.status_code != 404:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("404 DELETE deleted article", 404, 0, False)
+        print(f"  Error: {e}")
+
+
+def tag_name(label: str) -> str:
+    """テスト用のタグ名（実行ごとに一意）"""
+    return f"test_{UNIQUE_SUFFIX}_{label}"
+
+
+def set_tags(article: str, labels: list[str]) -> requests.Response:
+    """記事のタグを labels で置き換える"""
+    return requests.put(
+        f"{API_BASE_URL}/articles/{tag_articles[article]}/tags",
+        json={"tags": [tag_name(label) for label in labels]},
+        cookies=session_cookies,
+        timeout=5,
+    )
+
+
+def tag_usage() -> dict[str, int]:
+    """ダッシュボードのタグ利用件数（テスト用のタグのみ、ラベル → 記事数）"""
+    response = requests.get(f"{API_BASE_URL}/dashboard", cookies=session_cookies, timeout=5)
+    response.raise_for_status()
+    prefix = tag_name("")
+    return {
+        item["name"].removeprefix(prefix): item["article_count"]
+        for item in response.json()["tag_usage"]
+        if item["name"].startswith(prefix)
+    }
+
+
+def filter_by_tags(labels: list[str], mode: str, expected: set[str]) -> set[str]:
+    """
+    ?tags=...&mode=... で絞り込んだ記事（ラベルの集合）を返す
+
+    タグインデックスへの反映はアウトボックス経由のため、expected になるまで
+    TAG_INDEX_WAIT_SECONDS の間は再取得する。
+    """
+    labels_by_id = {public_id: label for label, public_id in tag_articles.items()}
+    deadline = time.monotonic() + TAG_INDEX_WAIT_SECONDS
+    while True:
+        response = requests.get(
+            f"{API_BASE_URL}/articles",
+            params={"tags": ",".join(tag_name(label) for label in labels), "mode": mode},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        response.raise_for_status()
+        found = {
+            labels_by_id[item["public_id"]]
+            for item in response.json()
+            if item["public_id"] in labels_by_id
+        }
+        if found == expected or time.monotonic() >= deadline:
+            return found
+        time.sleep(0.2)
+
+
+def setup_tag_targets() -> bool:
+    """タグのテスト用の記事を 2 件（X, Y）作成"""
+    print("\n[Setup] Creating articles for tag tests...")
+    try:
+        for label in ("X", "Y"):
+            response = requests.post(
+                f"{API_BASE_URL}/articles",
+                json={
+                    "title": f"TEST_{UNIQUE_SUFFIX}_tags_{label}",
+                    "content": f"Tagged article {label}",
+                    "folder_id": None,
+                },
+                cookies=session_cookies,
+                timeout=5,
+            )
+            if response.status_code != 201:
+                print(f"✗ Create failed: {response.status_code}")
+                print(f"  Response: {response.text}")
+                return False
+            tag_articles[label] = response.json()["public_id"]
+        print(f"✓ Articles created: {tag_articles}")
+        return True
+    except Exception as e:
+        print(f"✗ Setup error: {e}")
+        return False
+
+
+def test_200_set_article_tags() -> None:
+    """200: タグの一括設定（X: a, b / Y: b）"""
+    print("\n[18/24] Testing 200 PUT tags...")
+    try:
+        response = set_tags("X", ["b", "a"])
+        other = set_tags("Y", ["b"])
+        passed = (
+            response.status_code == 200
+            and other.status_code == 200
+            and response.json()["tags"] == [tag_name("a"), tag_name("b")]
+        )
+        log_test("200 PUT tags", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT tags", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_dashboard_tag_usage() -> None:
+    """200: ダッシュボードのタグ利用件数（a: 1, b: 2）"""
+    print("\n[19/24] Testing 200 dashboard tag usage...")
+    try:
+        usage = tag_usage()
+        passed = usage == {"a": 1, "b": 2}
+        log_test("200 Dashboard tag_usage", 200, 200, passed)
+        print(f"  Tag usage: {usage}")
+    except Exception as e:
+        log_test("200 Dashboard tag_usage", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_filter_by_tags() -> None:
+    """200: タグでの絞り込み（a,b の and は X のみ / or は X, Y）"""
+    print("\n[20/24] Testing 200 tag filter (and / or)...")
+    try:
+        found_and = filter_by_tags(["a", "b"], "and", {"X"})
+        found_or = filter_by_tags(["a", "b"], "or", {"X", "Y"})
+        passed = found_and == {"X"} and found_or == {"X", "Y"}
+        log_test("200 Tag filter and/or", 200, 200, passed)
+        print(f"  and: {sorted(found_and)} / or: {sorted(found_or)}")
+    except Exception as e:
+        log_test("200 Tag filter and/or", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_replace_article_tags() -> None:
+    """200: タグの付け替え（X: a を外して c を付ける）"""
+    print("\n[21/24] Testing 200 PUT tags (add / remove)...")
+    try:
+        response = set_tags("X", ["b", "c"])
+        passed = response.status_code == 200
+        if passed:
+            usage = tag_usage()
+            found_a = filter_by_tags(["a"], "and", set())
+            found_c = filter_by_tags(["c"], "and", {"X"})
+            passed = usage == {"b": 2, "c": 1} and found_a == set() and found_c == {"X"}
+            print(f"  Tag usage: {usage} / a: {sorted(found_a)} / c: {sorted(found_c)}")
+        log_test("200 PUT tags add/remove", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT tags add/remove", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_restore_article_tag() -> None:
+    """200: 外したタグを付け直す（論理削除したリンクの復元）"""
+    print("\n[22/24] Testing 200 PUT tags (restore)...")
+    try:
+        response = set_tags("X", ["a", "b", "c"])
+        passed = response.status_code == 200
+        if passed:
+            usage = tag_usage()
+            found = filter_by_tags(["a", "c"], "and", {"X"})
+            passed = usage == {"a": 1, "b": 2, "c": 1} and found == {"X"}
+            print(f"  Tag usage: {usage} / a and c: {sorted(found)}")
+        log_test("200 PUT tags restore", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT tags restore", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_200_clear_article_tags() -> None:
+    """200: 空配列ですべてのタグを外す（Y）"""
+    print("\n[23/24] Testing 200 PUT tags (clear)...")
+    try:
+        response = set_tags("Y", [])
+        passed = response.status_code == 200 and response.json()["tags"] == []
+        if passed:
+            usage = tag_usage()
+            found = filter_by_tags(["b"], "or", {"X"})
+            passed = usage == {"a": 1, "b": 1, "c": 1} and found == {"X"}
+            print(f"  Tag usage: {usage} / b: {sorted(found)}")
+        log_test("200 PUT tags clear", 200, response.status_code, passed)
+        if response.status_code != 200:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("200 PUT tags clear", 200, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_404_set_tags_not_found() -> None:
+    """404: 存在しない記事へのタグ設定"""
+    print("\n[24/24] Testing 404 PUT tags on missing article...")
+    try:
+        response = requests.put(
+            f"{API_BASE_URL}/articles/00000000-0000-0000-0000-000000000000/tags",
+            json={"tags": [tag_name("a")]},
+            cookies=session_cookies,
+            timeout=5,
+        )
+        passed = response.status_code == 404
+        log_test("404 PUT tags Not Found", 404, response.status_code, passed)
+        if not passed:
+            print(f"  Response: {response.text}")
+    except Exception as e:
+        log_test("404 PUT tags Not Found", 404, 0, False)
+        print(f"  Error: {e}")
+
+
 def cleanup_test_data() -> None:
     """テスト後にテストデータをクリーンアップ"""
     print("\n[Cleanup] Removing test data...")
@@ -260,6 +863,36 @@ def main() -> None:
         test_401_unauthorized()
         test_404_not_found()
 
+        # 更新系テスト（同じ記事を順に更新するため実行順に依存する）
+        if setup_update_target():
+            test_200_put_if_match()
+            test_412_put_stale_if_match()
+            test_404_put_not_found()
+            test_200_patch_omitted_fields()
+            test_200_patch_null_folder()
+            test_400_patch_null_title()
+            test_412_patch_stale_if_match()
+            test_200_content_delta()
+            test_412_content_delta_base_hash()
+            test_409_content_delta_result_hash()
+            test_200_put_article()
+            test_204_delete_article()
+            test_404_delete_deleted_article()
+        else:
+            log_test("Setup update target", 201, 0, False)
+
+        # タグのテスト（同じ記事のタグを順に付け替えるため実行順に依存する）
+        if setup_tag_targets():
+            test_200_set_article_tags()
+            test_200_dashboard_tag_usage()
+            test_200_filter_by_tags()
+            test_200_replace_article_tags()
+            test_200_restore_article_tag()
+            test_200_clear_article_tags()
+            test_404_set_tags_not_found()
+        else:
+            log_test("Setup tag targets", 201, 0, False)
+
     finally:
         # テスト完了後にクリーンアップ（失敗した場合も実行）
         cleanup_test_data()
@@ -7,10 +7,12 @@
 3. 認証状態で API 利用（articles）
 4. ログアウト（logout）
 5. 認証エラーハンドリング（400, 401）
+6. セッション一覧（ログアウトしたセッションが含まれない）・全セッションのログアウト
 
 テスト後は自動的にテストデータをクリーンアップ
 """
 
+import hashlib
 import subprocess
 import sys
 import time
@@ -50,7 +52,7 @@ def log_test(test_name: str, expected_status: int, actual_status: int, passed: b
 
 def test_1_signup_success() -> str | None:
     """1. Signup 成功（201）"""
-    print("\n[1/10] Testing Signup Success (201)...")
+    print("\n[1/14] Testing Signup Success (201)...")
     try:
         payload = {
             "email": TEST_USER["email"],
@@ -76,7 +78,7 @@ def test_1_signup_success() -> str | None:
 
 def test_2_signup_duplicate_email() -> None:
     """2. 重複メールで Signup（400）"""
-    print("\n[2/10] Testing Signup with Duplicate Email (400)...")
+    print("\n[2/14] Testing Signup with Duplicate Email (400)...")
     try:
         payload = {
             "email": TEST_USER["email"],
@@ -96,7 +98,7 @@ def test_2_signup_duplicate_email() -> None:
 
 def test_3_login_success(session_id: str | None) -> str | None:
     """3. Login 成功（200）"""
-    print("\n[3/10] Testing Login Success (200)...")
+    print("\n[3/14] Testing Login Success (200)...")
     try:
         payload = {
             "email": TEST_USER["email"],
@@ -124,7 +126,7 @@ def test_3_login_success(session_id: str | None) -> str | None:
 
 def test_4_login_invalid_credentials() -> None:
     """4. 無効な認証情報でログイン（401）"""
-    print("\n[4/10] Testing Login with Invalid Credentials (401)...")
+    print("\n[4/14] Testing Login with Invalid Credentials (401)...")
     try:
         payload = {
             "email": TEST_USER["email"],
@@ -142,7 +144,7 @@ def test_4_login_invalid_credentials() -> None:
 
 def test_5_get_me_with_auth(session_id: str | None) -> None:
     """5. 認証状態で /auth/me を取得（200）"""
-    print("\n[5/10] Testing GET /auth/me with Auth (200)...")
+    print("\n[5/14] Testing GET /auth/me with Auth (200)...")
     try:
         cookies = {"session_id": session_id} if session_id else {}
         response = requests.get(f"{API_BASE_URL}/auth/me", cookies=cookies, timeout=5)
@@ -158,7 +160,7 @@ def test_5_get_me_with_auth(session_id: str | None) -> None:
 
 def test_6_get_me_without_auth() -> None:
     """6. 認証なしで /auth/me を取得（401）"""
-    print("\n[6/10] Testing GET /auth/me without Auth (401)...")
+    print("\n[6/14] Testing GET /auth/me without Auth (401)...")
     try:
         response = requests.get(f"{API_BASE_URL}/auth/me", timeout=5)
         passed = response.status_code == 401
@@ -172,7 +174,7 @@ def test_6_get_me_without_auth() -> None:
 
 def test_7_create_article_with_auth(session_id: str | None) -> None:
     """7. 認証状態で記事作成（201）"""
-    print("\n[7/10] Testing POST /articles with Auth (201)...")
+    print("\n[7/14] Testing POST /articles with Auth (201)...")
     try:
         payload = {
             "title": "Test Article from Auth Flow",
@@ -198,7 +200,7 @@ def test_7_create_article_with_auth(session_id: str | None) -> None:
 
 def test_8_create_article_without_auth() -> None:
     """8. 認証なしで記事作成（401）"""
-    print("\n[8/10] Testing POST /articles without Auth (401)...")
+    print("\n[8/14] Testing POST /articles without Auth (401)...")
     try:
         payload = {
             "title": "Unauthorized Article",
@@ -217,7 +219,7 @@ def test_8_create_article_without_auth() -> None:
 
 def test_9_logout_success(session_id: str | None) -> None:
     """9. ログアウト成功（204）"""
-    print("\n[9/10] Testing Logout Success (204)...")
+    print("\n[9/14] Testing Logout Success (204)...")
     try:
         cookies = {"session_id": session_id} if session_id else {}
         response = requests.post(f"{API_BASE_URL}/auth/logout", cookies=cookies, timeout=5)
@@ -232,7 +234,7 @@ def test_9_logout_success(session_id: str | None) -> None:
 
 def test_10_get_me_after_logout() -> None:
     """10. ログアウト後に /auth/me を取得（401）"""
-    print("\n[10/10] Testing GET /auth/me after Logout (401)...")
+    print("\n[10/14] Testing GET /auth/me after Logout (401)...")
     try:
         response = requests.get(f"{API_BASE_URL}/auth/me", timeout=5)
         passed = response.status_code == 401
@@ -244,6 +246,94 @@ def test_10_get_me_after_logout() -> None:
         print(f"  Error: {e}")
 
 
+def session_handle(session_id: str) -> str:
+    """セッション一覧に表示される識別子（Cookie の値の SHA-256 の先頭 16 文字）"""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+
+
+def test_11_list_sessions(
+    signup_session_id: str | None, logged_out_session_id: str | None
+) -> str | None:
+    """11. 再ログインしてセッション一覧を取得（200。ログアウトしたセッションは含まれない）"""
+    print("\n[11/14] Testing GET /auth/sessions (200)...")
+    try:
+        login = requests.post(
+            f"{API_BASE_URL}/auth/login",
+            json={"email": TEST_USER["email"], "password": TEST_USER["password"]},
+            timeout=5,
+        )
+        session_id = login.cookies.get("session_id")
+        cookies = {"session_id": session_id} if session_id else {}
+        response = requests.get(f"{API_BASE_URL}/auth/sessions", cookies=cookies, timeout=5)
+        passed = response.status_code == 200
+        if passed:
+            sessions = response.json()
+            handles = {item["session_id"] for item in sessions}
+            current = [item["session_id"] for item in sessions if item["current"]]
+            # SESSION_MODE=signed ではセッションごとの記録がないため一覧は空
+            if sessions:
+                passed = (
+                    current == [session_handle(session_id or "")]
+                    and session_handle(signup_session_id or "") in handles
+                    and session_handle(logged_out_session_id or "") not in handles
+                )
+                print(f"  Active sessions: {len(sessions)}")
+            else:
+                print("  No sessions listed (SESSION_MODE=signed)")
+        log_test("GET /auth/sessions", 200, response.status_code, passed)
+        return session_id
+    except Exception as e:
+        log_test("GET /auth/sessions", 200, 0, False)
+        print(f"  Error: {e}")
+        return None
+
+
+def test_12_list_sessions_without_auth() -> None:
+    """12. 認証なしでセッション一覧を取得（401）"""
+    print("\n[12/14] Testing GET /auth/sessions without Auth (401)...")
+    try:
+        response = requests.get(f"{API_BASE_URL}/auth/sessions", timeout=5)
+        passed = response.status_code == 401
+        log_test("GET /auth/sessions (Unauthenticated)", 401, response.status_code, passed)
+    except Exception as e:
+        log_test("GET /auth/sessions (Unauthenticated)", 401, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_13_revoke_all_sessions(session_id: str | None) -> None:
+    """13. 全セッションのログアウト（204）"""
+    print("\n[13/14] Testing DELETE /auth/sessions (204)...")
+    try:
+        cookies = {"session_id": session_id} if session_id else {}
+        response = requests.delete(f"{API_BASE_URL}/auth/sessions", cookies=cookies, timeout=5)
+        passed = response.status_code == 204
+        log_test("DELETE /auth/sessions", 204, response.status_code, passed)
+    except Exception as e:
+        log_test("DELETE /auth/sessions", 204, 0, False)
+        print(f"  Error: {e}")
+
+
+def test_14_get_me_after_revoke_all(*session_ids: str | None) -> None:
+    """14. 全セッションのログアウト後に、いずれのセッションでも /auth/me を取得できない（401）"""
+    print("\n[14/14] Testing GET /auth/me after Revoking All Sessions (401)...")
+    try:
+        statuses = [
+            requests.get(
+                f"{API_BASE_URL}/auth/me",
+                cookies={"session_id": session_id} if session_id else {},
+                timeout=5,
+            ).status_code
+            for session_id in session_ids
+        ]
+        passed = all(status == 401 for status in statuses)
+        log_test("GET /auth/me (After Revoke All)", 401, max(statuses), passed)
+        if not passed:
+            print(f"  Statuses: {statuses}")
+    except Exception as e:
+        log_test("GET /auth/me (After Revoke All)", 401, 0, False)
+        print(f"  Error: {e}")
+
+
 def print_summary() -> None:
     """テスト結果のサマリーを出力"""
     print("\n" + "=" * 60)
@@ -295,6 +385,10 @@ def main() -> int:
     test_8_create_article_without_auth()
     test_9_logout_success(new_session_id)
     test_10_get_me_after_logout()
+    relogin_session_id = test_11_list_sessions(session_id, new_session_id)
+    test_12_list_sessions_without_auth()
+    test_13_revoke_all_sessions(relogin_session_id)
+    test_14_get_me_after_revoke_all(session_id, relogin_session_id)
 
     # サマリー出力
     return print_summary()